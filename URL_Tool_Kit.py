@@ -1,70 +1,77 @@
 import streamlit as st
 import requests
-from bs4 import BeautifulSoup
-import xml.etree.ElementTree as ET
-from typing import List, Dict
+from typing import List, Dict, Optional, Sequence
 import re
+import http_client
+import alternate_links
+import bulk_convert
+import locales
+import rate_limit
+import request_timing
+import sitemap_cache
+import sitemap_changes
+from path_index import PathIndex
 import cn_brand_pages
+import crawler_page
+import driver_urls_page
+import hreflang_validator_page
+import jobs_page
+import regional_brand_pages
+import single_flight
 import status_code_Main
 
 class URLToolkit:
     def __init__(self):
         # Region Codes for Local Page Scraper
-        self.REGION_CODES: Dict[str, List[str]] = {
-            'EMEA': ["en-gb", "en-eu", "en-me", "it-it", "fr-fr", "pl-pl", "ru-ru", "es-es", "de-de", "tr-tr",
-                     "nb-no", "sv-se", "fi-fi", "da-dk", "nl-nl", "cs-cz", "fr-be", "de-at", "ro-ro"],
-            'APAC': ["en-in", "en-au", "en-sg", "en-ph", "en-my", "zh-tw", "ja-jp", "ko-kr", "id-id", "th-th", "vi-vn"],
-            'LABR': ["es-la", "pt-br"],
-            'CN': ["zh-cn", ".cn"]
-        }
+        self.REGION_CODES: Dict[str, List[str]] = locales.REGION_CODES
         self.unique_urls: List[str] = []
         self.sitemap_url = 'https://www.nvidia.com/en-us/en-us.sitemap.xml'
-        self.extracted_sitemap_urls = self.extract_urls_from_sitemap()
+        self.sitemap_base_url = 'https://www.nvidia.com/en-us/'
+        self.sitemap_load = None
+        # The sitemap is only fetched when a page first needs it
+        self._extracted_sitemap_urls = None
+        self._path_index = None
+
+    @property
+    def extracted_sitemap_urls(self) -> Sequence[str]:
+        if self._extracted_sitemap_urls is None:
+            self._extracted_sitemap_urls = self.extract_urls_from_sitemap()
+        return self._extracted_sitemap_urls
+
+    @property
+    def path_index(self) -> PathIndex:
+        if self._path_index is None:
+            urls = self.extracted_sitemap_urls
+            if self.sitemap_load:
+                self._path_index = self.sitemap_load.entry.path_index(self.sitemap_base_url)
+            else:
+                self._path_index = PathIndex(urls, self.sitemap_base_url)
+        return self._path_index
 
     def _get_headers(self) -> Dict[str, str]:
-        return {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
+        return dict(http_client.DEFAULT_HEADERS)
 
     def fetch_alternate_links(self, url: str) -> List[str]:
         try:
-            response = requests.get(url, headers=self._get_headers())
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.text, 'html.parser')
-            head_tag = soup.head
-
-            if head_tag:
-                alternate_links = head_tag.find_all('link', rel='alternate')
-
-                if alternate_links:
-                    self.unique_urls = list(set(link.get('href') for link in alternate_links if link.get('href')))
-                    return self.unique_urls
-                else:
-                    st.warning("No alternate links found.")
-                    return []
-            else:
-                st.warning("No <head> tag found in the document.")
-                return []
-
+            self.unique_urls = alternate_links.fetch_alternate_urls(url)
+            return self.unique_urls
+        except ValueError as e:
+            st.warning(str(e))
+            return []
         except requests.RequestException as e:
             st.error(f"Error fetching URL: {e}")
             return []
 
     def categorize_urls_by_region(self) -> Dict[str, List[str]]:
-        categorized_urls = {
-            'EMEA': [], 'APAC': [], 'LABR': [], 'CN': [], 'US': []
-        }
-
-        for url in self.unique_urls:
-            for region, codes in self.REGION_CODES.items():
-                if any(code in url for code in codes):
-                    categorized_urls[region].append(url)
-                    break
-            else:
-                categorized_urls['US'].append(url)
+        return alternate_links.categorize_urls(self.unique_urls, self.REGION_CODES)
 
-        return categorized_urls
+    def scrape_alternate_links(self, urls: List[str], max_workers: int = alternate_links.DEFAULT_MAX_WORKERS,
+                               limiter: Optional[rate_limit.RateLimiter] = None):
+        return alternate_links.scrape_alternates(urls, self.REGION_CODES, max_workers=max_workers, limiter=limiter)
+
+    def iter_scrape_alternate_links(self, urls: List[str], max_workers: int = alternate_links.DEFAULT_MAX_WORKERS,
+                                    limiter: Optional[rate_limit.RateLimiter] = None):
+        return alternate_links.iter_scrape_alternates(urls, self.REGION_CODES, max_workers=max_workers, limiter=limiter)
 
     def url_converting(self, url):
         middletext = "content/nvidiaGDC/"
@@ -105,15 +112,8 @@ class URLToolkit:
         return convertedurl
     def extract_urls_from_sitemap(self):
         try:
-            response = requests.get(self.sitemap_url)
-            response.raise_for_status()
-            root = ET.fromstring(response.content)
-
-            urls = []
-            for loc in root.findall('.//{http://www.sitemaps.org/schemas/sitemap/0.9}loc'):
-                urls.append(loc.text)
-
-            return urls
+            self.sitemap_load = sitemap_cache.load_sitemap(self.sitemap_url)
+            return self.sitemap_load.urls
 
         except Exception as e:
             st.error(f"Error fetching sitemap: {e}")
@@ -124,19 +124,11 @@ class URLToolkit:
         return slash_count == 5
 
     def get_nvidia_brand_names(self):
-        brandlist = []
-        for url in self.extracted_sitemap_urls:
-            if self.has_single_slash(url):
-                brand = url[29:].rstrip('/')
-                brandlist.append(brand)
-        return sorted(set(brandlist))
+        # Brands are the top-level en-us sections that have their own landing page
+        return self.path_index.children(pages_only=True)
 
     def get_brand_related_urls(self, brand_name):
-        related_urls = []
-        for url in self.extracted_sitemap_urls:
-            if f"en-us/{brand_name}/" in url:
-                related_urls.append(url)
-        return related_urls
+        return self.path_index.urls_under([brand_name])
 
     def convert_author_to_live_url(self, author_url):
         # More flexible regex to capture dynamic path
@@ -168,6 +160,110 @@ class URLToolkit:
 
         return live_url
 
+def bulk_file_converter(conversion: str, key: str):
+    uploaded_file = st.file_uploader(
+        "Or convert a whole file of URLs (CSV, XLSX or TXT)",
+        type=["csv", "xlsx", "txt"],
+        key=key
+    )
+    if uploaded_file is None:
+        return
+
+    try:
+        urls = bulk_convert.read_urls(uploaded_file.getvalue(), uploaded_file.name)
+    except ValueError as e:
+        st.error(f"Could not read {uploaded_file.name}: {e}")
+        return
+
+    converted = bulk_convert.convert(urls, conversion)
+    st.write(f"Converted {len(converted)} URLs from {uploaded_file.name}")
+    status_code_Main.show_export(
+        lambda: converted.itertuples(index=False, name=None),
+        list(converted.columns),
+        f"{uploaded_file.name.rsplit('.', 1)[0]}_{conversion}",
+        key=f"{key}_export",
+        source=(uploaded_file.file_id, conversion),
+    )
+
+def show_converted_export(conversion: str):
+    # The last conversion is kept in session state, so it survives the rerun the export button causes
+    pairs = st.session_state.get(f"{conversion}_converted")
+    if pairs:
+        status_code_Main.show_export(lambda: zip(*pairs), ["input_url", "converted_url"], f"converted_{conversion}",
+                                     key=f"{conversion}_text_export", source=id(pairs))
+
+def run_scrape(toolkit: URLToolkit, urls: List[str], max_workers: int):
+    # Partial results live in session state, so Cancel (a rerun) keeps them
+    timings = request_timing.TimingCollector()
+    limiter = rate_limit.RateLimiter(timings=timings)
+    run = {"urls": urls, "results": {}, "done": False, "elapsed": 0.0, "limiter": limiter, "timings": timings}
+    st.session_state.scrape_run = run
+
+    st.button("Cancel", key="cancel_scrape")
+    panel = status_code_Main.ProgressPanel(len(urls), unit="pages")
+    for result in toolkit.iter_scrape_alternate_links(urls, max_workers=max_workers, limiter=limiter):
+        run["results"][result.url] = result
+        run["elapsed"] = panel.elapsed
+        if result.alternates:
+            outcome = "With alternates"
+        elif result.error and result.error.startswith("Error fetching"):
+            outcome = "Fetch errors"
+        else:
+            outcome = "No alternates"
+        panel.add(outcome, {"URL": result.url, "Alternates": len(result.alternates), "Error": result.error or ""})
+    run["elapsed"] = panel.elapsed
+    run["done"] = True
+    panel.finish()
+
+SCRAPE_EXPORT_FIELDS = ["Base URL", "Region", "Alternate URL", "Error"]
+
+def scrape_export_rows(results):
+    for result in results:
+        if result.error:
+            yield [result.url, None, None, result.error]
+        for region, region_urls in result.categorized.items():
+            for alternate_url in region_urls:
+                yield [result.url, region, alternate_url, None]
+
+def show_scrape_run(run):
+    scraped = run["results"]
+    if run["done"]:
+        st.write(f"Scraped {len(scraped)} pages in {run['elapsed']:.2f} seconds")
+    else:
+        st.warning(f"Cancelled after scraping {len(scraped)} of {len(run['urls'])} pages "
+                   f"in {run['elapsed']:.2f} seconds")
+    status_code_Main.show_throttling(run["limiter"])
+    status_code_Main.show_timing(run["timings"], key="scrape_timings")
+
+    # Report in input order, whatever order the pages finished in
+    ordered = [scraped[url] for url in dict.fromkeys(run["urls"]) if url in scraped]
+    failures = [f"{result.url}: {result.error}" for result in ordered if result.error]
+    if failures:
+        st.warning("\n\n".join(failures))
+
+    rows = [
+        {"Base URL": result.url, "Region": region, "Alternate URL": alternate_url}
+        for result in ordered
+        for region, region_urls in result.categorized.items()
+        for alternate_url in region_urls
+    ]
+    st.dataframe(rows, use_container_width=True, height=400)
+    status_code_Main.show_export(lambda: scrape_export_rows(ordered), SCRAPE_EXPORT_FIELDS, "local_pages",
+                                 key="scrape_export", source=(id(run), len(ordered)))
+
+    with st.expander("Scraped Local Pages as text"):
+        lines = []
+        for result in ordered:
+            if not result.alternates:
+                continue
+            lines.append(f"Base URL: {result.url}")
+            for region, region_urls in result.categorized.items():
+                if region_urls:
+                    lines.append(f"\n{region} URLs:")
+                    lines.extend(region_urls)
+            lines.append("\n" + "=" * 50)
+        st.text_area("Scraped Local Pages", value="\n".join(lines), height=400)
+
 def main():
     st.set_page_config(layout="wide", page_title="URL Toolkit")
 
@@ -177,47 +273,52 @@ def main():
     # Sidebar navigation
     page = st.sidebar.radio(
         "Select Tool",
-        ["Local Page Scraper", "Live to Author Converter", "Author to live Converter", "Live To Preview Converter", "Preview To Live Converter", "US Brand Pages", "CN Brand Pages", "Driver URLS","Status Code Checker"]
+        ["Local Page Scraper", "Live to Author Converter", "Author to live Converter", "Live To Preview Converter", "Preview To Live Converter", "US Brand Pages", "CN Brand Pages", "Regional Brand Pages", "Driver URLS","Status Code Checker", "Sitemap Changes", "Background Jobs"]
     )
 
+    # Process-wide: identical requests from concurrent sessions and jobs share one round-trip
+    with st.sidebar.expander(f"Coalesced requests: {single_flight.total_coalesced():,}"):
+        st.caption("Requests for a URL already being fetched for another user or job wait for that "
+                   "response instead of sending their own. Your run's request timings and throttle events "
+                   "still include them, marked shared.")
+        st.dataframe(single_flight.stats(), hide_index=True, use_container_width=True)
+
+    scraper_mode = None
     if page == "Local Page Scraper":
+        scraper_mode = st.sidebar.radio("Scraper mode", ["Scrape pages", "Crawl site", "Validate hreflang"])
+    if scraper_mode == "Crawl site":
+        crawler_page.main()
+    elif scraper_mode == "Validate hreflang":
+        hreflang_validator_page.main()
+
+    elif page == "Local Page Scraper":
         st.title("🌐 Local Page URL Scraper")
 
-        url_input = st.text_area(
-            "Enter URLs (one per line)",
-            placeholder="https://nvidia.com\nhttps://nvidia.com/en-us/",
-            height=300
-        )
+        urls = sitemap_changes.changed_urls_input("scrape_changes")
+        if urls is None:
+            url_input = st.text_area(
+                "Enter URLs (one per line)",
+                placeholder="https://nvidia.com\nhttps://nvidia.com/en-us/",
+                height=300
+            )
+            urls = [url.strip() for url in url_input.split('\n') if url.strip()]
 
-        if st.button("Scrape Local Pages"):
-            if url_input.strip():
-                urls = [url.strip() for url in url_input.split('\n') if url.strip()]
-                results = {}
-
-                for url in urls:
-                    st.write(f"Processing URL: {url}")
-                    alternate_urls = toolkit.fetch_alternate_links(url)
-
-                    if alternate_urls:
-                        categorized_urls = toolkit.categorize_urls_by_region()
-                        results[url] = categorized_urls
-
-                # Convert results to formatted text
-                output_text = ""
-                for base_url, categorized_urls in results.items():
-                    output_text += f"Base URL: {base_url}\n"
-                    for region, urls in categorized_urls.items():
-                        if urls:
-                            output_text += f"\n{region} URLs:\n"
-                            output_text += "\n".join(urls) + "\n"
-                    output_text += "\n" + "=" * 50 + "\n"
-
-                # Display results in text area
-                st.text_area(
-                    "Scraped Local Pages",
-                    value=output_text,
-                    height=400
-                )
+        max_workers = st.number_input("Parallel requests", min_value=1, max_value=64,
+                                      value=alternate_links.DEFAULT_MAX_WORKERS)
+
+        col1, col2 = st.columns([1, 4])
+        with col1:
+            scrape = st.button("Scrape Local Pages")
+        with col2:
+            background = st.button("Run in background", key="scrape_background")
+        if scrape and urls:
+            run_scrape(toolkit, urls, int(max_workers))
+        elif background and urls:
+            jobs_page.queue_job("scrape", {"urls": urls, "max_workers": int(max_workers)},
+                                f"Scrape of {len(urls)} pages")
+
+        if 'scrape_run' in st.session_state:
+            show_scrape_run(st.session_state.scrape_run)
 
     elif page == "Live to Author Converter":
         st.title("🔗 Live to Author URL Converter")
@@ -240,6 +341,7 @@ def main():
             if urls_input:
                 urls = [url.strip() for url in urls_input.split()]
                 converted_urls = [toolkit.url_converting(url) for url in urls]
+                st.session_state["live-to-author_converted"] = (urls, converted_urls)
 
                 # Display converted URLs in the second column
                 converted_urls_output.text_area(
@@ -248,29 +350,44 @@ def main():
                     height=300
                 )
 
+        show_converted_export("live-to-author")
+        bulk_file_converter("live-to-author", key="live-to-author_file")
+
     elif page == "CN Brand Pages":
         cn_brand_pages.main()
 
+    elif page == "Regional Brand Pages":
+        regional_brand_pages.main()
+
 
     elif page == "US Brand Pages":
         st.title("🔍 NVIDIA US Brand URL Explorer")
+        brand_names = toolkit.get_nvidia_brand_names()
+        if toolkit.sitemap_load:
+            st.caption(toolkit.sitemap_load.summary())
 
         selected_brand = st.selectbox(
             "Select a Brand",
-            toolkit.get_nvidia_brand_names()
+            brand_names,
+            format_func=lambda brand: f"{brand} ({toolkit.path_index.count([brand])})"
         )
 
         if selected_brand:
-            related_urls = toolkit.get_brand_related_urls(selected_brand)
+            selected_path = cn_brand_pages.select_sub_path(toolkit.path_index, selected_brand, key_prefix="us_path")
+            related_urls = toolkit.path_index.urls_under(selected_path)
+            selected_label = "/".join(selected_path)
 
-            st.subheader(f"URLs for {selected_brand}")
+            st.subheader(f"URLs for {selected_label}")
             st.text_area(
-                label=f"Related URLs for {selected_brand}",
+                label=f"Related URLs for {selected_label}",
                 value="\n".join(related_urls),
                 height=300
             )
 
             st.metric("Total Related URLs", len(related_urls))
+            status_code_Main.show_export(lambda: ([url] for url in toolkit.path_index.iter_urls_under(selected_path)),
+                                         ["url"], f"us_{'_'.join(selected_path)}", key="us_brand_export",
+                                         source=tuple(selected_path))
     elif page == "Live To Preview Converter":
         st.title("🔗 Live to Preview URL Converter")
         # Create columns with adjusted widths
@@ -291,6 +408,7 @@ def main():
             if urls_input:
                 urls = [url.strip() for url in urls_input.split()]
                 converted_urls = [toolkit.livetopreviewConverting(url) for url in urls]
+                st.session_state["live-to-preview_converted"] = (urls, converted_urls)
 
                 # Display converted URLs in the second column
                 converted_urls_output.text_area(
@@ -298,6 +416,9 @@ def main():
                     "\n".join(converted_urls),
                     height=300
                 )
+
+        show_converted_export("live-to-preview")
+        bulk_file_converter("live-to-preview", key="live-to-preview_file")
     elif page == "Preview To Live Converter":
         st.title("🔗 Preview to Live URL Converter")
         # Create columns with adjusted widths
@@ -318,6 +439,7 @@ def main():
             if urls_input:
                 urls = [url.strip() for url in urls_input.split()]
                 converted_urls = [toolkit.previewtoliveConverting(url) for url in urls]
+                st.session_state["preview-to-live_converted"] = (urls, converted_urls)
 
                 # Display converted URLs in the second column
                 converted_urls_output.text_area(
@@ -325,135 +447,11 @@ def main():
                     "\n".join(converted_urls),
                     height=300
                 )
+
+        show_converted_export("preview-to-live")
+        bulk_file_converter("preview-to-live", key="preview-to-live_file")
     elif page == "Driver URLS":
-        st.title("🛹 Driver URLS")
-        # Define options for the dropdown
-        # options = ['Game Ready Drivers', 'Studio Drivers', 'Quadro / NVIDIA RTX','Unix / Linux', 'Tesla']
-        options = ["Origin","Preview","Live"]
-
-        # Create a dropdown
-        selected_option = st.selectbox('Choose an option:', options)
-
-        origin_urls=[
-            "============================Index==================================",
-            'https://origin-aws-prod-us.nvidia.com/download/index.aspx?lang=en-us',
-            'https://origin-aws-prod-us.nvidia.com/download/index.aspx?lang=en-us',
-            'https://origin-aws-prod-uk.nvidia.com/download/index.aspx?lang=en-uk',
-            'https://origin-aws-prod-de.nvidia.com/download/index.aspx?lang=de',
-            'https://origin-aws-prod-fr.nvidia.com/download/index.aspx?lang=fr',
-            'https://origin-aws-prod-es.nvidia.com/download/index.aspx?lang=es',
-            'https://origin-aws-prod-pl.nvidia.com/download/index.aspx?lang=pl',
-            'https://origin-aws-prod-it.nvidia.com/download/index.aspx?lang=it',
-            'https://origin-aws-prod-ru.nvidia.com/download/index.aspx?lang=ru',
-            'https://origin-aws-prod-la.nvidia.com/download/index.aspx?lang=la',
-            'https://origin-aws-prod-br.nvidia.com/download/index.aspx?lang=br',
-            'https://origin-aws-prod-tw.nvidia.com/download/index.aspx?lang=tw',
-            'https://origin-aws-prod-jp.nvidia.com/download/index.aspx?lang=jp',
-            'https://origin-aws-prod-kr.nvidia.com/download/index.aspx?lang=kr',
-            'https://origin-aws-prod-in.nvidia.com/download/index.aspx?lang=en-in',
-            'https://origin-aws-prod-cn.nvidia.com/download/index.aspx?lang=cn',
-            'https://origin-aws-prod-tr.nvidia.com/drivers',
-            "============================Find==================================",
-            'https://origin-aws-prod-us.nvidia.com/download/Find.aspx?lang=en-us',
-            'https://origin-aws-prod-uk.nvidia.com/download/Find.aspx?lang=en-uk',
-            'https://origin-aws-prod-de.nvidia.com/download/Find.aspx?lang=de',
-            'https://origin-aws-prod-fr.nvidia.com/download/Find.aspx?lang=fr',
-            'https://origin-aws-prod-es.nvidia.com/download/Find.aspx?lang=es',
-            'https://origin-aws-prod-pl.nvidia.com/download/Find.aspx?lang=pl',
-            'https://origin-aws-prod-it.nvidia.com/download/Find.aspx?lang=it',
-            'https://origin-aws-prod-ru.nvidia.com/download/Find.aspx?lang=ru',
-            'https://origin-aws-prod-la.nvidia.com/download/Find.aspx?lang=la',
-            'https://origin-aws-prod-br.nvidia.com/download/Find.aspx?lang=br',
-            'https://origin-aws-prod-tw.nvidia.com/download/Find.aspx?lang=tw',
-            'https://origin-aws-prod-jp.nvidia.com/download/Find.aspx?lang=jp',
-            'https://origin-aws-prod-kr.nvidia.com/download/Find.aspx?lang=kr',
-            'https://origin-aws-prod-in.nvidia.com/download/Find.aspx?lang=en-in',
-            'https://origin-aws-prod-cn.nvidia.com/download/Find.aspx?lang=cn',
-            'https://origin-aws-prod-tr.nvidia.com/drivers/beta'
-        ]
-        origin_url_text = "\n".join(origin_urls)
-        preview_urls=[
-            '===============Enterprise=============',
-            'https://preview.nvidia.com/en-zz/drivers/',
-            'https://preview.nvidia.com/en-gb/drivers/',
-            'https://preview.nvidia.cn/drivers/ lookup /',
-            'https://preview.nvidia.com/zh-tw/drivers/',
-            'https://preview.nvidia.com/ja-jp/drivers/',
-            'https://preview.nvidia.com/ko-kr/drivers/',
-            'https://preview.nvidia.com/en-in/drivers/',
-            'https://preview.nvidia.com/de-de/drivers/',
-            'https://preview.nvidia.com/es-es/drivers/',
-            'https://preview.nvidia.com/fr-fr/drivers/',
-            'https://preview.nvidia.com/it-it/drivers/',
-            'https://preview.nvidia.com/pl-pl/drivers/',
-            'https://preview.nvidia.com/tr-tr/drivers/',
-            'https://preview.nvidia.com/ru-ru/drivers/',
-            'https://preview.nvidia.com/es-la/drivers/',
-            'https://preview.nvidia.com/pt-br/drivers/',
-            '=================GeForce====================',
-            'https://preview.nvidia.com/en-zz/geforce/drivers/',
-            'https://preview.nvidia.com/en-gb/geforce/drivers/',
-            'https://preview.nvidia.com/zh-cn/geforce/drivers/',
-            'https://preview.nvidia.com/zh-tw/geforce/drivers/',
-            'https://preview.nvidia.com/ja-jp/geforce/drivers/',
-            'https://preview.nvidia.com/ko-kr/geforce/drivers/',
-            'https://preview.nvidia.com/en-in/geforce/drivers/',
-            'https://preview.nvidia.com/de-de/geforce/drivers/',
-            'https://preview.nvidia.com/es-es/geforce/drivers/',
-            'https://preview.nvidia.com/fr-fr/geforce/drivers/',
-            'https://preview.nvidia.com/it-it/geforce/drivers/',
-            'https://preview.nvidia.com/pl-pl/geforce/drivers/',
-            'https://preview.nvidia.com/tr-tr/geforce/drivers/',
-            'https://preview.nvidia.com/ru-ru/geforce/drivers/',
-            'https://preview.nvidia.com/es-la/geforce/drivers/',
-            'https://preview.nvidia.com/pt-br/geforce/drivers/'
-        ]
-        preview_url_text = "\n".join(preview_urls)
-        live_urls=[
-            '===============Enterprise=============',
-            'https://www.nvidia.com/en-us/drivers/',
-            'https://www.nvidia.com/en-gb/drivers/',
-            'https://www.nvidia.cn/drivers/lookup /',
-            'https://www.nvidia.com/zh-tw/drivers/',
-            'https://www.nvidia.com/ja-jp/drivers/',
-            'https://www.nvidia.com/ko-kr/drivers/',
-            'https://www.nvidia.com/en-in/drivers/',
-            'https://www.nvidia.com/de-de/drivers/',
-            'https://www.nvidia.com/es-es/drivers/',
-            'https://www.nvidia.com/fr-fr/drivers/',
-            'https://www.nvidia.com/it-it/drivers/',
-            'https://www.nvidia.com/pl-pl/drivers/',
-            'https://www.nvidia.com/tr-tr/drivers/',
-            'https://www.nvidia.com/ru-ru/drivers/',
-            'https://www.nvidia.com/es-la/drivers/',
-            'https://www.nvidia.com/pt-br/drivers/',
-            '=================GeForce====================',
-            'https://www.nvidia.com/en-us/geforce/drivers/',
-            'https://www.nvidia.com/en-gb/geforce/drivers/',
-            'https://www.nvidia.com/zh-cn/geforce/drivers/',
-            'https://www.nvidia.com/zh-tw/geforce/drivers/',
-            'https://www.nvidia.com/ja-jp/geforce/drivers/',
-            'https://www.nvidia.com/ko-kr/geforce/drivers/',
-            'https://www.nvidia.com/en-in/geforce/drivers/',
-            'https://www.nvidia.com/de-de/geforce/drivers/',
-            'https://www.nvidia.com/es-es/geforce/drivers/',
-            'https://www.nvidia.com/fr-fr/geforce/drivers/',
-            'https://www.nvidia.com/it-it/geforce/drivers/',
-            'https://www.nvidia.com/pl-pl/geforce/drivers/',
-            'https://www.nvidia.com/tr-tr/geforce/drivers/',
-            'https://www.nvidia.com/ru-ru/geforce/drivers/',
-            'https://www.nvidia.com/es-la/geforce/drivers/',
-            'https://www.nvidia.com/pt-br/geforce/drivers/'
-        ]
-        live_url_text="\n".join(live_urls)
-        # Display the selected option
-        st.write(f'You selected: {selected_option}')
-        if selected_option=="Origin":
-            st.text_area("List of URLs", value=origin_url_text, height=600)
-        elif selected_option=='Preview':
-            st.text_area("List of URLs", value=preview_url_text, height=600)
-        elif selected_option=='Live':
-            st.text_area("List of URLs", value=live_url_text, height=600)
+        driver_urls_page.main()
     elif page == "Author to live Converter":
         st.title("🔗 Author to live URL Converter")
 
@@ -475,6 +473,7 @@ def main():
             if urls_input:
                 urls = [url.strip() for url in urls_input.split()]
                 converted_urls = [toolkit.convert_author_to_live_url(url) for url in urls]
+                st.session_state["author-to-live_converted"] = (urls, converted_urls)
 
                 # Display converted URLs in the second column
                 converted_urls_output.text_area(
@@ -482,7 +481,14 @@ def main():
                     "\n".join(converted_urls),
                     height=300
                 )
+
+        show_converted_export("author-to-live")
+        bulk_file_converter("author-to-live", key="author-to-live_file")
     elif page=="Status Code Checker":
         status_code_Main.main()
+    elif page == "Sitemap Changes":
+        sitemap_changes.main()
+    elif page == "Background Jobs":
+        jobs_page.main()
 if __name__ == "__main__":
     main()
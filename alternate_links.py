@@ -0,0 +1,194 @@
+import codecs
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from html.parser import HTMLParser
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import requests
+
+import http_client
+import locales
+import rate_limit
+import single_flight
+
+# Stateless alternate-link (hreflang) scraping. Every call returns its own
+# result object, so many pages can be scraped concurrently without sharing
+# mutable state.
+#
+# Pages are streamed and parsed incrementally: the <link rel="alternate">
+# tags sit in the first few KB of the document, so reading stops at </head>
+# (or the first <body> tag) and the rest of the page is never downloaded.
+# Fetches of a URL already in flight elsewhere in the process (another
+# session, job or crawl) join that request through single_flight; the
+# joining caller's limiter records it as a shared request.
+
+DEFAULT_MAX_WORKERS = 16
+
+HEAD_CHUNK_SIZE = 8 * 1024
+# Give up on documents whose <head> never closes within this many bytes.
+MAX_HEAD_BYTES = 2 * 1024 * 1024
+
+AlternateLink = namedtuple('AlternateLink', ['href', 'hreflang'])
+
+_alternate_links_flight = single_flight.group('alternate links')
+# Separate group: these requests do not follow redirects
+_page_links_flight = single_flight.group('page links')
+
+
+class ScrapeResult:
+    def __init__(self, url: str, alternates: List[str], categorized: Dict[str, List[str]], error: Optional[str] = None):
+        self.url = url
+        self.alternates = alternates
+        self.categorized = categorized
+        self.error = error
+
+
+class _HeadLinkParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.saw_head = False
+        self.head_closed = False
+        self.links: List[AlternateLink] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'head':
+            self.saw_head = True
+        elif tag == 'body':
+            self.head_closed = True
+        elif tag == 'link' and self.saw_head and not self.head_closed:
+            attributes = dict(attrs)
+            if 'alternate' in (attributes.get('rel') or '').lower().split() and attributes.get('href'):
+                self.links.append(AlternateLink(attributes['href'], attributes.get('hreflang')))
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag == 'head':
+            self.head_closed = True
+
+
+def parse_head_links(chunks: Iterable[bytes], encoding: str = 'utf-8') -> Tuple[List[AlternateLink], bool]:
+    """
+    Parse <link rel="alternate"> tags from an iterable of body chunks, stopping
+    as soon as the <head> is complete. Returns (links, saw_head).
+    """
+    parser = _HeadLinkParser()
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    read = 0
+    for chunk in chunks:
+        read += len(chunk)
+        parser.feed(decoder.decode(chunk))
+        if parser.head_closed or read >= MAX_HEAD_BYTES:
+            break
+    return parser.links, parser.saw_head
+
+
+def _response_encoding(response) -> str:
+    # requests falls back to ISO-8859-1 for text/* without a charset; pages here are UTF-8.
+    if 'charset' in response.headers.get('Content-Type', '').lower() and response.encoding:
+        return response.encoding
+    return 'utf-8'
+
+
+def fetch_alternate_link_tags(url: str, limiter: Optional[rate_limit.RateLimiter] = None) -> List[AlternateLink]:
+    """
+    Stream the page and return its alternate links (href and hreflang), closing
+    the connection once the <head> has been read. Raises requests.RequestException
+    on network errors and ValueError when the page has no <head> or no alternate links.
+    """
+    # Coalesced callers share the result, so each gets its own list
+    return list(_alternate_links_flight.request(url, limiter, _fetch_alternate_link_tags, url))
+
+
+def _fetch_alternate_link_tags(url: str, limiter: Optional[rate_limit.RateLimiter]) -> List[AlternateLink]:
+    send = limiter.request if limiter is not None else http_client.request
+    response = send('GET', url, stream=True)
+    try:
+        response.raise_for_status()
+        links, saw_head = _read_head_links(response)
+    finally:
+        response.close()
+
+    if not saw_head:
+        raise ValueError("No <head> tag found in the document.")
+    if not links:
+        raise ValueError("No alternate links found.")
+    return links
+
+
+def _read_head_links(response) -> Tuple[List[AlternateLink], bool]:
+    return parse_head_links(response.iter_content(HEAD_CHUNK_SIZE), _response_encoding(response))
+
+
+def fetch_page_links(url: str, limiter: Optional[rate_limit.RateLimiter] = None
+                     ) -> Tuple[int, Optional[str], List[AlternateLink]]:
+    """
+    Fetch the page without following redirects and return (status code,
+    redirect Location or None, alternate links). Links are only read from 200
+    responses. Raises requests.RequestException on network errors.
+    """
+    status, location, links = _page_links_flight.request(url, limiter, _fetch_page_links, url)
+    return status, location, list(links)
+
+
+def _fetch_page_links(url: str, limiter: Optional[rate_limit.RateLimiter]
+                      ) -> Tuple[int, Optional[str], List[AlternateLink]]:
+    send = limiter.request if limiter is not None else http_client.request
+    response = send('GET', url, stream=True, allow_redirects=False)
+    try:
+        links = _read_head_links(response)[0] if response.status_code == 200 else []
+    finally:
+        response.close()
+    return response.status_code, response.headers.get('Location'), links
+
+
+def fetch_alternate_urls(url: str, limiter: Optional[rate_limit.RateLimiter] = None) -> List[str]:
+    """
+    Return the unique hrefs of <link rel="alternate"> tags in the page's <head>.
+    """
+    return list(set(link.href for link in fetch_alternate_link_tags(url, limiter)))
+
+
+def categorize_urls(urls: List[str], region_codes: Optional[Dict[str, List[str]]] = None) -> Dict[str, List[str]]:
+    return locales.categorize_urls(urls, region_codes)
+
+
+def scrape_page(url: str, region_codes: Optional[Dict[str, List[str]]] = None,
+                limiter: Optional[rate_limit.RateLimiter] = None) -> ScrapeResult:
+    try:
+        alternates = fetch_alternate_urls(url, limiter)
+    except requests.RequestException as e:
+        return ScrapeResult(url, [], {}, f"Error fetching URL: {e}")
+    except ValueError as e:
+        return ScrapeResult(url, [], {}, str(e))
+    return ScrapeResult(url, alternates, categorize_urls(alternates, region_codes))
+
+
+def scrape_alternates(urls: List[str], region_codes: Optional[Dict[str, List[str]]] = None,
+                      max_workers: int = DEFAULT_MAX_WORKERS,
+                      limiter: Optional[rate_limit.RateLimiter] = None) -> List[ScrapeResult]:
+    """
+    Scrape many pages concurrently; results are returned in input order.
+    Requests go through limiter, by default a new per-call rate_limit.RateLimiter.
+    """
+    limiter = limiter or rate_limit.RateLimiter()
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        return list(executor.map(lambda url: scrape_page(url, region_codes, limiter), urls))
+
+
+def iter_scrape_alternates(urls: List[str], region_codes: Optional[Dict[str, List[str]]] = None,
+                           max_workers: int = DEFAULT_MAX_WORKERS,
+                           limiter: Optional[rate_limit.RateLimiter] = None):
+    """
+    Yield a ScrapeResult per URL as soon as each page is done (completion order).
+    Closing the generator cancels the pages that have not started yet.
+    """
+    limiter = limiter or rate_limit.RateLimiter()
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    try:
+        futures = [executor.submit(scrape_page, url, region_codes, limiter) for url in urls]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,501 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import alternate_links
+import hreflang_crawler
+import rate_limit
+import redirects
+import sitemap_cache
+import status_cache
+import url_status
+from storage import data_path
+
+# Background audit jobs. Status checks, scrapes and crawls submitted here run
+# on worker threads owned by the process, not by a Streamlit script run, so
+# reruns, page switches and closed tabs do not stop them. Jobs and their
+# results live in SQLite: any session (or the CLI) can list jobs, follow
+# their progress and read results while they run.
+#
+# Results are written in batches, one row per input URL, and the job's
+# progress is updated with each batch. The worker running a job owns it
+# (jobs.owner) and refreshes its updated_at at least every FLUSH_SECONDS,
+# results or not; that is also when it checks for a cancel. A running job
+# whose heartbeat is older than STALE_SECONDS lost its process and is queued
+# again by any JobQueue's workers, so a second process or a reloaded module
+# never takes over a job that is still running. A requeued job resumes from
+# its saved results: status and scrape jobs skip the URLs already done, crawl
+# jobs resume their crawl's checkpoint.
+
+DEFAULT_WORKERS = 2
+FLUSH_ROWS = 500
+FLUSH_SECONDS = 2.0
+STALE_SECONDS = 60.0
+_READ_BATCH = 1000
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+ACTIVE_STATES = (QUEUED, RUNNING)
+
+JOB_KINDS = ('status', 'scrape', 'crawl')
+# Export columns of each kind's results
+JOB_FIELDS = {
+    'status': ['url', 'status', 'final_url', 'redirect_chain', 'cached', 'latency_ms'],
+    'scrape': ['url', 'region', 'alternate_url', 'error'],
+    'crawl': ['url', 'alternates', 'error'],
+}
+
+_default_queue = None
+_default_queue_lock = threading.Lock()
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class Job:
+    __slots__ = ('id', 'kind', 'label', 'params', 'state', 'done', 'total', 'error', 'created_at', 'started_at',
+                 'finished_at', 'updated_at')
+
+    _COLUMNS = ', '.join(__slots__)
+
+    def __init__(self, row):
+        for name, value in zip(self.__slots__, row):
+            setattr(self, name, value)
+        self.params = json.loads(self.params)
+
+    @property
+    def active(self) -> bool:
+        return self.state in ACTIVE_STATES
+
+    @property
+    def elapsed(self) -> float:
+        if not self.started_at:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    @property
+    def rate(self) -> float:
+        return self.done / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def source_urls(params: Dict) -> List[str]:
+    """
+    The URLs a job works on: its 'urls', or every URL of its 'sitemap' (a
+    sitemap_cache.KNOWN_SITEMAPS name), loaded when the job runs.
+    """
+    if params.get('sitemap'):
+        return sitemap_cache.load_sitemap(sitemap_cache.KNOWN_SITEMAPS[params['sitemap']][0]).urls
+    return params.get('urls', [])
+
+
+class _JobRun:
+    """
+    One execution of a job: buffers its results, writes them in batches with
+    the job's progress, and raises JobCancelled once cancel() was called or
+    the job was taken over by another worker.
+    """
+
+    def __init__(self, queue: 'JobQueue', job: Job, done: Set[str]):
+        self.queue = queue
+        self.job = job
+        self.done = done
+        self.total = job.total
+        self.resumed = bool(done) or job.started_at is not None
+        self._pending: List[Tuple[int, str, str]] = []
+        self._last_flush = time.monotonic()
+
+    def add(self, url: str, data):
+        self.done.add(url)
+        self._pending.append((self.job.id, url, json.dumps(data)))
+        if len(self._pending) >= FLUSH_ROWS:
+            self.flush()
+        else:
+            self.tick()
+
+    def tick(self):
+        """
+        Flush if FLUSH_SECONDS passed since the last flush; called between
+        results and while waiting for one, as the job's heartbeat.
+        """
+        if time.monotonic() - self._last_flush >= FLUSH_SECONDS:
+            self.flush()
+
+    def flush(self):
+        cancelled = self.queue._save_progress(self.job.id, self._pending, len(self.done), self.total)
+        self._pending = []
+        self._last_flush = time.monotonic()
+        if cancelled:
+            raise JobCancelled()
+
+
+def _limiter(params: Dict) -> rate_limit.RateLimiter:
+    """
+    The job's own adaptive per-host limiter, at most params' per_host_limit
+    concurrent requests per host.
+    """
+    return rate_limit.RateLimiter(max_concurrency=params.get('per_host_limit', url_status.DEFAULT_PER_HOST_LIMIT))
+
+
+def _status_job(run: _JobRun) -> Iterator[Tuple[str, list]]:
+    params = run.job.params
+    urls = [url for url in dict.fromkeys(source_urls(params)) if url not in run.done]
+    run.total = len(run.done) + len(urls)
+    per_host_limit = params.get('per_host_limit', url_status.DEFAULT_PER_HOST_LIMIT)
+    results = url_status.iter_url_status(
+        urls, max_workers=params.get('max_workers', url_status.DEFAULT_MAX_WORKERS), per_host_limit=per_host_limit,
+        cache=status_cache.get_status_cache() if params.get('use_cache', True) else None,
+        cache_ttl=params.get('cache_ttl'), force_refresh=params.get('force_refresh', False),
+        max_hops=params.get('max_hops', redirects.DEFAULT_MAX_HOPS), ordered=False,
+        limiter=_limiter(params))
+    try:
+        for result in results:
+            yield result.url, [str(result.status), result.redirect_url,
+                               result.display_url if len(result.hops) > 1 else None, result.from_cache,
+                               round(sum(hop.latency for hop in result.hops) * 1000, 1) if result.hops else None]
+    finally:
+        results.close()
+
+
+def _scrape_job(run: _JobRun) -> Iterator[Tuple[str, list]]:
+    params = run.job.params
+    urls = [url for url in dict.fromkeys(source_urls(params)) if url not in run.done]
+    run.total = len(run.done) + len(urls)
+    results = alternate_links.iter_scrape_alternates(
+        urls, max_workers=params.get('max_workers', alternate_links.DEFAULT_MAX_WORKERS), limiter=_limiter(params))
+    try:
+        for result in results:
+            yield result.url, [result.categorized, result.error]
+    finally:
+        results.close()
+
+
+def _crawl_job(run: _JobRun) -> Iterator[Tuple[str, list]]:
+    params = run.job.params
+    crawl = hreflang_crawler.HreflangCrawl(params['crawl_id'])
+    # A resumed job continues from the crawl's checkpoint instead of reseeding it
+    if not run.resumed and (params.get('sitemap') or params.get('urls')):
+        crawl.start(source_urls(params), source=params.get('sitemap') or 'Entered URLs')
+    max_pages = params.get('max_pages')
+    if max_pages:
+        max_pages -= len(run.done)
+        if max_pages <= 0:
+            return
+    pages = crawl.run(max_workers=params.get('max_workers', hreflang_crawler.DEFAULT_MAX_WORKERS),
+                      max_pages=max_pages, limiter=_limiter(params))
+    try:
+        for result in pages:
+            run.total = len(run.done) + 1 + len(crawl.frontier)
+            yield result.url, [len(result.links), result.error]
+    finally:
+        pages.close()
+
+
+RUNNERS = {'status': _status_job, 'scrape': _scrape_job, 'crawl': _crawl_job}
+
+
+def result_rows(kind: str, url: str, data: list) -> Iterator[list]:
+    """
+    Export rows (in JOB_FIELDS[kind] order) of one stored result.
+    """
+    if kind == 'scrape':
+        categorized, error = data
+        if error:
+            yield [url, None, None, error]
+        for region, region_urls in categorized.items():
+            for alternate_url in region_urls:
+                yield [url, region, alternate_url, None]
+    else:
+        yield [url] + data
+
+
+class JobQueue:
+    def __init__(self, path: Optional[str] = None, workers: int = DEFAULT_WORKERS):
+        self.path = path or data_path('jobs.sqlite3')
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition()
+        # Identifies this queue's workers as the owner of the jobs they run
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._threads: List[threading.Thread] = []
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " kind TEXT NOT NULL,"
+                " label TEXT NOT NULL,"
+                " params TEXT NOT NULL,"
+                " state TEXT NOT NULL,"
+                " done INTEGER NOT NULL DEFAULT 0,"
+                " total INTEGER,"
+                " error TEXT,"
+                " created_at REAL NOT NULL,"
+                " started_at REAL,"
+                " finished_at REAL,"
+                " updated_at REAL,"
+                " cancel_requested INTEGER NOT NULL DEFAULT 0,"
+                " owner TEXT)"
+            )
+            if 'owner' not in {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}:
+                self._conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS job_results ("
+                " job_id INTEGER NOT NULL,"
+                " url TEXT NOT NULL,"
+                " data TEXT NOT NULL)"
+            )
+            if not self._conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'job_results_url'").fetchone():
+                # One row per URL; tables from before the index keep each URL's latest row
+                self._conn.execute("DELETE FROM job_results WHERE rowid NOT IN"
+                                   " (SELECT MAX(rowid) FROM job_results GROUP BY job_id, url)")
+                self._conn.execute("CREATE UNIQUE INDEX job_results_url ON job_results (job_id, url)")
+                self._conn.execute("DROP INDEX IF EXISTS job_results_job")
+
+    # Workers
+
+    def start(self):
+        """
+        Requeue jobs whose worker stopped, then start the workers.
+        """
+        self._requeue_stale()
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, name=f"audit-job-{len(self._threads) + 1}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _requeue_stale(self):
+        """
+        Queue again the running jobs whose heartbeat is older than
+        STALE_SECONDS (those cancelled meanwhile end as cancelled). Jobs of
+        live workers, in this process or another, are left alone.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET state = ?, finished_at = ?, owner = NULL"
+                " WHERE state = ? AND cancel_requested = 1 AND COALESCE(updated_at, 0) < ?",
+                (CANCELLED, now, RUNNING, now - STALE_SECONDS))
+            self._conn.execute(
+                "UPDATE jobs SET state = ?, owner = NULL WHERE state = ? AND COALESCE(updated_at, 0) < ?",
+                (QUEUED, RUNNING, now - STALE_SECONDS))
+
+    def _work(self):
+        while True:
+            job = self._claim()
+            if job is None:
+                self._requeue_stale()
+                with self._wakeup:
+                    self._wakeup.wait(timeout=5.0)
+                continue
+            self._run(job)
+
+    def _claim(self) -> Optional[Job]:
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                f"SELECT {Job._COLUMNS} FROM jobs WHERE state = ? ORDER BY id LIMIT 1", (QUEUED,)).fetchone()
+            if row is None:
+                return None
+            job = Job(row)
+            now = time.time()
+            # Conditional, so a worker of another process cannot claim the same job
+            claimed = self._conn.execute(
+                "UPDATE jobs SET state = ?, started_at = COALESCE(started_at, ?), updated_at = ?, owner = ?"
+                " WHERE id = ? AND state = ?", (RUNNING, now, now, self.owner, job.id, QUEUED)).rowcount
+        return job if claimed else None
+
+    def _run(self, job: Job):
+        run = _JobRun(self, job, {url for url, _ in self.iter_results(job.id)})
+        results = queue.Queue(maxsize=FLUSH_ROWS)
+        stop = threading.Event()
+
+        def produce():
+            # Runs the job's runner on its own thread, so this one can keep the
+            # heartbeat and see a cancel while the runner waits on slow requests
+            items = RUNNERS[job.kind](run)
+            try:
+                for item in items:
+                    while not stop.is_set():
+                        try:
+                            results.put(item, timeout=1.0)
+                            break
+                        except queue.Full:
+                            pass
+                    if stop.is_set():
+                        break
+                item = None
+            except Exception as e:
+                item = e
+            finally:
+                # Stops the runner's executor (and checkpoints a crawl) when abandoned
+                items.close()
+            while not stop.is_set():
+                try:
+                    results.put(item, timeout=1.0)
+                    break
+                except queue.Full:
+                    pass
+
+        threading.Thread(target=produce, name=f"audit-job-{job.id}-runner", daemon=True).start()
+        state, error = DONE, None
+        try:
+            while True:
+                try:
+                    item = results.get(timeout=FLUSH_SECONDS)
+                except queue.Empty:
+                    run.tick()
+                    continue
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                run.add(*item)
+            run.flush()
+        except JobCancelled:
+            state = CANCELLED
+        except Exception as e:
+            state, error = FAILED, f"{type(e).__name__}: {e}"
+            try:
+                run.flush()
+            except JobCancelled:
+                pass
+        finally:
+            stop.set()
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE jobs SET state = ?, error = ?, finished_at = ?, updated_at = ?"
+                               " WHERE id = ? AND owner = ?", (state, error, now, now, job.id, self.owner))
+
+    def _save_progress(self, job_id: int, rows: List[Tuple[int, str, str]], done: int, total) -> bool:
+        """
+        Store a batch of results and the job's progress; True when the job
+        has been cancelled, deleted or taken over by another worker, in which
+        case nothing is stored.
+        """
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT cancel_requested, owner FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None or row[1] != self.owner:
+                return True
+            self._conn.executemany("INSERT OR REPLACE INTO job_results (job_id, url, data) VALUES (?, ?, ?)", rows)
+            self._conn.execute("UPDATE jobs SET done = ?, total = ?, updated_at = ? WHERE id = ?",
+                               (done, total, time.time(), job_id))
+            return bool(row[0])
+
+    # Jobs
+
+    def submit(self, kind: str, params: Dict, label: str) -> int:
+        """
+        Queue a job and return its id. params are the kind's options, with
+        the URLs as 'urls' or a 'sitemap' name (a 'crawl_id' for crawls,
+        seeded from them when given).
+        """
+        if kind not in RUNNERS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        if kind == 'crawl':
+            crawl_id = hreflang_crawler.HreflangCrawl(params['crawl_id']).crawl_id
+            if self.active_crawl(crawl_id):
+                raise ValueError(f"Crawl {crawl_id} already has a job queued or running")
+            params = dict(params, crawl_id=crawl_id)
+        now = time.time()
+        with self._lock, self._conn:
+            job_id = self._conn.execute(
+                "INSERT INTO jobs (kind, label, params, state, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (kind, label, json.dumps(params), QUEUED, now, now)).lastrowid
+        with self._wakeup:
+            self._wakeup.notify()
+        return job_id
+
+    def get(self, job_id: int) -> Optional[Job]:
+        with self._lock:
+            row = self._conn.execute(f"SELECT {Job._COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return Job(row) if row else None
+
+    def jobs(self, limit: int = 100) -> List[Job]:
+        """
+        The most recent jobs, newest first.
+        """
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {Job._COLUMNS} FROM jobs ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+        return [Job(row) for row in rows]
+
+    def active_crawl(self, crawl_id: str) -> Optional[Job]:
+        for job in self.jobs():
+            if job.kind == 'crawl' and job.active and job.params.get('crawl_id') == crawl_id:
+                return job
+        return None
+
+    def cancel(self, job_id: int):
+        """
+        Cancel a queued job now; a running one within FLUSH_SECONDS, whether
+        or not results arrive. Requests already sent finish in the background.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ?", (job_id,))
+            self._conn.execute("UPDATE jobs SET state = ?, finished_at = ?, updated_at = ? WHERE id = ? AND state = ?",
+                               (CANCELLED, time.time(), time.time(), job_id, QUEUED))
+
+    def delete(self, job_id: int):
+        """
+        Delete a finished job and its results.
+        """
+        with self._lock, self._conn:
+            if self._conn.execute("SELECT 1 FROM jobs WHERE id = ? AND state IN (?, ?)",
+                                  (job_id,) + ACTIVE_STATES).fetchone():
+                raise ValueError(f"Job {job_id} is still {QUEUED} or {RUNNING}; cancel it first")
+            self._conn.execute("DELETE FROM job_results WHERE job_id = ?", (job_id,))
+            self._conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+    # Results
+
+    def iter_results(self, job_id: int) -> Iterator[Tuple[str, list]]:
+        """
+        (url, data) of every stored result, oldest first, read in batches so a
+        running job keeps writing meanwhile.
+        """
+        last = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT rowid, url, data FROM job_results WHERE job_id = ? AND rowid > ? ORDER BY rowid LIMIT ?",
+                    (job_id, last, _READ_BATCH)).fetchall()
+            for last, url, data in rows:
+                yield url, json.loads(data)
+            if len(rows) < _READ_BATCH:
+                return
+
+    def latest_results(self, job_id: int, count: int = 200) -> List[Tuple[str, list]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, data FROM job_results WHERE job_id = ? ORDER BY rowid DESC LIMIT ?",
+                (job_id, count)).fetchall()
+        return [(url, json.loads(data)) for url, data in rows]
+
+    def iter_rows(self, job: Job) -> Iterator[list]:
+        """
+        Export rows of every stored result, in JOB_FIELDS[job.kind] order.
+        """
+        for url, data in self.iter_results(job.id):
+            yield from result_rows(job.kind, url, data)
+
+
+def get_job_queue() -> JobQueue:
+    """
+    Process-wide queue shared by all sessions, its workers started on first use.
+    """
+    global _default_queue
+    if _default_queue is None:
+        with _default_queue_lock:
+            if _default_queue is None:
+                queue = JobQueue()
+                queue.start()
+                _default_queue = queue
+    return _default_queue
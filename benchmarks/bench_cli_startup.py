@@ -0,0 +1,62 @@
+"""
+Cold-start time of the headless CLI, per subcommand, on empty input.
+Also checks that no subcommand pulls in Streamlit.
+
+    python -m benchmarks.bench_cli_startup [--repeat 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COMMANDS = [
+    ['--help'],
+    ['status'],
+    ['scrape-alternates'],
+    ['convert', 'live-to-author'],
+]
+
+# Runs a subcommand in-process on empty stdin and reports whether Streamlit got imported.
+_PROBE = (
+    "import io, sys; sys.stdin = io.StringIO(''); import cli; cli.main(sys.argv[1:]); "
+    "print('streamlit' in sys.modules, file=sys.stderr)"
+)
+
+
+def _run(argv):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, 'cli.py'] + argv, cwd=ROOT, stdin=subprocess.DEVNULL,
+                   stdout=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+
+def _timed(command):
+    start = time.perf_counter()
+    subprocess.run(command, check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    baseline = statistics.median(
+        _timed([sys.executable, '-c', 'pass']) for _ in range(args.repeat)
+    )
+    print(f"{'command':<30} {'median ms':>10} {'over python ms':>15} {'streamlit':>10}")
+    for argv in COMMANDS:
+        median = statistics.median(_run(argv) for _ in range(args.repeat))
+        streamlit = '-'
+        if argv != ['--help']:
+            probe = subprocess.run([sys.executable, '-c', _PROBE] + argv, cwd=ROOT, capture_output=True, text=True)
+            streamlit = probe.stderr.strip().splitlines()[-1] if probe.stderr.strip() else '?'
+        print(f"{' '.join(argv):<30} {median * 1000:>10.0f} {(median - baseline) * 1000:>15.0f} {streamlit:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Several users checking overlapping URL lists at the same moment, against the
+local stand-in site: how many requests reached the network and how many were
+coalesced into another user's request.
+
+    python -m benchmarks.bench_coalescing [--users 6] [--urls 200] [--overlap 0.75]
+
+Each user checks its own status run (own resolver, own limiter, no status
+cache), as separate Streamlit sessions would. Slow URLs keep requests in
+flight long enough for the users to overlap.
+"""
+import argparse
+import threading
+import time
+
+import single_flight
+import url_status
+from benchmarks.standin import SiteConfig, StandInSite
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=6)
+    parser.add_argument('--urls', type=int, default=200)
+    parser.add_argument('--overlap', type=float, default=0.75, help="share of each user's URLs common to all users")
+    parser.add_argument('--delay-ms', type=int, default=100, help="stand-in response time")
+    args = parser.parse_args()
+
+    shared = int(args.urls * args.overlap)
+    with StandInSite(SiteConfig(pages=100)) as site:
+        lists = [[site.slow_url(args.delay_ms, i) for i in range(shared)]
+                 + [site.slow_url(args.delay_ms, 100_000 * (user + 1) + i) for i in range(args.urls - shared)]
+                 for user in range(args.users)]
+        before = single_flight.group('status hop').stats()
+        elapsed = {}
+
+        def check(user):
+            start = time.perf_counter()
+            for _ in url_status.iter_url_status(lists[user], max_workers=16, ordered=False):
+                pass
+            elapsed[user] = time.perf_counter() - start
+
+        threads = [threading.Thread(target=check, args=(user,)) for user in range(args.users)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        after = single_flight.group('status hop').stats()
+
+    calls = after['calls'] - before['calls']
+    network = after['network calls'] - before['network calls']
+    print(f"{args.users} users x {args.urls} URLs ({args.overlap:.0%} shared)")
+    print(f"hop requests asked for:      {calls}")
+    print(f"sent over the network:       {network}")
+    print(f"coalesced:                   {calls - network} ({(calls - network) / max(1, calls):.0%})")
+    print(f"slowest user:                {max(elapsed.values()):.2f} s")
+
+
+if __name__ == '__main__':
+    main()
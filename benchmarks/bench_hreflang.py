@@ -0,0 +1,119 @@
+"""
+Compare the streaming head-only alternate-link extractor with the previous
+full-document BeautifulSoup path: body bytes read and parse time per page.
+
+    python -m benchmarks.bench_hreflang [URL ...]
+
+Without URLs, synthetic pages are served from a local HTTP server.
+"""
+import argparse
+import http.server
+import statistics
+import threading
+import time
+
+from bs4 import BeautifulSoup
+
+import alternate_links
+import http_client
+
+LOCALES = ['en-us', 'en-gb', 'de-de', 'fr-fr', 'es-es', 'it-it', 'pl-pl', 'ru-ru', 'tr-tr', 'ja-jp', 'ko-kr',
+           'zh-tw', 'zh-cn', 'en-in', 'es-la', 'pt-br', 'en-au', 'en-sg', 'th-th', 'vi-vn']
+
+
+def _synthetic_page(body_kb):
+    links = ''.join(
+        f'<link rel="alternate" hreflang="{locale}" href="https://www.nvidia.com/{locale}/geforce/">\n'
+        for locale in LOCALES
+    )
+    head = f'<html><head><meta charset="utf-8"><title>GeForce</title>\n{links}</head>\n'
+    body = '<body>' + ('<div class="para">' + 'x' * 1000 + '</div>\n') * body_kb + '</body></html>'
+    return (head + body).encode('utf-8')
+
+
+def _serve_synthetic(body_kb):
+    page = _synthetic_page(body_kb)
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(page)))
+            self.end_headers()
+            try:
+                self.wfile.write(page)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/page"
+
+
+def _legacy(url):
+    response = http_client.get(url)
+    response.raise_for_status()
+    start = time.perf_counter()
+    soup = BeautifulSoup(response.text, 'html.parser')
+    links = soup.head.find_all('link', rel='alternate') if soup.head else []
+    parse_time = time.perf_counter() - start
+    return len(response.content), parse_time, len(links)
+
+
+def _streaming(url):
+    response = http_client.get(url, stream=True)
+    read = [0]
+    parse_time = [0.0]
+
+    def chunks():
+        for chunk in response.iter_content(alternate_links.HEAD_CHUNK_SIZE):
+            read[0] += len(chunk)
+            start = time.perf_counter()
+            yield chunk
+            parse_time[0] -= time.perf_counter() - start
+
+    try:
+        response.raise_for_status()
+        start = time.perf_counter()
+        links, _ = alternate_links.parse_head_links(chunks())
+        parse_time[0] += time.perf_counter() - start
+    finally:
+        response.close()
+    return read[0], parse_time[0], len(links)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('urls', nargs='*')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--body-kb', type=int, default=400, help="body size of the synthetic page")
+    args = parser.parse_args()
+
+    server = None
+    urls = args.urls
+    if not urls:
+        server, url = _serve_synthetic(args.body_kb)
+        urls = [url]
+
+    print(f"{'path':<10} {'bytes read':>12} {'parse ms':>10} {'wall ms':>10} {'links':>6}  url")
+    for url in urls:
+        for name, func in (('bs4', _legacy), ('streaming', _streaming)):
+            samples = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                read, parse_time, count = func(url)
+                samples.append((read, parse_time, time.perf_counter() - start, count))
+            read = samples[-1][0]
+            parse_ms = statistics.median(s[1] for s in samples) * 1000
+            wall_ms = statistics.median(s[2] for s in samples) * 1000
+            print(f"{name:<10} {read:>12} {parse_ms:>10.2f} {wall_ms:>10.2f} {samples[-1][3]:>6}  {url}")
+
+    if server:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
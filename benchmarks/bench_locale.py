@@ -0,0 +1,75 @@
+"""
+Micro-benchmark: region categorization of 100k URLs with the compiled
+LocaleClassifier versus the previous per-code substring scan.
+
+    python -m benchmarks.bench_locale [--urls 100000]
+"""
+import argparse
+import random
+import time
+
+import locales
+
+
+def _legacy_categorize(urls, region_codes):
+    categorized_urls = {region: [] for region in locales.REGIONS}
+    for url in urls:
+        for region, codes in region_codes.items():
+            if any(code in url for code in codes):
+                categorized_urls[region].append(url)
+                break
+        else:
+            categorized_urls['US'].append(url)
+    return categorized_urls
+
+
+def _synthetic_urls(count, seed=0):
+    rng = random.Random(seed)
+    all_locales = [code for codes in locales.REGION_CODES.values() for code in codes if not code.startswith('.')]
+    sections = ['geforce', 'data-center', 'design-visualization', 'drivers', 'autonomous-machines', 'ai-data-science']
+    urls = []
+    for i in range(count):
+        section = rng.choice(sections)
+        roll = rng.random()
+        if roll < 0.05:
+            urls.append(f"https://www.nvidia.cn/{section}/page-{i}/")
+        elif roll < 0.35:
+            # en-us pages whose deeper path happens to contain another locale code
+            urls.append(f"https://www.nvidia.com/en-us/{section}/{rng.choice(all_locales)}-offers/page-{i}/")
+        else:
+            urls.append(f"https://www.nvidia.com/{rng.choice(all_locales + ['en-us'])}/{section}/page-{i}/")
+    return urls
+
+
+def _best_of(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--urls', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    urls = _synthetic_urls(args.urls)
+    legacy_time, legacy = _best_of(lambda: _legacy_categorize(urls, locales.REGION_CODES), args.repeat)
+    compiled_time, compiled = _best_of(lambda: locales.categorize_urls(urls), args.repeat)
+
+    legacy_region = {url: region for region, region_urls in legacy.items() for url in region_urls}
+    compiled_region = {url: region for region, region_urls in compiled.items() for url in region_urls}
+    differing = sum(1 for url in urls if legacy_region[url] != compiled_region[url])
+
+    print(f"URLs:              {len(urls)}")
+    print(f"substring scan:    {legacy_time * 1000:8.1f} ms  ({len(urls) / legacy_time:,.0f} URLs/s)")
+    print(f"compiled lookup:   {compiled_time * 1000:8.1f} ms  ({len(urls) / compiled_time:,.0f} URLs/s)")
+    print(f"speed-up:          {legacy_time / compiled_time:8.1f}x")
+    print(f"reclassified URLs: {differing} (substring false matches on deeper path segments)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+"""
+Offline benchmark suite. Starts the local stand-in site (benchmarks.standin)
+and measures throughput, latency percentiles and peak Python memory for the
+status checker, alternate-link fetching, sitemap extraction (flat, index and
+gzip), brand lookup and the bulk converters. Results are written as JSON so
+runs can be compared.
+
+    python -m benchmarks.bench_suite [--pages 5000] [--only status sitemap_flat ...]
+    python -m benchmarks.bench_suite --compare benchmarks/results/<earlier run>.json
+
+Latency is per URL for the network benchmarks, per query for brand lookup
+and per run for the single-call benchmarks (sitemaps, converters). Peak
+memory is measured with tracemalloc in a separate pass so that tracing does
+not distort the timings.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+import alternate_links
+import bulk_convert
+import rate_limit
+import sitemap_parser
+import url_status
+from benchmarks.standin import BRANDS, LOCALES, SECTIONS, SiteConfig, StandInSite
+from path_index import PathIndex
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+
+def _percentiles(samples):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+
+    def at(q):
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3)
+
+    return {'p50': at(0.50), 'p90': at(0.90), 'p99': at(0.99), 'max': round(ordered[-1] * 1000, 3)}
+
+
+def _timed(func):
+    def wrapper(*args):
+        start = time.perf_counter()
+        func(*args)
+        return time.perf_counter() - start
+    return wrapper
+
+
+# Each benchmark returns (items processed, per-item latencies in seconds or None).
+
+def bench_status(site, args):
+    urls = site.page_urls(args.status_urls)
+    extra = max(1, len(urls) // 10)
+    urls += [site.redirect_url(3, i) for i in range(extra)]
+    urls += [site.slow_url(args.slow_ms, i) for i in range(extra // 4)]
+    urls += [site.fail_url(404, i) for i in range(extra // 4)]
+    urls += [site.fail_url(500, i) for i in range(max(1, extra // 20))]
+    limiter = rate_limit.RateLimiter(max_rate=args.max_rate, max_concurrency=url_status.DEFAULT_PER_HOST_LIMIT)
+    latencies = [sum(hop.latency for hop in result.hops)
+                 for result in url_status.iter_url_status(urls, ordered=False, limiter=limiter)]
+    return len(urls), latencies
+
+
+def bench_alternates(site, args):
+    urls = site.page_urls(args.scrape_urls)
+    fetch = _timed(alternate_links.fetch_alternate_urls)
+    limiter = rate_limit.RateLimiter(max_rate=args.max_rate)
+    with ThreadPoolExecutor(max_workers=alternate_links.DEFAULT_MAX_WORKERS) as executor:
+        latencies = list(executor.map(lambda url: fetch(url, limiter), urls))
+    return len(urls), latencies
+
+
+def _bench_sitemap(path):
+    def bench(site, args):
+        return sum(1 for _ in sitemap_parser.iter_sitemap_urls(site.base + path)), None
+    return bench
+
+
+def bench_brand_lookup(site, args):
+    urls = site.page_urls()
+    index = PathIndex(urls, site.base_url)
+    latencies = []
+    for brand in index.children(pages_only=True):
+        for query in (lambda: index.child_counts([brand]), lambda: index.urls_under([brand])):
+            start = time.perf_counter()
+            query()
+            latencies.append(time.perf_counter() - start)
+    return len(urls), latencies
+
+
+def _converter_inputs(count):
+    live = pd.Series([f"https://www.nvidia.com/{LOCALES[i % len(LOCALES)]}/{BRANDS[i % len(BRANDS)]}/"
+                      f"{SECTIONS[i % len(SECTIONS)]}/page-{i}/" for i in range(count)])
+    return {
+        'live-to-author': live,
+        'author-to-live': bulk_convert.live_to_author(live),
+        'live-to-preview': live,
+        'preview-to-live': bulk_convert.live_to_preview(live),
+    }
+
+
+def _bench_converter(conversion):
+    def bench(site, args):
+        urls = args.converter_inputs[conversion]
+        bulk_convert.convert(urls, conversion)
+        return len(urls), None
+    return bench
+
+
+BENCHMARKS = {
+    'status': bench_status,
+    'alternates': bench_alternates,
+    'sitemap_flat': _bench_sitemap('/sitemap.xml'),
+    'sitemap_gzip': _bench_sitemap('/sitemap.xml.gz'),
+    'sitemap_index': _bench_sitemap('/sitemap-index.xml'),
+    'brand_lookup': bench_brand_lookup,
+}
+BENCHMARKS.update({f"convert_{name.replace('-', '_')}": _bench_converter(name) for name in bulk_convert.CONVERSIONS})
+
+
+def run_benchmark(name, func, site, args):
+    walls = []
+    latencies = []
+    items = 0
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        items, samples = func(site, args)
+        walls.append(time.perf_counter() - start)
+        latencies.extend(samples if samples is not None else [walls[-1]])
+
+    peak = None
+    if not args.no_memory:
+        tracemalloc.start()
+        func(site, args)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    seconds = statistics.median(walls)
+    return {
+        'name': name,
+        'items': items,
+        'repeat': args.repeat,
+        'seconds': round(seconds, 4),
+        'throughput': round(items / seconds, 1) if seconds > 0 else None,
+        'latency_ms': _percentiles(latencies),
+        'peak_memory_mb': round(peak / 2 ** 20, 2) if peak is not None else None,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _print_table(results, baseline=None):
+    before = {result['name']: result for result in (baseline or {}).get('results', [])}
+    print(f"{'benchmark':<28} {'items':>8} {'seconds':>9} {'items/s':>12} {'p50 ms':>9} {'p99 ms':>9} "
+          f"{'peak MB':>8}" + ('  vs baseline' if baseline else ''))
+    for result in results:
+        latency = result['latency_ms'] or {}
+        line = (f"{result['name']:<28} {result['items']:>8} {result['seconds']:>9.3f} "
+                f"{result['throughput'] or 0:>12,.1f} {latency.get('p50', 0):>9.3f} {latency.get('p99', 0):>9.3f} "
+                f"{result['peak_memory_mb'] if result['peak_memory_mb'] is not None else '-':>8}")
+        old = before.get(result['name'])
+        if old and old.get('throughput') and result['throughput']:
+            line += f"  {result['throughput'] / old['throughput']:.2f}x throughput"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), help="benchmarks to run (default: all)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--pages', type=int, default=5000, help="pages in the stand-in sitemaps")
+    parser.add_argument('--sitemap-children', type=int, default=10)
+    parser.add_argument('--head-kb', type=int, default=4, help="<head> padding of each stand-in page")
+    parser.add_argument('--body-kb', type=int, default=100)
+    parser.add_argument('--hreflang-count', type=int, default=20)
+    parser.add_argument('--status-urls', type=int, default=1000)
+    parser.add_argument('--scrape-urls', type=int, default=500)
+    parser.add_argument('--slow-ms', type=int, default=200, help="delay of the slow endpoints")
+    parser.add_argument('--max-rate', type=float, default=rate_limit.DEFAULT_RATE,
+                        help="per-host request rate limit (the stand-in is a single host)")
+    parser.add_argument('--convert-urls', type=int, default=100_000)
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc pass")
+    parser.add_argument('--output', help="results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument('--compare', help="earlier results file to compare throughput against")
+    args = parser.parse_args()
+
+    config = SiteConfig(args.pages, args.sitemap_children, args.head_kb, args.body_kb, args.hreflang_count)
+    args.converter_inputs = _converter_inputs(args.convert_urls)
+    names = args.only or list(BENCHMARKS)
+
+    results = []
+    with StandInSite(config) as site:
+        for name in names:
+            print(f"running {name} ...", file=sys.stderr)
+            results.append(run_benchmark(name, BENCHMARKS[name], site, args))
+
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'site': config.to_dict(),
+        'options': {key: value for key, value in vars(args).items()
+                    if key not in ('converter_inputs', 'output', 'compare', 'only')},
+        'results': results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, time.strftime('%Y%m%d-%H%M%S') + '.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+    _print_table(results, baseline)
+    print(f"Results written to {output}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
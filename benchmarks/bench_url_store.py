@@ -0,0 +1,91 @@
+"""
+Memory and speed of the shared URLStore versus per-session lists of URL
+strings, on a synthetic sitemap of realistic nvidia.com URLs.
+
+    python -m benchmarks.bench_url_store [--urls 50000] [--sessions 24]
+
+Memory is measured with tracemalloc: S sessions each holding their own parsed
+list (what every session held before sitemaps were shared), one list shared
+by all sessions, and one URLStore shared by all sessions.
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+from benchmarks.standin import BRANDS, LOCALES, SECTIONS
+from path_index import PathIndex
+from url_store import URLStore
+
+
+def _synthetic_urls(count, seed=0):
+    rng = random.Random(seed)
+    words = ['overview', 'specs', 'buy', 'news', 'whitepaper', 'support', 'drivers', 'reviews', 'compare']
+    urls = []
+    for i in range(count):
+        depth = rng.randint(0, 3)
+        tail = ''.join(f"{rng.choice(words)}-{rng.randint(0, 99)}/" for _ in range(depth))
+        urls.append(f"https://www.nvidia.com/{LOCALES[0]}/{rng.choice(BRANDS)}/{rng.choice(SECTIONS)}/{tail}page-{i}/")
+    return urls
+
+
+def _traced(build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    seconds = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size, seconds
+
+
+def _best_of(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--urls', type=int, default=50_000)
+    parser.add_argument('--sessions', type=int, default=24)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    urls = _synthetic_urls(args.urls)
+    text = '\n'.join(urls)
+    mb = 2 ** 20
+
+    # Each session parsed the sitemap itself, so it held its own string objects
+    _, per_session, _ = _traced(lambda: [text.split('\n') for _ in range(args.sessions)])
+    _, shared_list, _ = _traced(lambda: text.split('\n'))
+    store, shared_store, build_seconds = _traced(lambda: URLStore(text.split('\n')))
+    index, index_size, index_seconds = _traced(lambda: PathIndex(store, 'https://www.nvidia.com/en-us/'))
+
+    brand_prefix = f"https://www.nvidia.com/{LOCALES[0]}/{BRANDS[0]}/"
+    sorted_urls = sorted(urls)
+    iterate_list = _best_of(lambda: sum(1 for _ in sorted_urls), args.repeat)
+    iterate_store = _best_of(lambda: sum(1 for _ in store), args.repeat)
+    scan_list = _best_of(lambda: [url for url in sorted_urls if url.startswith(brand_prefix)], args.repeat)
+    query_store = _best_of(lambda: store.with_prefix(brand_prefix), args.repeat)
+    count_store = _best_of(lambda: store.count_prefix(brand_prefix), args.repeat)
+    probes = urls[::max(1, len(urls) // 1000)]
+    contains_store = _best_of(lambda: all(url in store for url in probes), args.repeat) / len(probes)
+
+    print(f"URLs:                        {len(store):,} ({len(text.encode('utf-8')) / mb:.2f} MB of text)")
+    print(f"{args.sessions} per-session lists:       {per_session / mb:8.2f} MB")
+    print(f"one shared list:             {shared_list / mb:8.2f} MB")
+    print(f"one shared URLStore:         {shared_store / mb:8.2f} MB  ({store.nbytes / mb:.2f} MB encoded, "
+          f"{shared_list / max(1, shared_store):.1f}x smaller than the list, built in {build_seconds:.2f} s)")
+    print(f"PathIndex over the store:    {index_size / 1024:8.1f} KB  (built in {index_seconds * 1000:.2f} ms)")
+    print(f"iterate all URLs:            list {iterate_list * 1000:7.2f} ms   store {iterate_store * 1000:7.2f} ms")
+    print(f"URLs under one brand:        list scan {scan_list * 1000:7.2f} ms   store bisect {query_store * 1000:7.2f} ms"
+          f"   (count only {count_store * 1e6:.1f} us)")
+    print(f"membership test:             store {contains_store * 1e6:.1f} us per URL")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Check that rel=alternate links without hreflang (RSS feeds, mobile pages)
+are left out of hreflang results. On the local stand-in site, whose pages
+declare a feed next to their hreflang links, a crawl must neither queue the
+feed nor give it a locale matrix column, and the validator must neither
+fetch it nor report issues about it.
+
+    python -m benchmarks.check_alternates [--pages 20]
+
+Exits with status 1 and prints the failed checks.
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+# Keep the check's crawl out of the real data directory
+os.environ['URL_TOOLKIT_DATA_DIR'] = tempfile.mkdtemp(prefix='check_alternates_')
+
+import hreflang_crawler  # noqa: E402
+import hreflang_validator  # noqa: E402
+from benchmarks.standin import SiteConfig, StandInSite  # noqa: E402
+
+
+def check_crawl(site, pages):
+    crawl = hreflang_crawler.HreflangCrawl('check-alternates', allowed_hosts=('127.0.0.1',))
+    crawl.start(site.page_urls(pages))
+    for _ in crawl.run(max_workers=4):
+        pass
+    hreflangs, rows = crawl.locale_matrix()
+    failures = []
+    if not hreflangs or not all(hreflangs):
+        failures.append(f"locale matrix columns: {hreflangs}")
+    if any(None in row or '' in row for row in rows):
+        failures.append("locale matrix rows keyed by a missing hreflang")
+    queued = [url for url in crawl.visited if '/feed/' in url or '/m/' in url]
+    if queued:
+        failures.append(f"{len(queued)} feed or mobile URLs queued, e.g. {queued[0]}")
+    return failures
+
+
+def check_validator(site, pages):
+    validator = hreflang_validator.HreflangValidator()
+    for _ in validator.run(site.page_urls(pages), max_workers=4):
+        pass
+    failures = []
+    fetched = [url for url in validator.pages if '/feed/' in url or '/m/' in url]
+    if fetched:
+        failures.append(f"validator fetched {len(fetched)} feed or mobile URLs, e.g. {fetched[0]}")
+    issues = [issue for issue in validator.issues()
+              if not issue.hreflang or '/feed/' in issue.target or '/m/' in issue.target]
+    if issues:
+        failures.append(f"{len(issues)} validator issues about alternates without hreflang, e.g. {issues[0]}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=20)
+    args = parser.parse_args()
+
+    with StandInSite(SiteConfig(pages=args.pages, head_kb=1, body_kb=1, hreflang_count=6,
+                                local_alternates=True, feed_alternates=True)) as site:
+        failures = check_crawl(site, args.pages) + check_validator(site, args.pages)
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Check that every vectorized bulk_convert conversion gives exactly the same
+output as the scalar URLToolkit method it mirrors, on generated sitemap-like
+URLs plus the edge cases below.
+
+    python -m benchmarks.check_converters [--urls 5000]
+
+Exits with status 1 and prints the differing inputs on any mismatch.
+"""
+import argparse
+import sys
+
+import pandas as pd
+
+import bulk_convert
+from URL_Tool_Kit import URLToolkit
+from benchmarks.standin import BRANDS, LOCALES, SECTIONS
+
+EDGE_CASES = [
+    'https://www.nvidia.com/en-us/',
+    'https://www.nvidia.com/de-de/geforce/',
+    'https://author.nvidia.com/content/nvidiaGDC/zz/en_ZZ/geforce/home.html',
+    'https://author.nvidia.com/content/nvidiaGDC/de/de_DE/geforce/a/b.html',
+    'https://author.nvidia.com/content/nvidiaGDC/de/de_DE/geforce/a/b.html?wcmmode=disabled',
+    # Not at the start of the string: the scalar converter does not match these
+    'see https://author.nvidia.com/content/nvidiaGDC/de/de_DE/geforce/a/b.html',
+    ' https://author.nvidia.com/content/nvidiaGDC/zz/en_ZZ/geforce/home.html',
+    'https://author.nvidia.com/content/nvidiaGDC/de/de_DE/geforce',
+    'https://preview.nvidia.com/en-zz/geforce/',
+    'not a url',
+]
+
+
+def scalar_conversions(toolkit):
+    return {
+        'live-to-author': toolkit.url_converting,
+        'author-to-live': lambda url: toolkit.convert_author_to_live_url(url) or '',
+        'live-to-preview': toolkit.livetopreviewConverting,
+        'preview-to-live': toolkit.previewtoliveConverting,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--urls', type=int, default=5000)
+    args = parser.parse_args()
+
+    live = pd.Series([f"https://www.nvidia.com/{LOCALES[i % len(LOCALES)]}/{BRANDS[i % len(BRANDS)]}/"
+                      f"{SECTIONS[i % len(SECTIONS)]}/page-{i}/" for i in range(args.urls)] + EDGE_CASES)
+    inputs = {
+        'live-to-author': live,
+        'author-to-live': pd.concat([bulk_convert.live_to_author(live), pd.Series(EDGE_CASES)], ignore_index=True),
+        'live-to-preview': live,
+        'preview-to-live': pd.concat([bulk_convert.live_to_preview(live), pd.Series(EDGE_CASES)], ignore_index=True),
+    }
+    failed = False
+    for name, scalar in scalar_conversions(URLToolkit()).items():
+        urls = inputs[name]
+        vectorized = bulk_convert.CONVERSIONS[name](urls)
+        mismatches = [(url, expected, actual) for url, expected, actual in zip(urls, map(scalar, urls), vectorized)
+                      if expected != actual]
+        print(f"{name:16} {len(urls):6} URLs  {'OK' if not mismatches else f'{len(mismatches)} mismatches'}")
+        for url, expected, actual in mismatches[:10]:
+            print(f"    {url!r}: scalar {expected!r}, vectorized {actual!r}")
+        failed = failed or bool(mismatches)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
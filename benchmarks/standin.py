@@ -0,0 +1,210 @@
+"""
+Local stand-in for the NVIDIA site, used by the benchmarks so they run
+offline and repeatably. Everything is generated from a SiteConfig:
+
+    /<locale>/<brand>/<section>/page-<i>/ HTML page (configurable head size and hreflang count)
+    /sitemap.xml                          flat sitemap of every page
+    /sitemap.xml.gz                       the same sitemap, gzip-compressed
+    /sitemap-index.xml                    index of /sitemaps/child-<n>.xml
+    /redirect/<hops>/<i>                  chain of <hops> 301s ending on a page
+    /slow/<ms>/<i>                        200 after <ms> milliseconds
+    /fail/<status>/<i>                    answers <status>
+
+    python -m benchmarks.standin --pages 5000     # serve until Ctrl+C
+"""
+import argparse
+import gzip
+import http.server
+import threading
+import time
+from typing import List
+
+LOCALES = ['en-us', 'en-gb', 'de-de', 'fr-fr', 'es-es', 'it-it', 'pl-pl', 'ru-ru', 'tr-tr', 'ja-jp', 'ko-kr',
+           'zh-tw', 'en-in', 'es-la', 'pt-br', 'en-au', 'en-sg', 'th-th', 'vi-vn', 'id-id']
+BRANDS = ['geforce', 'data-center', 'design-visualization', 'autonomous-machines', 'ai-data-science',
+          'networking', 'omniverse', 'self-driving-cars']
+SECTIONS = ['products', 'solutions', 'resources', 'news', 'support', 'technologies']
+
+
+class SiteConfig:
+    def __init__(self, pages: int = 5000, sitemap_children: int = 10, head_kb: int = 4, body_kb: int = 100,
+                 hreflang_count: int = 20, local_alternates: bool = False, feed_alternates: bool = False):
+        """
+        local_alternates points the hreflang links at the stand-in itself
+        (for crawling) instead of www.nvidia.com. feed_alternates adds an RSS
+        feed and a mobile page, rel=alternate links without hreflang.
+        """
+        self.pages = pages
+        self.sitemap_children = sitemap_children
+        self.head_kb = head_kb
+        self.body_kb = body_kb
+        self.hreflang_count = hreflang_count
+        self.local_alternates = local_alternates
+        self.feed_alternates = feed_alternates
+
+    def to_dict(self):
+        return dict(vars(self))
+
+
+def page_path(i: int) -> str:
+    return f"/en-us/{BRANDS[i % len(BRANDS)]}/{SECTIONS[i // len(BRANDS) % len(SECTIONS)]}/page-{i}/"
+
+
+def _sitemap(locs: List[str], tag: str = 'url', root: str = 'urlset') -> bytes:
+    entries = ''.join(f"<{tag}><loc>{loc}</loc><lastmod>2024-01-01</lastmod></{tag}>\n" for loc in locs)
+    return (f'<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<{root} xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n{entries}</{root}>\n').encode('utf-8')
+
+
+class StandInSite:
+    """
+    Threaded HTTP server for a SiteConfig; use as a context manager.
+    """
+
+    def __init__(self, config: SiteConfig = None, port: int = 0):
+        self.config = config or SiteConfig()
+        self._server = http.server.ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self._server.daemon_threads = True
+        self.base = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._documents = self._build_documents()
+        self._body = b'<body>' + (b'<div class="para">' + b'x' * 1000 + b'</div>\n') * self.config.body_kb \
+            + b'</body></html>'
+        self._thread = None
+
+    # URL helpers for the benchmarks
+    @property
+    def base_url(self) -> str:
+        return self.base + '/en-us/'
+
+    def page_urls(self, count: int = None) -> List[str]:
+        count = self.config.pages if count is None else min(count, self.config.pages)
+        return [self.base + page_path(i) for i in range(count)]
+
+    def redirect_url(self, hops: int, i: int) -> str:
+        return f"{self.base}/redirect/{hops}/{i}"
+
+    def slow_url(self, ms: int, i: int) -> str:
+        return f"{self.base}/slow/{ms}/{i}"
+
+    def fail_url(self, status: int, i: int) -> str:
+        return f"{self.base}/fail/{status}/{i}"
+
+    def _build_documents(self):
+        urls = self.page_urls()
+        flat = _sitemap(urls)
+        documents = {'/sitemap.xml': flat, '/sitemap.xml.gz': gzip.compress(flat, 6)}
+        children = max(1, self.config.sitemap_children)
+        child_locs = []
+        for n in range(children):
+            path = f"/sitemaps/child-{n}.xml"
+            documents[path] = _sitemap(urls[n::children])
+            child_locs.append(self.base + path)
+        documents['/sitemap-index.xml'] = _sitemap(child_locs, tag='sitemap', root='sitemapindex')
+        return documents
+
+    def _page(self, path: str) -> bytes:
+        config = self.config
+        origin = self.base if config.local_alternates else 'https://www.nvidia.com'
+        rest = path[path.index('/', 1):]
+        links = ''.join(
+            f'<link rel="alternate" hreflang="{locale}" href="{origin}/{locale}{rest}">\n'
+            for locale in (LOCALES * (config.hreflang_count // len(LOCALES) + 1))[:config.hreflang_count]
+        )
+        if config.feed_alternates:
+            links += (f'<link rel="alternate" type="application/rss+xml" title="News" href="{self.base}/feed{rest}">\n'
+                      f'<link rel="alternate" media="only screen and (max-width: 640px)" href="{self.base}/m{rest}">\n')
+        padding = '<meta name="filler" content="' + 'x' * 1000 + '">\n'
+        head = (f'<html><head><meta charset="utf-8"><title>{path}</title>\n'
+                f'{padding * config.head_kb}{links}</head>\n')
+        return head.encode('utf-8') + self._body
+
+    def _handler(self):
+        site = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _send(self, status, body=b'', content_type='text/html; charset=utf-8', headers=()):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.end_headers()
+                if self.command != 'HEAD':
+                    try:
+                        self.wfile.write(body)
+                    except (BrokenPipeError, ConnectionResetError):
+                        self.close_connection = True
+
+            def do_GET(self):
+                path = self.path.split('?', 1)[0]
+                parts = path.strip('/').split('/')
+                if path in site._documents:
+                    content_type = 'application/x-gzip' if path.endswith('.gz') else 'application/xml'
+                    self._send(200, site._documents[path], content_type)
+                elif parts[0] in LOCALES:
+                    self._send(200, site._page(path))
+                elif parts[0] == 'redirect' and len(parts) == 3:
+                    hops, i = int(parts[1]), int(parts[2])
+                    target = f"/redirect/{hops - 1}/{i}" if hops > 1 else page_path(i % site.config.pages)
+                    self._send(301, headers=[('Location', target)])
+                elif parts[0] == 'slow' and len(parts) == 3:
+                    time.sleep(int(parts[1]) / 1000)
+                    self._send(200, b'ok', 'text/plain')
+                elif parts[0] == 'fail' and len(parts) == 3:
+                    self._send(int(parts[1]), b'failed', 'text/plain')
+                else:
+                    self._send(404, b'not found', 'text/plain')
+
+            do_HEAD = do_GET
+
+            def handle(self):
+                # Clients drop connections mid-page on purpose (head-only scraping)
+                try:
+                    super().handle()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--pages', type=int, default=5000)
+    parser.add_argument('--sitemap-children', type=int, default=10)
+    parser.add_argument('--head-kb', type=int, default=4)
+    parser.add_argument('--body-kb', type=int, default=100)
+    parser.add_argument('--hreflang-count', type=int, default=20)
+    args = parser.parse_args()
+
+    config = SiteConfig(args.pages, args.sitemap_children, args.head_kb, args.body_kb, args.hreflang_count)
+    site = StandInSite(config, port=args.port)
+    print(f"Serving {config.pages} pages at {site.base} (sitemaps: /sitemap.xml, /sitemap.xml.gz, /sitemap-index.xml)")
+    try:
+        site._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
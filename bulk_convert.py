@@ -0,0 +1,119 @@
+import io
+import os
+
+import pandas as pd
+
+# Column-at-a-time versions of the URLToolkit converters for sitemap-sized
+# inputs. Each conversion runs as pandas string operations over the whole
+# Series rather than per-URL Python slicing, and must give exactly the same
+# output as the scalar URLToolkit method it mirrors.
+
+# Anchored: str.extract searches anywhere in the string, the scalar path uses re.match
+AUTHOR_URL_PATTERN = r'^https://author\.nvidia\.com/content/nvidiaGDC/([a-z]{2})/([a-zA-Z_]{4,5})/([^/]+)/(.+)\.html'
+
+# Header cells of a URL column; a first row with none of them is data
+URL_COLUMN_NAMES = ('url', 'urls', 'link', 'links', 'address', 'loc', 'page', 'page url', 'input_url')
+
+
+def live_to_author(urls: pd.Series) -> pd.Series:
+    """
+    Vectorized URLToolkit.url_converting.
+    """
+    first = urls.str.slice(0, 8)
+    second = urls.str.slice(11, 23)
+    lang = urls.str.slice(23, 28)
+    sec_last = urls.str.slice(28, -1)
+    region = lang.str.slice(3, 5)
+
+    locale = (region + '/' + lang.str.slice(0, 2) + '_' + region.str.upper()).where(
+        ~urls.str.contains('en-us', regex=False), 'zz/en_ZZ')
+    suffix = pd.Series('.html?wcmmode=disabled', index=urls.index).where(
+        urls.str.count('/') != 5, '/home.html?wcmmode=disabled')
+    return first + 'author' + second + 'content/nvidiaGDC/' + locale + sec_last + suffix
+
+
+def author_to_live(urls: pd.Series) -> pd.Series:
+    """
+    Vectorized URLToolkit.convert_author_to_live_url; URLs that do not match
+    the author pattern convert to an empty string.
+    """
+    parts = urls.str.extract(AUTHOR_URL_PATTERN)
+    region = parts[0].str.lower()
+    lang = parts[1].str.lower().str.split('_').str[0]
+    section = parts[2]
+    path = parts[3]
+
+    locale = (lang + '-' + region).where(region != 'zz', 'en-us')
+    tail = (path + '/').where(path != 'home', '')
+    return ('https://www.nvidia.com/' + locale + '/' + section + '/' + tail).fillna('')
+
+
+def live_to_preview(urls: pd.Series) -> pd.Series:
+    """
+    Vectorized URLToolkit.livetopreviewConverting.
+    """
+    return urls.str.replace('www', 'preview', regex=False).str.replace('en-us', 'en-zz', regex=False)
+
+
+def preview_to_live(urls: pd.Series) -> pd.Series:
+    """
+    Vectorized URLToolkit.previewtoliveConverting.
+    """
+    return urls.str.replace('preview', 'www', regex=False).str.replace('en-zz', 'en-us', regex=False)
+
+
+CONVERSIONS = {
+    'live-to-author': live_to_author,
+    'author-to-live': author_to_live,
+    'live-to-preview': live_to_preview,
+    'preview-to-live': preview_to_live,
+}
+
+
+def _url_column(frame: pd.DataFrame) -> pd.Series:
+    for column in frame.columns:
+        if str(column).strip().lower() in URL_COLUMN_NAMES:
+            return frame[column]
+    return frame[frame.columns[0]]
+
+
+def _clean(urls: pd.Series) -> pd.Series:
+    urls = urls.dropna().astype(str).str.strip()
+    return urls[urls != ''].reset_index(drop=True)
+
+
+def read_urls(data, file_name: str) -> pd.Series:
+    """
+    Read URLs from an uploaded CSV, XLSX or TXT file (bytes or file object).
+    CSV/XLSX use a 'url' column when present, else the first column. The
+    first row is a header only when one of its cells is in URL_COLUMN_NAMES,
+    so scheme-less URL lists keep their first URL.
+    """
+    if isinstance(data, (bytes, bytearray)):
+        data = io.BytesIO(data)
+    extension = os.path.splitext(file_name)[1].lower()
+
+    if extension == '.txt':
+        return _clean(pd.Series(io.TextIOWrapper(data, encoding='utf-8-sig').read().split()))
+
+    if extension in ('.xlsx', '.xlsm'):
+        frame = pd.read_excel(data, dtype=str, header=None, engine='openpyxl')
+    elif extension == '.csv':
+        frame = pd.read_csv(data, dtype=str, header=None, skip_blank_lines=True)
+    else:
+        raise ValueError(f"Unsupported file type: {extension or file_name}")
+
+    if frame.empty:
+        return pd.Series([], dtype=str)
+    first_row = frame.iloc[0].fillna('').astype(str).str.strip()
+    if first_row.str.lower().isin(URL_COLUMN_NAMES).any():
+        frame = frame.iloc[1:]
+        frame.columns = first_row
+    return _clean(_url_column(frame))
+
+
+def convert(urls: pd.Series, conversion: str) -> pd.DataFrame:
+    """
+    Apply a named conversion and return an input/converted two-column frame.
+    """
+    return pd.DataFrame({'input_url': urls, 'converted_url': CONVERSIONS[conversion](urls)})
@@ -0,0 +1,466 @@
+"""
+Headless command-line entry point for batch jobs and pipelines.
+
+    python cli.py status [FILE ...]                 check status codes
+    python cli.py scrape-alternates [FILE ...]      scrape <link rel="alternate"> sets
+    python cli.py convert CONVERSION [FILE ...]     live-to-author, author-to-live, ...
+    python cli.py brands [PATH]                     list brands / URLs under a sitemap path
+    python cli.py regions [PATH]                    compare URL counts under PATH across all regions
+    python cli.py sitemap-changes [NAME] --take     snapshot a sitemap, print URLs changed since the last one
+    python cli.py crawl NAME [--seed en-us|FILE]    resumable hreflang crawl; re-run to resume
+    python cli.py drivers [--check]                 list (or health-check) the driver URL matrix
+    python cli.py validate-hreflang [FILE ...]      reciprocal hreflang check of each page's alternates
+    python cli.py jobs [ID]                         list background jobs, or print one job's results
+
+URLs are read one per line from the given files (or stdin when none or '-')
+and results are streamed to stdout as JSONL (default) or CSV, or with --output
+FILE to a file, which may also be XLSX or Parquet (--format xlsx|parquet).
+Nothing here imports Streamlit, and each subcommand imports only what it
+needs, so startup stays fast and the network is only touched by subcommands
+that need it.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from itertools import islice
+
+CONVERSIONS = ('live-to-author', 'author-to-live', 'live-to-preview', 'preview-to-live')
+# --format values written through result_export, which need --output
+BINARY_FORMATS = {'xlsx': 'XLSX', 'parquet': 'Parquet'}
+
+SCRAPE_BATCH_SIZE = 256
+CONVERT_BATCH_SIZE = 10000
+
+
+def _iter_lines(paths):
+    for path in paths or ['-']:
+        handle = sys.stdin if path == '-' else open(path, encoding='utf-8-sig')
+        try:
+            for line in handle:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    yield line
+        finally:
+            if handle is not sys.stdin:
+                handle.close()
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class _Output:
+    """
+    Writes records either as JSON lines or as CSV rows with a fixed header,
+    to stdout or the --output file; XLSX and Parquet go through result_export.
+    """
+
+    # Set by main() from --output; outputs opened on it are closed when the command ends
+    path = None
+    opened = []
+
+    def __init__(self, fmt, fields, stream=None):
+        self.fmt = fmt
+        self.fields = fields
+        self._writer = None
+        self._rows = None
+        self._file = None
+        if fmt in BINARY_FORMATS:
+            import result_export
+            self._file = open(self.path, 'wb')
+            self._rows = result_export.open_writer(BINARY_FORMATS[fmt], self._file, fields)
+            _Output.opened.append(self)
+            return
+        if stream is None and self.path:
+            stream = self._file = open(self.path, 'w', encoding='utf-8', newline='')
+            _Output.opened.append(self)
+        self.stream = stream or sys.stdout
+        if fmt == 'csv':
+            self._writer = csv.writer(self.stream)
+            self._writer.writerow(fields)
+
+    def write(self, record):
+        if self._rows:
+            self._rows.write(record)
+        elif self._writer:
+            self._writer.writerow(['' if record.get(f) is None else record.get(f) for f in self.fields])
+        else:
+            self.stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def close(self):
+        if self._rows:
+            self._rows.close()
+        if self._file:
+            self._file.close()
+
+
+def cmd_status(args):
+    import rate_limit
+    import url_status
+
+    cache = None
+    if args.use_cache:
+        import status_cache
+        cache = status_cache.get_status_cache()
+
+    stats = {}
+    timings = _timing_collector(args)
+    limiter = rate_limit.RateLimiter(max_rate=args.max_rate, max_concurrency=args.per_host_limit, timings=timings)
+    out = _Output(args.format, ['url', 'status', 'redirect_url', 'chain', 'latency_ms'])
+    results = url_status.iter_url_status(_iter_lines(args.files), max_workers=args.max_workers,
+                                         per_host_limit=args.per_host_limit, cache=cache,
+                                         cache_ttl=args.cache_ttl, force_refresh=args.refresh, stats=stats,
+                                         max_hops=args.max_hops, limiter=limiter)
+    for result in results:
+        if args.format != 'jsonl':
+            out.write({'url': result.url, 'status': result.status, 'redirect_url': result.redirect_url,
+                       'chain': result.display_url if result.hops else '',
+                       'latency_ms': round(sum(hop.latency for hop in result.hops) * 1000, 1) if result.hops else None})
+        else:
+            out.write(result.to_dict())
+    if cache is not None:
+        print(f"Served from cache: {stats['cached']} · Checked live: {stats['live']}", file=sys.stderr)
+    _report_throttling(limiter)
+    _write_timings(args, timings)
+
+
+def _timing_collector(args):
+    if not args.timings:
+        return None
+    import request_timing
+    return request_timing.TimingCollector()
+
+
+def _write_timings(args, timings):
+    if timings is not None:
+        with open(args.timings, 'w', encoding='utf-8') as f:
+            f.write(timings.to_json())
+        print(f"Request timings for {timings.requests} requests written to {args.timings}", file=sys.stderr)
+
+
+def _report_throttling(limiter):
+    if limiter.events:
+        print(f"Throttled responses: {len(limiter.events)}", file=sys.stderr)
+        for host in limiter.host_summary():
+            if host['throttled']:
+                print(f"  {host['host']}: {host['throttled']} throttled, settled at "
+                      f"{host['rate']} req/s, {host['concurrency']} concurrent", file=sys.stderr)
+
+
+def cmd_scrape_alternates(args):
+    import alternate_links
+    import rate_limit
+
+    if args.format != 'jsonl':
+        out = _Output(args.format, ['url', 'region', 'alternate_url', 'error'])
+    else:
+        out = _Output('jsonl', [])
+    timings = _timing_collector(args)
+    limiter = rate_limit.RateLimiter(max_rate=args.max_rate, timings=timings)
+    for batch in _batches(_iter_lines(args.files), SCRAPE_BATCH_SIZE):
+        for result in alternate_links.scrape_alternates(batch, max_workers=args.max_workers, limiter=limiter):
+            if args.format != 'jsonl':
+                if result.error:
+                    out.write({'url': result.url, 'error': result.error})
+                for region, region_urls in result.categorized.items():
+                    for alternate_url in region_urls:
+                        out.write({'url': result.url, 'region': region, 'alternate_url': alternate_url})
+            else:
+                out.write({'url': result.url, 'regions': result.categorized, 'error': result.error})
+    _report_throttling(limiter)
+    _write_timings(args, timings)
+
+
+def cmd_convert(args):
+    import bulk_convert
+    import pandas as pd
+
+    out = _Output(args.format, ['input_url', 'converted_url'])
+    line_files = []
+    for path in args.files or ['-']:
+        if os.path.splitext(path)[1].lower() in ('.csv', '.xlsx', '.xlsm'):
+            with open(path, 'rb') as f:
+                urls = bulk_convert.read_urls(f.read(), path)
+            batches = (urls[i:i + CONVERT_BATCH_SIZE] for i in range(0, len(urls), CONVERT_BATCH_SIZE))
+        else:
+            line_files.append(path)
+            continue
+        for batch in batches:
+            _write_converted(out, bulk_convert.convert(batch.reset_index(drop=True), args.conversion))
+    if line_files:
+        for batch in _batches(_iter_lines(line_files), CONVERT_BATCH_SIZE):
+            _write_converted(out, bulk_convert.convert(pd.Series(batch, dtype=str), args.conversion))
+
+
+def _write_converted(out, frame):
+    for input_url, converted_url in zip(frame['input_url'], frame['converted_url']):
+        out.write({'input_url': input_url, 'converted_url': converted_url})
+
+
+def cmd_brands(args):
+    import sitemap_cache
+
+    if '://' not in args.sitemap:
+        sitemap_url, base_url = sitemap_cache.sitemap_for_locale(args.sitemap)
+    else:
+        sitemap_url, base_url = args.sitemap, args.base_url
+        if not base_url:
+            sys.exit("--base-url is required with a custom sitemap URL")
+    load = sitemap_cache.load_sitemap(sitemap_url, force_refresh=args.refresh)
+    print(load.summary(), file=sys.stderr)
+    index = load.entry.path_index(base_url)
+
+    path = [segment for segment in (args.path or '').split('/') if segment]
+    if args.urls:
+        out = _Output(args.format, ['url'])
+        for url in index.urls_under(path):
+            out.write({'url': url})
+    else:
+        out = _Output(args.format, ['name', 'count'])
+        for name, count in index.child_counts(path):
+            out.write({'name': name, 'count': count})
+
+
+def cmd_regions(args):
+    import regional_sitemaps
+
+    index = regional_sitemaps.load_regions(args.locales, max_workers=args.max_workers, force_refresh=args.refresh)
+    for locale, error in sorted(index.errors.items()):
+        print(f"{locale}: {error}", file=sys.stderr)
+    path = [segment for segment in (args.path or '').split('/') if segment]
+    out = _Output(args.format, ['locale', 'region', 'count'])
+    for row in index.compare(path):
+        out.write(row)
+
+
+def cmd_drivers(args):
+    import driver_urls
+
+    cells = driver_urls.driver_matrix(args.environments)
+    if not args.check:
+        out = _Output(args.format, ['environment', 'page', 'market', 'url'])
+        for cell in cells:
+            out.write(cell._asdict())
+        return
+    check = driver_urls.HealthCheck(cells)
+    for _ in driver_urls.check_matrix(check, max_workers=args.max_workers):
+        pass
+    out = _Output(args.format, ['environment', 'page', 'market', 'url', 'status', 'final_url', 'latency_ms'])
+    for row in check.rows():
+        out.write(row)
+    failures = check.failures()
+    print(f"Checked {len(check.results)} URLs in {check.elapsed:.2f} seconds; {len(failures)} not answering 200",
+          file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+
+def cmd_validate_hreflang(args):
+    import hreflang_validator
+    import rate_limit
+
+    timings = _timing_collector(args)
+    limiter = rate_limit.RateLimiter(max_rate=args.max_rate, timings=timings)
+    validator = hreflang_validator.HreflangValidator()
+    for _ in validator.run(list(_iter_lines(args.files)), max_workers=args.max_workers, limiter=limiter):
+        pass
+    issues = validator.issues()
+    out = _Output(args.format, list(hreflang_validator.HreflangIssue._fields))
+    for row in hreflang_validator.issue_rows(issues):
+        out.write(row)
+    print(" · ".join(f"{name}: {count}" for name, count in validator.summary(issues).items()), file=sys.stderr)
+    _report_throttling(limiter)
+    _write_timings(args, timings)
+
+
+def cmd_jobs(args):
+    import audit_jobs
+
+    # Read-only: the app's workers run the jobs, so none are started here
+    queue = audit_jobs.JobQueue()
+    if args.id is None:
+        out = _Output(args.format, ['id', 'kind', 'label', 'state', 'done', 'total', 'error'])
+        for job in queue.jobs(limit=args.limit):
+            out.write({'id': job.id, 'kind': job.kind, 'label': job.label, 'state': job.state, 'done': job.done,
+                       'total': job.total, 'error': job.error})
+        return
+    job = queue.get(args.id)
+    if job is None:
+        sys.exit(f"No job {args.id}")
+    fields = audit_jobs.JOB_FIELDS[job.kind]
+    out = _Output(args.format, fields)
+    for row in queue.iter_rows(job):
+        out.write(dict(zip(fields, row)))
+    print(f"Job {job.id} ({job.label}): {job.state}, {job.done}/{job.total} URLs", file=sys.stderr)
+
+
+def cmd_sitemap_changes(args):
+    import sitemap_snapshot
+
+    if args.take:
+        snapshot = sitemap_snapshot.take_snapshot(args.name)
+        print(f"Snapshot taken: {snapshot.label}", file=sys.stderr)
+    snapshots = sitemap_snapshot.list_snapshots(args.name)
+    if len(snapshots) < 2:
+        sys.exit(f"Need two snapshots of {args.name} to compare; run again with --take later")
+    diff = sitemap_snapshot.diff_snapshots(snapshots[-2], snapshots[-1])
+    print(f"{snapshots[-2].label} -> {snapshots[-1].label}: {diff.summary()}", file=sys.stderr)
+    if args.all:
+        out = _Output(args.format, ['change', 'url', 'old_lastmod', 'new_lastmod'])
+        for row in diff.rows():
+            out.write(row)
+    elif args.output or args.format != 'jsonl':
+        out = _Output(args.format, ['url'])
+        for url in diff.audit_urls:
+            out.write({'url': url})
+    else:
+        # Plain URLs on stdout, ready to pipe into `status` or `scrape-alternates`
+        for url in diff.audit_urls:
+            print(url)
+
+
+def cmd_crawl(args):
+    import hreflang_crawler
+    import rate_limit
+
+    crawl = hreflang_crawler.HreflangCrawl(args.name)
+    if args.seed:
+        import sitemap_cache
+        if args.seed in sitemap_cache.KNOWN_SITEMAPS:
+            seeds = sitemap_cache.load_sitemap(sitemap_cache.KNOWN_SITEMAPS[args.seed][0]).urls
+        else:
+            seeds = list(_iter_lines([args.seed]))
+        try:
+            crawl.start(seeds, source=args.seed)
+        except hreflang_crawler.CrawlLocked as e:
+            sys.exit(str(e))
+    elif not crawl.exists:
+        sys.exit(f"No saved crawl named {args.name}; start one with --seed")
+    print(f"Crawl {crawl.crawl_id}: {len(crawl.results)} pages done, {len(crawl.frontier)} queued", file=sys.stderr)
+
+    out = _Output(args.format, ['url', 'hreflang', 'alternate_url', 'error'])
+    limiter = rate_limit.RateLimiter(max_rate=args.max_rate)
+    try:
+        for result in crawl.run(max_workers=args.max_workers, max_pages=args.max_pages, limiter=limiter):
+            if args.format != 'jsonl':
+                if result.error:
+                    out.write({'url': result.url, 'error': result.error})
+                for link in result.links:
+                    out.write({'url': result.url, 'hreflang': link.hreflang, 'alternate_url': link.href})
+            else:
+                out.write({'url': result.url, 'alternates': {link.hreflang: link.href for link in result.links},
+                           'error': result.error})
+    except hreflang_crawler.CrawlLocked as e:
+        sys.exit(str(e))
+    print(f"Crawl {crawl.crawl_id}: {len(crawl.results)} pages done, {len(crawl.frontier)} queued", file=sys.stderr)
+    _report_throttling(limiter)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='cli.py', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--format', choices=['jsonl', 'csv'] + list(BINARY_FORMATS), default='jsonl')
+    parser.add_argument('--output', metavar='FILE', help="write results to FILE instead of stdout")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    status = subparsers.add_parser('status', help="check HTTP status codes")
+    status.add_argument('files', nargs='*')
+    status.add_argument('--max-workers', type=int, default=32)
+    status.add_argument('--per-host-limit', type=int, default=8)
+    status.add_argument('--max-rate', type=float, default=50.0, help="maximum requests per second per host")
+    status.add_argument('--timings', metavar='FILE', help="write per-request timings and per-host latency stats as JSON")
+    status.add_argument('--max-hops', type=int, default=10, help="maximum redirects to follow")
+    status.add_argument('--use-cache', action='store_true', help="reuse results from the local status cache")
+    status.add_argument('--cache-ttl', type=float, help="maximum age in seconds of cached results")
+    status.add_argument('--refresh', action='store_true', help="check every URL live and update the cache")
+    status.set_defaults(func=cmd_status)
+
+    scrape = subparsers.add_parser('scrape-alternates', help="scrape alternate (hreflang) links by region")
+    scrape.add_argument('files', nargs='*')
+    scrape.add_argument('--max-workers', type=int, default=16)
+    scrape.add_argument('--max-rate', type=float, default=50.0, help="maximum requests per second per host")
+    scrape.add_argument('--timings', metavar='FILE', help="write per-request timings and per-host latency stats as JSON")
+    scrape.set_defaults(func=cmd_scrape_alternates)
+
+    convert = subparsers.add_parser('convert', help="convert URLs between live, preview and author")
+    convert.add_argument('conversion', choices=CONVERSIONS)
+    convert.add_argument('files', nargs='*', help="TXT (one URL per line), CSV or XLSX files")
+    convert.set_defaults(func=cmd_convert)
+
+    brands = subparsers.add_parser('brands', help="list brands, sections or URLs from a sitemap")
+    brands.add_argument('path', nargs='?', help="sub-path to drill into, e.g. geforce/graphics-cards")
+    brands.add_argument('--sitemap', default='en-us', help="a locale (en-us, de-de, zh-cn, ...) or a sitemap URL")
+    brands.add_argument('--base-url', help="base URL of the pages in a custom sitemap")
+    brands.add_argument('--urls', action='store_true', help="print the URLs under PATH instead of its children")
+    brands.add_argument('--refresh', action='store_true', help="revalidate the cached sitemap now")
+    brands.set_defaults(func=cmd_brands)
+
+    regions = subparsers.add_parser('regions', help="URL counts under a path in every regional sitemap")
+    regions.add_argument('path', nargs='?', help="e.g. geforce or geforce/graphics-cards (default: whole site)")
+    regions.add_argument('--locales', nargs='+', help="only these locales (default: all)")
+    regions.add_argument('--max-workers', type=int, default=8, help="sitemaps fetched in parallel")
+    regions.add_argument('--refresh', action='store_true', help="revalidate the cached sitemaps now")
+    regions.set_defaults(func=cmd_regions)
+
+    changes = subparsers.add_parser('sitemap-changes', help="URLs added or changed between the last two sitemap snapshots")
+    changes.add_argument('name', nargs='?', default='en-us', choices=['en-us', 'zh-cn'])
+    changes.add_argument('--take', action='store_true', help="take a new snapshot first")
+    changes.add_argument('--all', action='store_true', help="print every change (including removals) as records")
+    changes.set_defaults(func=cmd_sitemap_changes)
+
+    crawl = subparsers.add_parser('crawl', help="resumable hreflang crawl (run again without --seed to resume)")
+    crawl.add_argument('name', help="crawl name; its state is kept in the data directory")
+    crawl.add_argument('--seed', help="en-us or zh-cn to seed from that sitemap, or a file of URLs; "
+                                      "starts the crawl over")
+    crawl.add_argument('--max-workers', type=int, default=16)
+    crawl.add_argument('--max-pages', type=int, help="stop (resumably) after this many pages")
+    crawl.add_argument('--max-rate', type=float, default=50.0, help="maximum requests per second per host")
+    crawl.set_defaults(func=cmd_crawl)
+
+    drivers = subparsers.add_parser('drivers', help="driver download page URLs for every market")
+    drivers.add_argument('--environments', nargs='+', choices=['Origin', 'Preview', 'Live'],
+                         default=['Origin', 'Preview', 'Live'])
+    drivers.add_argument('--check', action='store_true', help="health-check every URL; exit 1 if any is not 200")
+    drivers.add_argument('--max-workers', type=int, default=32)
+    drivers.set_defaults(func=cmd_drivers)
+
+    validate = subparsers.add_parser('validate-hreflang', help="check that each page's alternates link back, "
+                                                               "answer 200 and match their locales")
+    validate.add_argument('files', nargs='*')
+    validate.add_argument('--max-workers', type=int, default=16)
+    validate.add_argument('--max-rate', type=float, default=50.0, help="maximum requests per second per host")
+    validate.add_argument('--timings', metavar='FILE', help="write per-request timings and per-host latency stats as JSON")
+    validate.set_defaults(func=cmd_validate_hreflang)
+
+    jobs = subparsers.add_parser('jobs', help="background jobs queued from the app, or one job's results")
+    jobs.add_argument('id', nargs='?', type=int)
+    jobs.add_argument('--limit', type=int, default=100, help="number of recent jobs to list")
+    jobs.set_defaults(func=cmd_jobs)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.format in BINARY_FORMATS and not args.output:
+        parser.error(f"--format {args.format} needs --output FILE")
+    _Output.path = args.output
+    try:
+        args.func(args)
+    except BrokenPipeError:
+        # Output piped into e.g. head; exit quietly.
+        sys.stderr.close()
+    finally:
+        while _Output.opened:
+            _Output.opened.pop().close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,31 +1,31 @@
 import streamlit as st
-import requests
-import xml.etree.ElementTree as ET
+import sitemap_cache
+import status_code_Main
+from path_index import PathIndex
 
 #from numpy.ma.core import count
 #import pandas as pd
 #import openpyxl
 
 class NvidiaCNURLExtractor:
-    def __init__(self, sitemap_url='https://www.nvidia.cn/zh-cn.sitemap.xml'):
+    def __init__(self, sitemap_url='https://www.nvidia.cn/zh-cn.sitemap.xml', base_url='https://www.nvidia.cn/'):
         self.sitemap_url = sitemap_url
+        self.base_url = base_url
+        self.sitemap_load = None
         self.extracted_urls = self.extract_urls_from_sitemap()
+        if self.sitemap_load:
+            self.path_index = self.sitemap_load.entry.path_index(self.base_url)
+        else:
+            self.path_index = PathIndex(self.extracted_urls, self.base_url)
         self.brand_names = self.get_nvidia_brand_names()
 
     def extract_urls_from_sitemap(self):
         """
-        Extract all URLs from <loc> tags in an XML sitemap.
+        Extract all URLs from <loc> tags in an XML sitemap, via the shared sitemap cache.
         """
         try:
-            response = requests.get(self.sitemap_url)
-            response.raise_for_status()
-            root = ET.fromstring(response.content)
-
-            urls = []
-            for loc in root.findall('.//{http://www.sitemaps.org/schemas/sitemap/0.9}loc'):
-                urls.append(loc.text)
-
-            return urls
+            self.sitemap_load = sitemap_cache.load_sitemap(self.sitemap_url)
+            return self.sitemap_load.urls
 
         except Exception as e:
             st.error(f"Error fetching sitemap: {e}")
@@ -51,29 +51,39 @@ class NvidiaCNURLExtractor:
 
     def get_nvidia_brand_names(self):
         """
-        Extract brand names from URLs with more robust parsing.
+        Extract brand names (first path segment) from the path index.
         """
-        brandlist = []
-        for url in self.extracted_urls:
-            # Remove the base URL and split the path
-            path = url.replace('https://www.nvidia.cn/', '').split('/')
-
-            # Consider first path segment as a potential brand name
-            if path and len(path[0]) > 0:
-                brandlist.append(path[0])
-
-        return sorted(set(brandlist))
+        return self.path_index.children()
 
     def get_brand_related_urls(self, brand_name):
         """
         Get URLs related to a specific brand.
         """
-        related_urls = []
-        for url in self.extracted_urls:
-            if f".cn/{brand_name}/" in url:
-                related_urls.append(url)
-        return related_urls
-
+        return self.path_index.urls_under([brand_name])
+
+
+ALL_SECTIONS = "(all)"
+
+
+def select_sub_path(index, brand, key_prefix):
+    """
+    Drill down from a brand through its sections, one selectbox per level.
+    Returns the selected path as a list of segments.
+    """
+    path = [brand]
+    while True:
+        counts = dict(index.child_counts(path))
+        if not counts:
+            return path
+        choice = st.selectbox(
+            f"Section under /{'/'.join(path)}/",
+            [ALL_SECTIONS] + list(counts),
+            format_func=lambda name: name if name == ALL_SECTIONS else f"{name} ({counts[name]})",
+            key=f"{key_prefix}_{len(path)}",
+        )
+        if choice == ALL_SECTIONS:
+            return path
+        path.append(choice)
 
 
 def main():
@@ -81,30 +91,38 @@ def main():
 
     # Initialize extractor
     extractor = NvidiaCNURLExtractor()
+    if extractor.sitemap_load:
+        st.caption(extractor.sitemap_load.summary())
 
     # Dropdown for brand selection
     selected_brand = st.selectbox(
         "Select a Brand",
-        extractor.brand_names
+        extractor.brand_names,
+        format_func=lambda brand: f"{brand} ({extractor.path_index.count([brand])})"
     )
 
     # Display related URLs in text area
     if selected_brand:
-        st.subheader(f"URLs for {selected_brand}")
-        related_urls = extractor.get_brand_related_urls(selected_brand)
+        selected_path = select_sub_path(extractor.path_index, selected_brand, key_prefix="cn_path")
+        selected_label = "/".join(selected_path)
+        st.subheader(f"URLs for {selected_label}")
+        related_urls = extractor.path_index.urls_under(selected_path)
 
         # Convert URLs to newline-separated string
         urls_text = "\n".join(related_urls)
 
         # Display URLs in text area
         st.text_area(
-            label=f"Related URLs for {selected_brand}",
+            label=f"Related URLs for {selected_label}",
             value=urls_text,
             height=300
         )
 
         # Additional statistics
         st.write(f"Total Related URLs: {len(related_urls)}")
+        status_code_Main.show_export(lambda: ([url] for url in extractor.path_index.iter_urls_under(selected_path)),
+                                     ["url"], f"cn_{'_'.join(selected_path)}", key="cn_brand_export",
+                                     source=tuple(selected_path))
 
 
 
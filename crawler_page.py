@@ -0,0 +1,166 @@
+import time
+
+import streamlit as st
+
+import audit_jobs
+import hreflang_crawler
+import jobs_page
+import rate_limit
+import request_timing
+import sitemap_cache
+import status_code_Main
+
+# Streamlit front end for hreflang_crawler: start or resume a crawl seeded
+# from a sitemap, watch it progress, and view the resulting locale matrix.
+
+ENTERED_URLS = "Entered URLs"
+MATRIX_PREVIEW_ROWS = 1000
+
+
+def _seed_urls(source, url_input):
+    if source == ENTERED_URLS:
+        return [url.strip() for url in url_input.splitlines() if url.strip()]
+    return sitemap_cache.load_sitemap(sitemap_cache.KNOWN_SITEMAPS[source][0]).urls
+
+
+def run_crawl(crawl, max_workers, max_pages):
+    """
+    Crawl with live progress. Cancel reruns the script, which closes the
+    crawl generator and so writes a checkpoint to resume from.
+    """
+    timings = request_timing.TimingCollector()
+    limiter = rate_limit.RateLimiter(timings=timings)
+    run = {"crawl_id": crawl.crawl_id, "done": False, "elapsed": 0.0, "pages": 0, "limiter": limiter,
+           "timings": timings}
+    st.session_state.crawl_run = run
+
+    st.button("Cancel", key="cancel_crawl")
+    panel = status_code_Main.ProgressPanel(len(crawl.frontier), unit="pages")
+    pages = crawl.run(max_workers=max_workers, max_pages=max_pages or None, limiter=limiter)
+    try:
+        for result in pages:
+            run["pages"] += 1
+            run["elapsed"] = panel.elapsed
+            panel.total = panel.done + 1 + len(crawl.frontier)
+            outcome = "Fetch errors" if result.error and result.error.startswith("Error fetching") else (
+                "With alternates" if result.links else "No alternates")
+            panel.add(outcome, {"URL": result.url, "Alternates": len(result.links), "Error": result.error or ""})
+    except hreflang_crawler.CrawlLocked as e:
+        # Another session started it between this page loading and the click
+        panel.finish()
+        del st.session_state.crawl_run
+        st.error(str(e))
+        return
+    finally:
+        pages.close()
+    run["elapsed"] = panel.elapsed
+    run["done"] = True
+    panel.finish()
+
+
+def show_crawl(crawl):
+    meta = crawl.meta
+    errors = sum(1 for result in crawl.results.values() if result.error)
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Pages crawled", len(crawl.results))
+    col2.metric("Queued", len(crawl.frontier))
+    col3.metric("Errors", errors)
+    if meta.get("checkpoint_at"):
+        st.caption(f"Source: {meta.get('source') or '-'} · last checkpoint "
+                   f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(meta['checkpoint_at']))}")
+
+    run = st.session_state.get("crawl_run")
+    if run and run["crawl_id"] == crawl.crawl_id:
+        rate = run["pages"] / run["elapsed"] if run["elapsed"] > 0 else 0.0
+        if run["done"]:
+            st.write(f"Crawled {run['pages']} pages in {run['elapsed']:.2f} seconds ({rate:.1f} pages/second)")
+        else:
+            st.warning(f"Stopped after {run['pages']} pages in {run['elapsed']:.2f} seconds; "
+                       "the crawl can be resumed.")
+        status_code_Main.show_throttling(run["limiter"])
+        status_code_Main.show_timing(run["timings"], key="crawl_timings")
+
+    if not crawl.results:
+        return
+    st.subheader("Pages per region")
+    st.dataframe([{"Region": region, "Pages": count} for region, count in crawl.region_counts().items()])
+
+    hreflangs, rows = crawl.locale_matrix()
+    st.subheader(f"Locale matrix ({len(rows)} pages × {len(hreflangs)} hreflangs)")
+    if len(rows) > MATRIX_PREVIEW_ROWS:
+        st.caption(f"Showing the first {MATRIX_PREVIEW_ROWS} rows; download the CSV for all of them.")
+    st.dataframe(rows[:MATRIX_PREVIEW_ROWS], use_container_width=True, height=400)
+
+    status_code_Main.show_export(lambda: rows, ["url", "region", "error"] + hreflangs,
+                                 f"{crawl.crawl_id}_locale_matrix", key="crawl_export",
+                                 source=(crawl.crawl_id, len(rows)))
+
+
+def main():
+    st.title("🕸 Hreflang Crawler")
+    st.caption("Crawls from sitemap URLs, following every page's alternate links to locale pages not seen yet. "
+               "Progress is checkpointed, so an interrupted crawl resumes where it stopped.")
+
+    crawl_id = st.text_input("Crawl name", value="en-us").strip() or "en-us"
+    crawl = hreflang_crawler.HreflangCrawl(crawl_id)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        max_workers = st.number_input("Parallel requests", min_value=1, max_value=64,
+                                      value=hreflang_crawler.DEFAULT_MAX_WORKERS, key="crawl_workers")
+    with col2:
+        max_pages = st.number_input("Pages per run (0 = until done)", min_value=0, value=0, step=1000)
+
+    job = audit_jobs.get_job_queue().active_crawl(crawl.crawl_id)
+    if job:
+        # Two runs writing one crawl's checkpoint would corrupt it
+        st.info(f"Background job #{job.id} is crawling {crawl.crawl_id} ({job.state}, {job.done} pages so far); "
+                "follow or cancel it on the Background Jobs page. The results below are from its last checkpoint.")
+        show_crawl(crawl)
+        return
+    running_since = crawl.running_since()
+    if running_since:
+        st.info(f"Crawl {crawl.crawl_id} is being run from another session since "
+                f"{time.strftime('%H:%M:%S', time.localtime(running_since))}; it can be resumed here once that run "
+                "stops. The results below are from its last checkpoint.")
+        show_crawl(crawl)
+        return
+    job_params = {"crawl_id": crawl.crawl_id, "max_workers": int(max_workers), "max_pages": int(max_pages) or None}
+
+    restart = crawl.exists
+    start_run = False
+    if crawl.frontier and restart:
+        col1, col2 = st.columns([1, 3])
+        with col1:
+            start_run = st.button(f"Resume crawl ({len(crawl.frontier)} pages queued)")
+        with col2:
+            if st.button("Resume in background"):
+                jobs_page.queue_job("crawl", job_params, f"Resume crawl {crawl.crawl_id}")
+
+    with st.expander("Start over") if restart else st.container():
+        source = st.radio("Seed URLs", list(sitemap_cache.KNOWN_SITEMAPS) + [ENTERED_URLS], horizontal=True,
+                          format_func=lambda name: f"{name} sitemap" if name != ENTERED_URLS else name)
+        url_input = st.text_area("Seed URLs (one per line)", height=150) if source == ENTERED_URLS else ""
+        if st.button("Start over in background" if restart else "Start in background"):
+            # The job seeds the crawl itself, so a sitemap is loaded on the worker, not here
+            seeds = ({"sitemap": source} if source != ENTERED_URLS
+                     else {"urls": _seed_urls(source, url_input)})
+            if seeds.get("sitemap") or seeds.get("urls"):
+                jobs_page.queue_job("crawl", dict(job_params, **seeds), f"Crawl {crawl.crawl_id} from {source}")
+        if st.button("Discard saved crawl and start over" if restart else "Start new crawl"):
+            try:
+                seeds = _seed_urls(source, url_input)
+            except Exception as e:
+                st.error(f"Error fetching sitemap: {e}")
+                seeds = []
+            if seeds:
+                try:
+                    crawl.start(seeds, source=source)
+                except hreflang_crawler.CrawlLocked as e:
+                    st.error(str(e))
+                else:
+                    start_run = True
+
+    if start_run:
+        run_crawl(crawl, int(max_workers), int(max_pages))
+    show_crawl(crawl)
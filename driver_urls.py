@@ -0,0 +1,182 @@
+import time
+from collections import namedtuple
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import rate_limit
+import url_status
+
+# Driver download page matrix. Every URL is generated from DRIVER_LOCALES:
+# the legacy origin download pages (Index and Find per origin host) and the
+# Enterprise and GeForce driver pages on preview and live. check_matrix()
+# health-checks the whole matrix concurrently, for the release-day check.
+
+DEFAULT_MAX_WORKERS = 32
+DEFAULT_PER_HOST_LIMIT = 8
+
+ENVIRONMENTS = ('Origin', 'Preview', 'Live')
+ORIGIN_PAGES = ('Index', 'Find')
+ORIGIN_PAGE_PATHS = {'Index': 'download/index.aspx', 'Find': 'download/Find.aspx'}
+# Origins without the legacy download pages
+ORIGIN_DRIVER_PATHS = {'Index': 'drivers', 'Find': 'drivers/beta'}
+SITE_SECTIONS = ('Enterprise', 'GeForce')
+
+# market, origin host code (origin-aws-prod-<code>.nvidia.com), ?lang= of its
+# download pages (None where the origin serves /drivers instead), site locale
+DriverLocale = namedtuple('DriverLocale', ['market', 'origin', 'origin_lang', 'locale'])
+
+DRIVER_LOCALES = [
+    DriverLocale('United States', 'us', 'en-us', 'en-us'),
+    DriverLocale('United Kingdom', 'uk', 'en-uk', 'en-gb'),
+    DriverLocale('China', 'cn', 'cn', 'zh-cn'),
+    DriverLocale('Taiwan', 'tw', 'tw', 'zh-tw'),
+    DriverLocale('Japan', 'jp', 'jp', 'ja-jp'),
+    DriverLocale('Korea', 'kr', 'kr', 'ko-kr'),
+    DriverLocale('India', 'in', 'en-in', 'en-in'),
+    DriverLocale('Germany', 'de', 'de', 'de-de'),
+    DriverLocale('Spain', 'es', 'es', 'es-es'),
+    DriverLocale('France', 'fr', 'fr', 'fr-fr'),
+    DriverLocale('Italy', 'it', 'it', 'it-it'),
+    DriverLocale('Poland', 'pl', 'pl', 'pl-pl'),
+    DriverLocale('Turkey', 'tr', None, 'tr-tr'),
+    DriverLocale('Russia', 'ru', 'ru', 'ru-ru'),
+    DriverLocale('Latin America', 'la', 'la', 'es-la'),
+    DriverLocale('Brazil', 'br', 'br', 'pt-br'),
+]
+
+# One cell of the matrix; page is Index/Find for Origin, else Enterprise/GeForce
+DriverURL = namedtuple('DriverURL', ['environment', 'page', 'market', 'url'])
+
+
+def origin_url(entry: DriverLocale, page: str) -> str:
+    host = f"https://origin-aws-prod-{entry.origin}.nvidia.com"
+    if entry.origin_lang is None:
+        return f"{host}/{ORIGIN_DRIVER_PATHS[page]}"
+    return f"{host}/{ORIGIN_PAGE_PATHS[page]}?lang={entry.origin_lang}"
+
+
+def site_url(entry: DriverLocale, section: str, preview: bool = False) -> str:
+    subdomain = 'preview' if preview else 'www'
+    if entry.locale == 'zh-cn' and section == 'Enterprise':
+        return f"https://{subdomain}.nvidia.cn/drivers/lookup/"
+    # en-us is authored as en-zz on preview
+    locale = 'en-zz' if preview and entry.locale == 'en-us' else entry.locale
+    geforce = 'geforce/' if section == 'GeForce' else ''
+    return f"https://{subdomain}.nvidia.com/{locale}/{geforce}drivers/"
+
+
+def columns(environments: Sequence[str] = ENVIRONMENTS) -> List[Tuple[str, str]]:
+    """
+    (environment, page) for every column of the matrix, in display order.
+    """
+    return [(environment, page) for environment in environments
+            for page in (ORIGIN_PAGES if environment == 'Origin' else SITE_SECTIONS)]
+
+
+def driver_matrix(environments: Sequence[str] = ENVIRONMENTS,
+                  driver_locales: Sequence[DriverLocale] = None) -> List[DriverURL]:
+    """
+    Every driver URL of the given environments, column by column.
+    """
+    cells = []
+    for environment, page in columns(environments):
+        for entry in driver_locales or DRIVER_LOCALES:
+            if environment == 'Origin':
+                url = origin_url(entry, page)
+            else:
+                url = site_url(entry, page, preview=environment == 'Preview')
+            cells.append(DriverURL(environment, page, entry.market, url))
+    return cells
+
+
+def matrix_text(environment: str) -> str:
+    """
+    One environment's URLs as text, grouped under a heading per column.
+    """
+    lines = []
+    for (_, page) in columns([environment]):
+        lines.append(f"{'=' * 20} {page} {'=' * 20}")
+        lines.extend(cell.url for cell in driver_matrix([environment]) if cell.page == page)
+    return "\n".join(lines)
+
+
+class HealthCheck:
+    """
+    Results of checking a driver matrix: the StatusResult of every cell's URL.
+    """
+
+    def __init__(self, cells: List[DriverURL]):
+        self.cells = cells
+        self.results: Dict[str, url_status.StatusResult] = {}
+        self.elapsed = 0.0
+        self.checked_at = None
+
+    @property
+    def done(self) -> bool:
+        return len(self.results) >= len({cell.url for cell in self.cells})
+
+    def failures(self) -> List[DriverURL]:
+        return [cell for cell in self.cells if cell.url in self.results and not healthy(self.results[cell.url])]
+
+    def grid(self) -> List[Dict]:
+        """
+        One row per market with a "status · latency" cell per column; cells
+        not checked yet are empty.
+        """
+        rows = {}
+        for cell in self.cells:
+            row = rows.setdefault(cell.market, {'Market': cell.market})
+            row[f"{cell.environment} {cell.page}"] = cell_label(self.results.get(cell.url))
+        return list(rows.values())
+
+    def rows(self) -> List[Dict]:
+        """
+        One row per cell, for export.
+        """
+        rows = []
+        for cell in self.cells:
+            result = self.results.get(cell.url)
+            rows.append({'environment': cell.environment, 'page': cell.page, 'market': cell.market,
+                         'url': cell.url, 'status': result.status if result else None,
+                         'final_url': result.redirect_url if result else None,
+                         'latency_ms': round(latency(result) * 1000) if result else None})
+        return rows
+
+
+def latency(result: url_status.StatusResult) -> float:
+    """
+    Seconds spent on result's whole redirect chain.
+    """
+    return sum(hop.latency for hop in result.hops)
+
+
+def healthy(result: url_status.StatusResult) -> bool:
+    """
+    True when the URL (after any redirects) answered 200.
+    """
+    return result.hops[-1].status == 200 if result.hops else result.status == 200
+
+
+def cell_label(result: Optional[url_status.StatusResult]) -> str:
+    if result is None:
+        return ""
+    return f"{result.status} · {latency(result) * 1000:.0f} ms"
+
+
+def check_matrix(check: HealthCheck, max_workers: int = DEFAULT_MAX_WORKERS,
+                 limiter: Optional[rate_limit.RateLimiter] = None) -> Iterator[url_status.StatusResult]:
+    """
+    Check every URL of check's matrix concurrently (live, never from the
+    status cache), storing each result in check and yielding it as it lands.
+    """
+    urls = list(dict.fromkeys(cell.url for cell in check.cells))
+    limiter = limiter or rate_limit.RateLimiter(max_concurrency=DEFAULT_PER_HOST_LIMIT)
+    start = time.perf_counter()
+    results = url_status.iter_url_status(urls, max_workers=max_workers, ordered=False, limiter=limiter)
+    try:
+        for result in results:
+            check.results[result.url] = result
+            check.elapsed = time.perf_counter() - start
+            yield result
+    finally:
+        results.close()
+        check.checked_at = time.time()
@@ -0,0 +1,98 @@
+import time
+
+import pandas as pd
+import streamlit as st
+
+import driver_urls
+import rate_limit
+import request_timing
+import status_code_Main
+
+# Streamlit page for the driver URL matrix: list each environment's URLs for
+# copying, or health-check the whole matrix at once and show it as a grid of
+# status and latency per market and column.
+
+OK_COLOR = "background-color: #d4edda"
+REDIRECT_COLOR = "background-color: #fff3cd"
+FAILED_COLOR = "background-color: #f8d7da"
+
+
+def _cell_color(result):
+    if result is None:
+        return ""
+    if not driver_urls.healthy(result):
+        return FAILED_COLOR
+    return REDIRECT_COLOR if len(result.hops) > 1 else OK_COLOR
+
+
+def run_health_check(max_workers):
+    """
+    Check the whole matrix with a progress bar. The check is kept in session
+    state as it progresses, so Cancel leaves the partial grid in place.
+    """
+    check = driver_urls.HealthCheck(driver_urls.driver_matrix())
+    timings = request_timing.TimingCollector()
+    limiter = rate_limit.RateLimiter(max_concurrency=driver_urls.DEFAULT_PER_HOST_LIMIT, timings=timings)
+    st.session_state.driver_health = {"check": check, "limiter": limiter, "timings": timings}
+
+    st.button("Cancel", key="cancel_driver_check")
+    total = len({cell.url for cell in check.cells})
+    progress = st.progress(0.0, text=f"Checking {total} driver URLs...")
+    for done, result in enumerate(driver_urls.check_matrix(check, max_workers=max_workers, limiter=limiter), start=1):
+        progress.progress(done / total, text=f"{done}/{total} · {result.status} {result.url}")
+    progress.empty()
+
+
+def show_health_check(run):
+    check = run["check"]
+    failures = check.failures()
+    checked = len(check.results)
+    summary = (f"Checked {checked} URLs in {check.elapsed:.2f} seconds"
+               + (f" at {time.strftime('%H:%M:%S', time.localtime(check.checked_at))}" if check.checked_at else ""))
+    if not check.done:
+        st.warning(f"Cancelled: {summary}")
+    elif failures:
+        st.error(f"{summary} · {len(failures)} not answering 200")
+    else:
+        st.success(f"{summary} · all answering 200")
+
+    grid = pd.DataFrame(check.grid()).set_index("Market")
+    colors = pd.DataFrame(
+        [[_cell_color(check.results.get(cell.url)) for cell in check.cells if cell.market == market]
+         for market in grid.index],
+        index=grid.index, columns=grid.columns)
+    st.dataframe(grid.style.apply(lambda _: colors, axis=None), use_container_width=True,
+                 height=38 + 35 * len(grid))
+    st.caption("Green: 200 · Yellow: 200 after redirects · Red: anything else. Latency covers the whole redirect chain.")
+
+    if failures:
+        with st.expander(f"Failing URLs ({len(failures)})"):
+            st.dataframe([row for row in check.rows() if row["url"] in {cell.url for cell in failures}],
+                         use_container_width=True)
+    status_code_Main.show_throttling(run["limiter"])
+    status_code_Main.show_timing(run["timings"], key="driver_timings")
+
+    status_code_Main.show_export(check.rows, ["environment", "page", "market", "url", "status", "final_url",
+                                              "latency_ms"], "driver_url_health", key="driver_export",
+                                 source=id(check))
+
+
+def main():
+    st.title("🛹 Driver URLS")
+
+    tab_list, tab_check = st.tabs(["URL lists", "Health check"])
+    with tab_list:
+        selected_option = st.selectbox('Choose an option:', driver_urls.ENVIRONMENTS)
+        st.text_area("List of URLs", value=driver_urls.matrix_text(selected_option), height=600)
+
+    with tab_check:
+        cells = driver_urls.driver_matrix()
+        st.caption(f"{len(cells)} URLs: origin Index/Find, preview and live Enterprise/GeForce driver pages "
+                   f"for {len(driver_urls.DRIVER_LOCALES)} markets.")
+        max_workers = st.number_input("Parallel requests", min_value=1, max_value=64,
+                                      value=driver_urls.DEFAULT_MAX_WORKERS, key="driver_workers")
+        if st.button("Check all driver URLs"):
+            run_health_check(int(max_workers))
+        run = st.session_state.get("driver_health")
+        if run:
+            show_health_check(run)
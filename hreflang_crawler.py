@@ -0,0 +1,317 @@
+import gzip
+import json
+import os
+import re
+import shutil
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urldefrag, urljoin, urlsplit
+
+import requests
+
+import alternate_links
+import locales
+import rate_limit
+from storage import DATA_DIR, atomic_write, data_path
+
+# Resumable site-wide hreflang crawl. Starting from seed URLs (normally a
+# sitemap), every page's <link rel="alternate"> set is fetched, and alternate
+# URLs not seen before are queued, so the crawl covers locale pages the seed
+# sitemap does not list. A visited set keeps every URL to one fetch.
+#
+# State lives under DATA_DIR/crawls/<crawl_id>: finished pages are appended
+# to results.jsonl and the frontier (queued plus in-flight URLs) is rewritten
+# atomically at every checkpoint. On resume, alternates of finished pages that
+# are neither finished nor queued are re-queued, so pages finished after the
+# last frontier write never lose their discoveries.
+#
+# Only one run() may work on a crawl at a time, from any session, job or
+# process: it holds run.lock in the crawl directory, created exclusively and
+# touched at every checkpoint. A lock not touched for LOCK_STALE_SECONDS is
+# left over from a run that died and may be taken over.
+
+DEFAULT_ALLOWED_HOSTS = ('nvidia.com', 'nvidia.cn')
+DEFAULT_MAX_WORKERS = alternate_links.DEFAULT_MAX_WORKERS
+CHECKPOINT_PAGES = 500
+CHECKPOINT_SECONDS = 30.0
+LOCK_STALE_SECONDS = 10 * 60
+
+
+class CrawlLocked(Exception):
+    pass
+
+
+class PageResult:
+    __slots__ = ('url', 'links', 'error')
+
+    def __init__(self, url: str, links: List[alternate_links.AlternateLink], error: Optional[str] = None):
+        self.url = url
+        # Only hreflang alternates: rel=alternate also marks RSS feeds, AMP pages and the like,
+        # which are neither locale columns nor pages to crawl
+        self.links = [link for link in links if link.hreflang]
+        self.error = error
+
+    def to_json(self) -> str:
+        return json.dumps({'url': self.url, 'links': [[link.href, link.hreflang] for link in self.links],
+                           'error': self.error})
+
+    @classmethod
+    def from_json(cls, line: str) -> 'PageResult':
+        data = json.loads(line)
+        return cls(data['url'], [alternate_links.AlternateLink(*link) for link in data['links']], data['error'])
+
+
+def normalize(url: str) -> str:
+    return urldefrag(url.strip())[0]
+
+
+def crawl_page(url: str, limiter: Optional[rate_limit.RateLimiter] = None) -> PageResult:
+    try:
+        return PageResult(url, alternate_links.fetch_alternate_link_tags(url, limiter))
+    except requests.RequestException as e:
+        return PageResult(url, [], f"Error fetching URL: {e}")
+    except ValueError as e:
+        return PageResult(url, [], str(e))
+
+
+class HreflangCrawl:
+    def __init__(self, crawl_id: str, allowed_hosts: Tuple[str, ...] = DEFAULT_ALLOWED_HOSTS):
+        """
+        Open the crawl named crawl_id, loading its saved state if there is any.
+        """
+        self.crawl_id = re.sub(r'[^\w.-]+', '_', crawl_id)
+        self.allowed_hosts = tuple(allowed_hosts)
+        self.results: Dict[str, PageResult] = {}
+        self.frontier = deque()
+        self.visited = set()
+        self.meta = {}
+        self._pending: List[PageResult] = []
+        self._holds_lock = False
+        self._load()
+
+    # Persistence
+
+    @property
+    def directory(self) -> str:
+        return os.path.join(DATA_DIR, 'crawls', self.crawl_id)
+
+    def _path(self, name):
+        return data_path('crawls', self.crawl_id, name)
+
+    @property
+    def exists(self) -> bool:
+        return bool(self.meta)
+
+    def _load(self):
+        try:
+            with open(self._path('meta.json'), 'rb') as f:
+                self.meta = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.allowed_hosts = tuple(self.meta.get('allowed_hosts', self.allowed_hosts))
+        try:
+            with open(self._path('results.jsonl'), encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        result = PageResult.from_json(line)
+                    except (ValueError, KeyError, TypeError):
+                        continue  # torn last line of an interrupted append
+                    self.results[result.url] = result
+        except OSError:
+            pass
+        try:
+            with gzip.open(self._path('frontier.txt.gz'), 'rt', encoding='utf-8') as f:
+                frontier = [url for url in f.read().split('\n') if url]
+        except OSError:
+            frontier = []
+        self.visited = set(self.results)
+        self._enqueue(frontier, check_host=False)
+        for result in list(self.results.values()):
+            self._discover(result)
+
+    # Run lock
+
+    @property
+    def _lock_path(self) -> str:
+        return os.path.join(self.directory, 'run.lock')
+
+    def running_since(self) -> Optional[float]:
+        """
+        When the run holding this crawl's lock started, or None when no live
+        run holds it.
+        """
+        try:
+            if time.time() - os.path.getmtime(self._lock_path) >= LOCK_STALE_SECONDS:
+                return None
+            with open(self._lock_path, encoding='utf-8') as f:
+                return float(json.load(f)['started_at'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _acquire_lock(self):
+        os.makedirs(self.directory, exist_ok=True)
+        for _ in range(2):
+            try:
+                fd = os.open(self._lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if self.running_since() is not None:
+                    raise CrawlLocked(f"Crawl {self.crawl_id} is already running elsewhere")
+                # Stale: left by a run that died without releasing it
+                try:
+                    os.remove(self._lock_path)
+                except OSError:
+                    pass
+                continue
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'pid': os.getpid(), 'started_at': time.time()}, f)
+            self._holds_lock = True
+            return
+        raise CrawlLocked(f"Crawl {self.crawl_id} is already running elsewhere")
+
+    def _reload_if_changed(self):
+        """
+        Reload the saved state when another run checkpointed since it was loaded.
+        """
+        try:
+            with open(self._path('meta.json'), 'rb') as f:
+                checkpoint_at = json.load(f).get('checkpoint_at')
+        except (OSError, ValueError):
+            return
+        if checkpoint_at != self.meta.get('checkpoint_at'):
+            self.results, self.frontier, self.visited, self.meta, self._pending = {}, deque(), set(), {}, []
+            self._load()
+
+    def _release_lock(self):
+        if self._holds_lock:
+            self._holds_lock = False
+            try:
+                os.remove(self._lock_path)
+            except OSError:
+                pass
+
+    def start(self, seeds, source: str = ''):
+        """
+        Discard any saved state and start a new crawl from seeds. Raises
+        CrawlLocked while another run is working on the crawl.
+        """
+        if not self._holds_lock and self.running_since() is not None:
+            raise CrawlLocked(f"Crawl {self.crawl_id} is running; stop it before starting over")
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.results = {}
+        self.frontier = deque()
+        self.visited = set()
+        self._pending = []
+        self.meta = {'crawl_id': self.crawl_id, 'source': source, 'allowed_hosts': list(self.allowed_hosts),
+                     'started_at': time.time()}
+        self._enqueue(seeds, check_host=False)
+        self.checkpoint(in_flight=())
+
+    def checkpoint(self, in_flight=()):
+        """
+        Append finished pages to the results log, then rewrite the frontier
+        (in-flight URLs included, so they are fetched again on resume).
+        """
+        if self._pending:
+            with open(self._path('results.jsonl'), 'a', encoding='utf-8') as f:
+                f.write(''.join(result.to_json() + '\n' for result in self._pending))
+            self._pending = []
+        frontier = '\n'.join(list(in_flight) + list(self.frontier))
+        atomic_write(self._path('frontier.txt.gz'), gzip.compress(frontier.encode('utf-8'), compresslevel=5))
+        self.meta.update(checkpoint_at=time.time(), done=len(self.results), queued=len(self.frontier) + len(in_flight))
+        atomic_write(self._path('meta.json'), json.dumps(self.meta).encode('utf-8'))
+        if self._holds_lock:
+            # Heartbeat: keeps the lock from looking stale
+            os.utime(self._lock_path)
+
+    # Crawling
+
+    def _allowed(self, url: str) -> bool:
+        host = urlsplit(url).hostname or ''
+        return any(host == allowed or host.endswith('.' + allowed) for allowed in self.allowed_hosts)
+
+    def _enqueue(self, urls, check_host=True):
+        added = 0
+        for url in urls:
+            url = normalize(url)
+            if url and url not in self.visited and url.startswith('http') and (not check_host or self._allowed(url)):
+                self.visited.add(url)
+                self.frontier.append(url)
+                added += 1
+        return added
+
+    def _discover(self, result: PageResult):
+        # hrefs may be relative to the page that declares them
+        return self._enqueue(urljoin(result.url, link.href) for link in result.links)
+
+    def run(self, max_workers: int = DEFAULT_MAX_WORKERS, max_pages: Optional[int] = None,
+            limiter: Optional[rate_limit.RateLimiter] = None) -> Iterator[PageResult]:
+        """
+        Crawl until the frontier is empty (or max_pages more pages are done),
+        yielding each finished page. Closing the generator stops the crawl and
+        writes a final checkpoint, from which a later run() resumes. Raises
+        CrawlLocked when another run is already working on this crawl.
+        """
+        self._acquire_lock()
+        try:
+            self._reload_if_changed()
+            yield from self._run(max_workers, max_pages, limiter)
+        finally:
+            self._release_lock()
+
+    def _run(self, max_workers, max_pages, limiter) -> Iterator[PageResult]:
+        limiter = limiter or rate_limit.RateLimiter()
+        window = max(1, max_workers) * 2
+        in_flight = {}
+        budget = max_pages if max_pages else float('inf')
+        last_checkpoint = time.monotonic()
+        since_checkpoint = 0
+        executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+        try:
+            while self.frontier or in_flight:
+                while self.frontier and len(in_flight) < window and budget > len(in_flight):
+                    url = self.frontier.popleft()
+                    in_flight[executor.submit(crawl_page, url, limiter)] = url
+                if not in_flight:
+                    break
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del in_flight[future]
+                    result = future.result()
+                    self.results[result.url] = result
+                    self._pending.append(result)
+                    self._discover(result)
+                    budget -= 1
+                    since_checkpoint += 1
+                    yield result
+                if since_checkpoint >= CHECKPOINT_PAGES or time.monotonic() - last_checkpoint >= CHECKPOINT_SECONDS:
+                    self.checkpoint(in_flight.values())
+                    last_checkpoint = time.monotonic()
+                    since_checkpoint = 0
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.checkpoint(in_flight.values())
+
+    # Results
+
+    def locale_matrix(self) -> Tuple[List[str], List[Dict]]:
+        """
+        (hreflang columns, rows): one row per crawled page with its region and
+        the alternate URL it declares for each hreflang.
+        """
+        hreflangs = sorted({link.hreflang for result in self.results.values() for link in result.links})
+        classifier = locales.DEFAULT_CLASSIFIER
+        rows = []
+        for url in sorted(self.results):
+            result = self.results[url]
+            row = {'url': url, 'region': classifier.region(url), 'error': result.error or ''}
+            row.update({link.hreflang: link.href for link in result.links})
+            rows.append(row)
+        return hreflangs, rows
+
+    def region_counts(self) -> Dict[str, int]:
+        """
+        Crawled pages per region.
+        """
+        return {region: len(urls) for region, urls in locales.categorize_urls(list(self.results)).items()}
@@ -0,0 +1,240 @@
+from collections import Counter, defaultdict, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Sequence
+from urllib.parse import urljoin
+
+import requests
+
+import alternate_links
+import locales
+import rate_limit
+from hreflang_crawler import normalize
+
+# Reciprocal hreflang validation. Each input page and every alternate it
+# declares form a cluster; every page of every cluster is fetched exactly
+# once (clusters of different inputs usually overlap completely), and the
+# hreflang graph between them is then checked for:
+#
+#   missing return links  A declares B, but B (which answered 200) does not declare A
+#   non-200 targets       a declared alternate that redirects, errors or is missing
+#   locale mismatches     an hreflang that is not a known locale, or whose URL
+#                         sits in another locale's section of the site
+
+DEFAULT_MAX_WORKERS = alternate_links.DEFAULT_MAX_WORKERS
+
+MISSING_RETURN = "Missing return link"
+NON_200 = "Non-200 target"
+LOCALE_MISMATCH = "Locale mismatch"
+ISSUE_KINDS = (MISSING_RETURN, NON_200, LOCALE_MISMATCH)
+
+X_DEFAULT = 'x-default'
+
+# page: where the problem was found; target: the alternate it concerns
+HreflangIssue = namedtuple('HreflangIssue', ['kind', 'page', 'target', 'hreflang', 'detail'])
+
+
+class PageLinks:
+    __slots__ = ('url', 'status', 'location', 'links', 'error', '_hrefs')
+
+    def __init__(self, url: str, status, location: Optional[str] = None,
+                 links: Optional[List[alternate_links.AlternateLink]] = None, error: Optional[str] = None):
+        self.url = url
+        # HTTP status code, or "Error" when the request failed
+        self.status = status
+        self.location = location
+        # rel=alternate links without hreflang (RSS feeds, mobile pages) belong to no cluster
+        self.links = [link for link in links or [] if link.hreflang]
+        self.error = error
+        self._hrefs = None
+
+    @property
+    def hrefs(self) -> Dict[str, str]:
+        """
+        Normalized alternate URL -> hreflang.
+        """
+        if self._hrefs is None:
+            self._hrefs = {}
+            for href, hreflang in self.normalized_links():
+                self._hrefs.setdefault(href, hreflang)
+        return self._hrefs
+
+    def normalized_links(self) -> List[alternate_links.AlternateLink]:
+        """
+        Every hreflang alternate link, its href made absolute and normalized.
+        """
+        return [alternate_links.AlternateLink(normalize(urljoin(self.url, link.href)), link.hreflang)
+                for link in self.links]
+
+    @property
+    def status_text(self) -> str:
+        if self.error:
+            return f"Error: {self.error}"
+        if self.location:
+            return f"{self.status} -> {urljoin(self.url, self.location)}"
+        return str(self.status)
+
+
+def fetch_page(url: str, limiter: Optional[rate_limit.RateLimiter] = None) -> PageLinks:
+    try:
+        status, location, links = alternate_links.fetch_page_links(url, limiter)
+    except requests.RequestException as e:
+        return PageLinks(url, "Error", error=str(e))
+    return PageLinks(url, status, location, links)
+
+
+def url_locale(url: str, classifier: locales.LocaleClassifier = locales.DEFAULT_CLASSIFIER) -> Optional[str]:
+    """
+    The locale whose section of the site url is in: its locale path segment,
+    en-us for /en-us/, zh-cn on a .cn host, else None.
+    """
+    host, segment = locales.split_url(url)
+    if segment == locales.DEFAULT_LOCALE:
+        return segment
+    locale = classifier.locale(url)
+    if locale is None and classifier.region(url) == 'CN':
+        return 'zh-cn'
+    return locale
+
+
+class HreflangValidator:
+    def __init__(self, region_codes: Optional[Dict[str, List[str]]] = None):
+        self.classifier = locales.DEFAULT_CLASSIFIER if region_codes in (None, locales.REGION_CODES) else (
+            locales.LocaleClassifier(region_codes))
+        self.known_locales = {locales.DEFAULT_LOCALE} | {
+            code for codes in (region_codes or locales.REGION_CODES).values() for code in codes if not code.startswith('.')}
+        self.inputs: List[str] = []
+        self.pages: Dict[str, PageLinks] = {}
+        # URLs fetched or waiting to be, for progress totals
+        self.queued = 0
+
+    def run(self, urls: Sequence[str], max_workers: int = DEFAULT_MAX_WORKERS,
+            limiter: Optional[rate_limit.RateLimiter] = None) -> Iterator[PageLinks]:
+        """
+        Fetch every input page and every alternate they declare, each URL
+        once, yielding pages as they are fetched. Closing the generator
+        cancels what has not started yet.
+        """
+        limiter = limiter or rate_limit.RateLimiter()
+        self.inputs = list(dict.fromkeys(normalize(url) for url in urls if url.strip()))
+        inputs = set(self.inputs)
+        queued = set(self.pages)
+        pending = []
+        for url in self.inputs:
+            if url not in queued:
+                queued.add(url)
+                pending.append(url)
+        self.queued = len(queued)
+
+        window = max(1, max_workers) * 2
+        in_flight = {}
+        executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+        try:
+            while pending or in_flight:
+                while pending and len(in_flight) < window:
+                    url = pending.pop()
+                    in_flight[executor.submit(fetch_page, url, limiter)] = url
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del in_flight[future]
+                    page = future.result()
+                    self.pages[page.url] = page
+                    # Alternates of input pages complete their clusters
+                    if page.url in inputs:
+                        for href in page.hrefs:
+                            if href not in queued and href.startswith('http'):
+                                queued.add(href)
+                                pending.append(href)
+                        self.queued = len(queued)
+                    yield page
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def cluster(self, url: str) -> List[str]:
+        """
+        The input page followed by the alternates it declares.
+        """
+        page = self.pages.get(url)
+        return [url] + ([href for href in page.hrefs if href != url] if page else [])
+
+    def issues(self) -> List[HreflangIssue]:
+        """
+        Every problem in the fetched clusters, each reported once however
+        many clusters share it.
+        """
+        issues = {}
+        checked = set()
+        for url in self.inputs:
+            page = self.pages.get(url)
+            if page is None:
+                continue
+            if page.status != 200:
+                issue = HreflangIssue(NON_200, url, url, '', page.status_text)
+                issues.setdefault(issue[:3], issue)
+                continue
+            for member in self.cluster(url):
+                if member not in checked:
+                    checked.add(member)
+                    self._check_page(self.pages.get(member), issues)
+        return list(issues.values())
+
+    def _check_page(self, page: Optional[PageLinks], issues: Dict):
+        if page is None or page.status != 200:
+            return
+        for href, hreflang in page.normalized_links():
+            lang = hreflang.lower()
+            if lang == X_DEFAULT:
+                continue
+            if lang not in self.known_locales:
+                detail = f"Unknown locale '{hreflang}'"
+            else:
+                actual = url_locale(href, self.classifier)
+                if actual == lang:
+                    continue
+                detail = f"URL is in the {actual or 'unknown'} section"
+            issues.setdefault((LOCALE_MISMATCH, page.url, href, lang),
+                              HreflangIssue(LOCALE_MISMATCH, page.url, href, hreflang, detail))
+
+        for href, hreflang in page.hrefs.items():
+            if href == page.url:
+                continue
+            target = self.pages.get(href)
+            if target is None:
+                continue  # declared only by a page outside the input clusters
+            if target.status != 200:
+                issues.setdefault((NON_200, page.url, href), HreflangIssue(
+                    NON_200, page.url, href, hreflang, target.status_text))
+            elif page.url not in target.hrefs:
+                issues.setdefault((MISSING_RETURN, href, page.url), HreflangIssue(
+                    MISSING_RETURN, href, page.url, page.hrefs.get(page.url, ''),
+                    f"{href} does not link back to {page.url}"))
+
+    def summary(self, issues: Optional[List[HreflangIssue]] = None) -> Dict[str, int]:
+        issues = self.issues() if issues is None else issues
+        counts = Counter(issue.kind for issue in issues)
+        return {'clusters': len(self.inputs), 'pages fetched': len(self.pages),
+                **{kind: counts.get(kind, 0) for kind in ISSUE_KINDS}}
+
+    def cluster_rows(self, issues: Optional[List[HreflangIssue]] = None) -> List[Dict]:
+        """
+        One row per input page: cluster size and the issues touching it.
+        """
+        issues = self.issues() if issues is None else issues
+        by_url = defaultdict(set)
+        for i, issue in enumerate(issues):
+            by_url[issue.page].add(i)
+            by_url[issue.target].add(i)
+        rows = []
+        for url in self.inputs:
+            page = self.pages.get(url)
+            members = self.cluster(url)
+            touching = set().union(*(by_url.get(member, ()) for member in members))
+            counts = Counter(issues[i].kind for i in touching)
+            row = {'url': url, 'status': page.status_text if page else '', 'cluster size': len(members)}
+            row.update({kind: counts.get(kind, 0) for kind in ISSUE_KINDS})
+            rows.append(row)
+        return rows
+
+
+def issue_rows(issues: List[HreflangIssue]) -> List[Dict]:
+    return [issue._asdict() for issue in sorted(issues, key=lambda issue: (ISSUE_KINDS.index(issue.kind),
+                                                                           issue.page, issue.target))]
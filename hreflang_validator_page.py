@@ -0,0 +1,87 @@
+import streamlit as st
+
+import hreflang_validator
+import rate_limit
+import request_timing
+import status_code_Main
+
+# Streamlit front end for hreflang_validator: fetch the alternate clusters of
+# the entered pages and list missing return links, non-200 targets and
+# locale mismatches.
+
+
+def run_validation(urls, max_workers):
+    """
+    Fetch every cluster with live progress; Cancel reruns the script and
+    leaves the pages fetched so far to be validated.
+    """
+    validator = hreflang_validator.HreflangValidator()
+    timings = request_timing.TimingCollector()
+    limiter = rate_limit.RateLimiter(timings=timings)
+    run = {"validator": validator, "done": False, "elapsed": 0.0, "limiter": limiter, "timings": timings}
+    st.session_state.hreflang_validation = run
+
+    st.button("Cancel", key="cancel_hreflang_validation")
+    panel = status_code_Main.ProgressPanel(len(urls), unit="pages")
+    pages = validator.run(urls, max_workers=max_workers, limiter=limiter)
+    try:
+        for page in pages:
+            run["elapsed"] = panel.elapsed
+            panel.total = validator.queued
+            panel.add(str(page.status),
+                      {"URL": page.url, "Status": page.status_text, "Alternates": len(page.links)})
+    finally:
+        pages.close()
+    run["elapsed"] = panel.elapsed
+    run["done"] = True
+    panel.finish()
+
+
+def show_validation(run):
+    validator = run["validator"]
+    issues = validator.issues()
+    summary = validator.summary(issues)
+    if run["done"]:
+        st.write(f"Fetched {summary['pages fetched']} pages for {summary['clusters']} clusters "
+                 f"in {run['elapsed']:.2f} seconds")
+    else:
+        st.warning(f"Cancelled after fetching {summary['pages fetched']} pages; the results below are partial.")
+
+    columns = st.columns(len(hreflang_validator.ISSUE_KINDS))
+    for column, kind in zip(columns, hreflang_validator.ISSUE_KINDS):
+        column.metric(kind + "s", summary[kind])
+    status_code_Main.show_throttling(run["limiter"])
+    status_code_Main.show_timing(run["timings"], key="hreflang_validation_timings")
+
+    if issues:
+        kinds = st.multiselect("Show issues", list(hreflang_validator.ISSUE_KINDS),
+                               default=list(hreflang_validator.ISSUE_KINDS))
+        rows = hreflang_validator.issue_rows([issue for issue in issues if issue.kind in kinds])
+        st.dataframe(rows, use_container_width=True, height=400)
+    else:
+        st.success("Every cluster is reciprocal, answers 200 and matches its locales.")
+
+    with st.expander("Clusters"):
+        st.dataframe(validator.cluster_rows(issues), use_container_width=True)
+
+    status_code_Main.show_export(lambda: hreflang_validator.issue_rows(issues),
+                                 list(hreflang_validator.HreflangIssue._fields), "hreflang_issues",
+                                 key="hreflang_validation_export", source=(id(validator), len(validator.pages)))
+
+
+def main():
+    st.title("🔁 Hreflang Validator")
+    st.caption("Fetches each page and every alternate it declares (each URL once, even when clusters overlap) "
+               "and checks that the alternates link back, answer 200 and sit in their hreflang's locale.")
+    url_input = st.text_area("Enter URLs (one per line)", height=200, key="hreflang_validation_urls")
+    max_workers = st.number_input("Parallel requests", min_value=1, max_value=64,
+                                  value=hreflang_validator.DEFAULT_MAX_WORKERS, key="hreflang_validation_workers")
+    if st.button("Validate"):
+        urls = [url.strip() for url in url_input.splitlines() if url.strip()]
+        if urls:
+            run_validation(urls, int(max_workers))
+        else:
+            st.warning("Please enter at least one URL.")
+    run = st.session_state.get("hreflang_validation")
+    if run:
+        show_validation(run)
@@ -0,0 +1,170 @@
+import socket
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError
+from urllib3.util.retry import Retry
+
+# Shared HTTP layer for every toolkit module. All traffic goes through one
+# requests.Session so connections to the few hosts we talk to
+# (www.nvidia.com, preview.nvidia.com, www.nvidia.cn, origin-aws-prod-*)
+# are kept alive and reused instead of paying a TLS handshake per call.
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# (connect, read) timeout in seconds, used when a caller does not pass one.
+DEFAULT_TIMEOUT = (5, 30)
+
+# Number of distinct hosts whose pools are kept, and connections kept per host.
+# POOL_MAXSIZE should be at least the largest per-host concurrency we run with.
+POOL_CONNECTIONS = 32
+POOL_MAXSIZE = 64
+
+RETRY_TOTAL = 2
+RETRY_BACKOFF_FACTOR = 0.5
+# 429 and 503 are left to rate_limit, which adapts per-host limits to them.
+RETRY_STATUS_FORCELIST = (500, 502, 504)
+
+_session = None
+_session_lock = threading.Lock()
+
+# Time spent opening new connections (DNS, TCP connect, TLS handshake) by the
+# current thread since the last connection_phases() call. Connections are
+# opened in the thread that sends the request, so a caller can attribute
+# these phases to its own request; reused keep-alive connections add nothing.
+_phases = threading.local()
+
+
+def _add_phase(name, seconds):
+    setattr(_phases, name, getattr(_phases, name, 0.0) + seconds)
+
+
+def connection_phases():
+    """
+    Return and reset this thread's {'dns', 'connect', 'tls', 'new_connections'} totals.
+    """
+    phases = {name: getattr(_phases, name, 0.0) for name in ('dns', 'connect', 'tls', 'new_connections')}
+    _phases.__dict__.clear()
+    return phases
+
+
+class _TimedConnectionMixin:
+    def _new_conn(self):
+        host = self._dns_host
+        start = time.perf_counter()
+        try:
+            addresses = [info[4][0] for info in socket.getaddrinfo(host, self.port, 0, socket.SOCK_STREAM)]
+        except socket.gaierror:
+            # Let urllib3 raise its usual NameResolutionError
+            addresses = [host]
+        resolved = time.perf_counter()
+        _add_phase('dns', resolved - start)
+        error = None
+        try:
+            for address in dict.fromkeys(addresses):
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except ConnectTimeoutError as e:  # includes NewConnectionError
+                    error = e
+            raise error
+        finally:
+            self._dns_host = host
+            _add_phase('connect', time.perf_counter() - resolved)
+
+    def connect(self):
+        before = getattr(_phases, 'dns', 0.0) + getattr(_phases, 'connect', 0.0)
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            opened = getattr(_phases, 'dns', 0.0) + getattr(_phases, 'connect', 0.0) - before
+            _add_phase('tls', max(0.0, time.perf_counter() - start - opened))
+            _add_phase('new_connections', 1)
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {'http': _TimedHTTPConnectionPool,
+                                                   'https': _TimedHTTPSConnectionPool}
+
+
+def _build_retry():
+    return Retry(
+        total=RETRY_TOTAL,
+        connect=RETRY_TOTAL,
+        read=1,
+        backoff_factor=RETRY_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUS_FORCELIST,
+        allowed_methods=frozenset({'HEAD', 'GET'}),
+        # Retry-After (429/503) is honoured by rate_limit, not by blocking here
+        respect_retry_after_header=False,
+        raise_on_status=False,
+    )
+
+
+def create_session():
+    """
+    Build a session with sized keep-alive pools, the retry policy and default
+    headers. Its connections record their setup phases (see connection_phases).
+    """
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    adapter = _TimedAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        max_retries=_build_retry(),
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session():
+    """
+    Return the process-wide session, creating it on first use.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def request(method, url, **kwargs):
+    kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+    return get_session().request(method, url, **kwargs)
+
+
+def get(url, **kwargs):
+    kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+    return get_session().get(url, **kwargs)
+
+
+def head(url, **kwargs):
+    kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+    return get_session().head(url, **kwargs)
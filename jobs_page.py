@@ -0,0 +1,112 @@
+import time
+
+import streamlit as st
+
+import alternate_links
+import audit_jobs
+import sitemap_cache
+import status_code_Main
+import url_status
+
+# Streamlit page for audit_jobs: queue sitemap-wide audits, follow every
+# job's progress from any session, and view, export, cancel or delete jobs.
+# Jobs run on the server's worker threads, so closing the tab or switching
+# pages leaves them running.
+
+REFRESH_SECONDS = 2.0
+LATEST_ROWS = 200
+
+STATE_ICONS = {audit_jobs.QUEUED: "⏳", audit_jobs.RUNNING: "▶️", audit_jobs.DONE: "✅",
+               audit_jobs.FAILED: "❌", audit_jobs.CANCELLED: "⏹"}
+
+
+def queue_job(kind, params, label):
+    """
+    Submit a job from any page and say where to follow it.
+    """
+    try:
+        job_id = audit_jobs.get_job_queue().submit(kind, params, label)
+    except ValueError as e:
+        st.error(str(e))
+    else:
+        st.success(f"Queued background job #{job_id} ({label}). Follow it on the Background Jobs page; "
+                   "it keeps running if you leave this page.")
+
+
+def _progress_text(job):
+    total = f"/{job.total}" if job.total is not None else ""
+    return f"{job.done}{total} URLs · {job.elapsed:.0f}s · {job.rate:.1f} URLs/second"
+
+
+def job_rows(jobs):
+    return [{"Job": job.id, "Kind": job.kind, "Label": job.label,
+             "State": f"{STATE_ICONS.get(job.state, '')} {job.state}", "Progress": _progress_text(job),
+             "Queued at": time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(job.created_at))}
+            for job in jobs]
+
+
+def show_job(queue, job):
+    st.subheader(f"Job #{job.id}: {job.label}")
+    if job.total:
+        st.progress(min(job.done / job.total, 1.0), text=_progress_text(job))
+    else:
+        st.write(_progress_text(job))
+    if job.state == audit_jobs.FAILED:
+        st.error(f"Failed: {job.error}")
+    elif job.state == audit_jobs.CANCELLED:
+        st.warning("Cancelled; the results below are partial.")
+
+    if job.active:
+        if st.button("Cancel job", key=f"cancel_job_{job.id}"):
+            queue.cancel(job.id)
+            st.rerun()
+    elif st.button("Delete job and results", key=f"delete_job_{job.id}"):
+        queue.delete(job.id)
+        st.session_state.pop("selected_job", None)
+        st.rerun()
+
+    fields = audit_jobs.JOB_FIELDS[job.kind]
+    rows = [dict(zip(fields, row)) for url, data in queue.latest_results(job.id, LATEST_ROWS)
+            for row in audit_jobs.result_rows(job.kind, url, data)]
+    if rows:
+        st.caption(f"Latest {LATEST_ROWS} results" if job.done > LATEST_ROWS else "Results")
+        st.dataframe(rows, use_container_width=True, height=300)
+    if job.kind == "crawl":
+        st.caption(f"Open crawl '{job.params['crawl_id']}' in the Local Page Scraper's crawl mode "
+                   "for its locale matrix.")
+    status_code_Main.show_export(lambda: queue.iter_rows(job), fields, f"job_{job.id}_{job.kind}",
+                                 key="job_export", source=job.id)
+
+
+@st.fragment(run_every=REFRESH_SECONDS)
+def show_jobs():
+    # Reruns on its own every few seconds, so progress moves without touching the rest of the page
+    queue = audit_jobs.get_job_queue()
+    jobs = queue.jobs()
+    if not jobs:
+        st.info("No background jobs yet.")
+        return
+    st.dataframe(job_rows(jobs), use_container_width=True, hide_index=True)
+    ids = [job.id for job in jobs]
+    job_id = st.selectbox("Job", ids, key="selected_job",
+                          format_func=lambda job_id: f"#{job_id} {next(job.label for job in jobs if job.id == job_id)}")
+    show_job(queue, next(job for job in jobs if job.id == job_id))
+
+
+def main():
+    st.title("🗂 Background Jobs")
+    st.caption("Jobs run on the server, not in your browser session: leave the page, close the tab or open "
+               "another session, and they keep going. Jobs interrupted by a restart resume on their own.")
+
+    with st.expander("Queue a sitemap-wide audit"):
+        kind = st.radio("Audit", ["status", "scrape"], horizontal=True,
+                        format_func=lambda kind: {"status": "Status codes", "scrape": "Alternate links"}[kind])
+        sitemap = st.selectbox("Sitemap", list(sitemap_cache.KNOWN_SITEMAPS), key="job_sitemap")
+        max_workers = st.number_input("Parallel requests", min_value=1, max_value=256, key="job_workers",
+                                      value=url_status.DEFAULT_MAX_WORKERS if kind == "status"
+                                      else alternate_links.DEFAULT_MAX_WORKERS)
+        if st.button("Queue audit"):
+            queue_job(kind, {"sitemap": sitemap, "max_workers": int(max_workers)},
+                      f"{'Status' if kind == 'status' else 'Scrape'} of the {sitemap} sitemap")
+
+    show_jobs()
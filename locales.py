@@ -0,0 +1,97 @@
+from typing import Dict, List, Optional
+
+# Locale/region tables and a precompiled URL classifier. Instead of testing
+# every URL against every region code with substring checks, the classifier
+# pulls the host and first path segment out of the URL once and resolves the
+# region with a single dict lookup. That is faster and no longer matches
+# codes that merely appear deeper in the path (e.g. /en-us/.../en-in-offers/).
+
+REGION_CODES: Dict[str, List[str]] = {
+    'EMEA': ["en-gb", "en-eu", "en-me", "it-it", "fr-fr", "pl-pl", "ru-ru", "es-es", "de-de", "tr-tr",
+             "nb-no", "sv-se", "fi-fi", "da-dk", "nl-nl", "cs-cz", "fr-be", "de-at", "ro-ro"],
+    'APAC': ["en-in", "en-au", "en-sg", "en-ph", "en-my", "zh-tw", "ja-jp", "ko-kr", "id-id", "th-th", "vi-vn"],
+    'LABR': ["es-la", "pt-br"],
+    'CN': ["zh-cn", ".cn"]
+}
+
+REGIONS = ['EMEA', 'APAC', 'LABR', 'CN', 'US']
+DEFAULT_REGION = 'US'
+DEFAULT_LOCALE = 'en-us'
+
+# Every locale with its own site section (and sitemap), en-us first.
+ALL_LOCALES: List[str] = [DEFAULT_LOCALE] + [
+    code for codes in REGION_CODES.values() for code in codes if not code.startswith('.')
+]
+
+
+def split_url(url: str):
+    """
+    Return (host, first path segment), both lower-cased, without full URL parsing.
+    """
+    parts = url.split('/', 4)
+    if len(parts) < 3 or parts[1] or not parts[0].endswith(':'):
+        # No scheme: treat the text before the first '/' as the host.
+        parts = ['', ''] + url.split('/', 2)
+    host = parts[2]
+    segment = parts[3] if len(parts) > 3 else ''
+    if '@' in host or ':' in host:
+        host = host.rpartition('@')[2].partition(':')[0]
+    if '?' in segment or '#' in segment:
+        segment = segment.partition('?')[0].partition('#')[0]
+    return host.lower(), segment.lower()
+
+
+class LocaleClassifier:
+    def __init__(self, region_codes: Dict[str, List[str]]):
+        # Codes starting with '.' are host suffixes (".cn"); the rest are locale path segments.
+        self._locale_region = {}
+        self._host_suffixes = []
+        for region, codes in region_codes.items():
+            for code in codes:
+                if code.startswith('.'):
+                    self._host_suffixes.append((code, region))
+                else:
+                    self._locale_region.setdefault(code, region)
+        self._host_suffixes = tuple(self._host_suffixes)
+        self._suffixes = tuple(suffix for suffix, _ in self._host_suffixes)
+        self.regions = list(dict.fromkeys(list(region_codes) + [DEFAULT_REGION]))
+
+    def locale(self, url: str) -> Optional[str]:
+        """
+        The known locale segment of url (e.g. 'de-de'), or None.
+        """
+        segment = split_url(url)[1]
+        return segment if segment in self._locale_region else None
+
+    def region(self, url: str) -> str:
+        host, segment = split_url(url)
+        if host.endswith(self._suffixes):
+            for suffix, region in self._host_suffixes:
+                if host.endswith(suffix):
+                    return region
+        return self._locale_region.get(segment, DEFAULT_REGION)
+
+    def categorize(self, urls: List[str]) -> Dict[str, List[str]]:
+        categorized_urls = {region: [] for region in self.regions}
+        suffixes = self._suffixes
+        locale_region = self._locale_region
+        for url in urls:
+            host, segment = split_url(url)
+            if host.endswith(suffixes):
+                region = self.region(url)
+            else:
+                region = locale_region.get(segment, DEFAULT_REGION)
+            categorized_urls[region].append(url)
+        return categorized_urls
+
+
+DEFAULT_CLASSIFIER = LocaleClassifier(REGION_CODES)
+
+
+def categorize_urls(urls: List[str], region_codes: Optional[Dict[str, List[str]]] = None) -> Dict[str, List[str]]:
+    """
+    Group URLs by region ('EMEA', 'APAC', 'LABR', 'CN', 'US').
+    """
+    if region_codes is None or region_codes is REGION_CODES:
+        return DEFAULT_CLASSIFIER.categorize(urls)
+    return LocaleClassifier(region_codes).categorize(urls)
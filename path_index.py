@@ -0,0 +1,91 @@
+from typing import Iterator, List, Sequence, Tuple
+
+from url_store import URLStore
+
+# Path-segment index over a sitemap, as a view on a URLStore. The store keeps
+# URLs in path order, so every subtree is one contiguous slice of it that two
+# bisections find. Listing children, counting URLs under a path and returning
+# a subtree's URLs therefore never rescan the sitemap, and an index over a
+# cached sitemap shares its store instead of copying the URLs.
+
+
+def _segments(path: str) -> List[str]:
+    return [segment for segment in path.split('/') if segment]
+
+
+class PathIndex:
+    def __init__(self, urls, base_url: str):
+        """
+        Index every URL under base_url (e.g. 'https://www.nvidia.com/en-us/').
+        urls may be a URLStore, which is then shared rather than copied.
+        """
+        self.base_url = base_url
+        if not isinstance(urls, URLStore):
+            urls = URLStore(url for url in urls if url and url.startswith(base_url))
+        self.store = urls
+        self._start, self._end = urls.prefix_range(base_url)
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def urls(self) -> List[str]:
+        return list(self.store.iter_range(self._start, self._end))
+
+    def _range(self, path) -> Tuple[int, int]:
+        segments = _segments(path) if isinstance(path, str) else list(path)
+        if not segments:
+            return self._start, self._end
+        # The page itself ('.../a/b', if listed without the slash) directly precedes '.../a/b/...'
+        page = self.base_url + '/'.join(segments)
+        start = self.store.bisect_left(page)
+        return max(start, self._start), min(self.store.prefix_range(page + '/')[1], self._end)
+
+    def _iter_children(self, path) -> List[Tuple[str, int, int, bool]]:
+        segments = _segments(path) if isinstance(path, str) else list(path)
+        start, end = self._range(segments)
+        prefix = self.base_url + ''.join(segment + '/' for segment in segments)
+        children = []
+        i = start
+        while i < end:
+            url = self.store[i]
+            name = url[len(prefix):].split('/', 1)[0] if url.startswith(prefix) else ''
+            if not name:
+                i += 1
+                continue
+            child_start, child_end = self._range(segments + [name])
+            has_page = url in (prefix + name, prefix + name + '/') or (
+                child_end - child_start > 1 and self.store[child_start + 1] == prefix + name + '/')
+            children.append((name, child_start, child_end, has_page))
+            i = max(child_end, i + 1)
+        return children
+
+    def children(self, path: Sequence[str] = (), pages_only: bool = False) -> List[str]:
+        """
+        Child segment names under path, in sorted order. With pages_only, only
+        children that are themselves a page in the sitemap are returned.
+        """
+        return [name for name, _, _, has_page in self._iter_children(path) if has_page or not pages_only]
+
+    def child_counts(self, path: Sequence[str] = ()) -> List[Tuple[str, int]]:
+        """
+        (segment, number of URLs under it) for every child of path.
+        """
+        return [(name, end - start) for name, start, end, _ in self._iter_children(path)]
+
+    def count(self, path: Sequence[str] = ()) -> int:
+        start, end = self._range(path)
+        return max(0, end - start)
+
+    def urls_under(self, path: Sequence[str] = ()) -> List[str]:
+        """
+        All URLs at or below path.
+        """
+        return list(self.iter_urls_under(path))
+
+    def iter_urls_under(self, path: Sequence[str] = ()) -> Iterator[str]:
+        """
+        URLs at or below path, decoded one at a time (for streaming exports).
+        """
+        start, end = self._range(path)
+        return self.store.iter_range(start, end)
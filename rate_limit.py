@@ -0,0 +1,284 @@
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import http_client
+
+# Adaptive per-host rate limiting. Each host gets a token bucket (requests per
+# second) and a concurrency window. Both grow additively while the host
+# answers normally and are halved when it answers 429 or 503 (AIMD), and the
+# whole host is paused for its Retry-After period. The limiter therefore
+# settles near the highest rate a host tolerates without manual tuning.
+# A streamed response holds its host's slot until it is closed, so bodies
+# still downloading count against the concurrency window.
+#
+# Each run or session builds its own RateLimiter, and the windows and token
+# buckets adapt per run: runs may cap a host differently (per_host_limit).
+# Retry-After pauses are process-wide, though: a host that throttled one run
+# is paused for every run in the process until its pause ends.
+#
+# Requests can be recorded (recording()) and replayed into another limiter
+# (RateLimiter.replay). single_flight does so when one run's request answers
+# another's: the other run's limiter adapts to, and its events and timings
+# show, the responses it used as if it had sent them.
+
+THROTTLE_STATUSES = frozenset({429, 503})
+
+DEFAULT_RATE = 50.0
+MIN_RATE = 0.5
+RATE_INCREASE = 0.5
+MIN_CONCURRENCY = 1.0
+DEFAULT_MAX_RETRIES = 3
+# Back-off used when a throttled response has no Retry-After header.
+DEFAULT_BACKOFF = 1.0
+MAX_RETRY_AFTER = 120.0
+
+_recording = threading.local()
+
+# Host -> time.monotonic() until which every limiter pauses it
+_host_pauses: Dict[str, float] = {}
+_host_pauses_lock = threading.Lock()
+
+
+def _pause_host(host: str, until: float):
+    with _host_pauses_lock:
+        _host_pauses[host] = max(_host_pauses.get(host, 0.0), until)
+
+
+@contextmanager
+def recording():
+    """
+    Collect the requests this thread sends through any RateLimiter in the
+    block, as a list of records for RateLimiter.replay.
+    """
+    records = []
+    previous = getattr(_recording, 'records', None)
+    _recording.records = records
+    try:
+        yield records
+    finally:
+        _recording.records = previous
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Seconds to wait from a Retry-After header (delta-seconds or HTTP date).
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HostLimiter:
+    def __init__(self, host: str, max_rate: float, max_concurrency: int):
+        self.host = host
+        self.max_rate = max_rate
+        self.max_concurrency = float(max_concurrency)
+        self.rate = max_rate
+        self.concurrency = float(max_concurrency)
+        self.in_flight = 0
+        self.throttled = 0
+        self.consecutive_throttles = 0
+        self._tokens = max(1.0, float(max_concurrency))
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+
+    def _refill(self, now):
+        capacity = max(1.0, self.concurrency)
+        self._tokens = min(capacity, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def acquire(self):
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                paused_until = max(self._paused_until, _host_pauses.get(self.host, 0.0))
+                if now < paused_until:
+                    self._cond.wait(paused_until - now)
+                    continue
+                if self.in_flight >= max(1, int(self.concurrency)):
+                    self._cond.wait()
+                    continue
+                self._refill(now)
+                if self._tokens < 1:
+                    self._cond.wait((1 - self._tokens) / self.rate)
+                    continue
+                self._tokens -= 1
+                self.in_flight += 1
+                return
+
+    def release(self, status_code=None, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        Record a finished request. Returns the pause applied when it was
+        throttled, else None.
+        """
+        with self._cond:
+            self.in_flight -= 1
+            return self._observe(status_code, retry_after)
+
+    def observe(self, status_code, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        Adapt to a response received for this host without a slot of ours,
+        as release() does.
+        """
+        with self._cond:
+            return self._observe(status_code, retry_after)
+
+    def _observe(self, status_code, retry_after):
+        # Called with self._cond held
+        pause = None
+        if status_code in THROTTLE_STATUSES:
+            self.throttled += 1
+            self.consecutive_throttles += 1
+            self.concurrency = max(MIN_CONCURRENCY, self.concurrency / 2)
+            self.rate = max(MIN_RATE, self.rate / 2)
+            if retry_after is None:
+                retry_after = DEFAULT_BACKOFF * 2 ** (self.consecutive_throttles - 1)
+            pause = min(MAX_RETRY_AFTER, retry_after)
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+            _pause_host(self.host, self._paused_until)
+        elif status_code is not None:
+            self.consecutive_throttles = 0
+            self.concurrency = min(self.max_concurrency, self.concurrency + 1 / self.concurrency)
+            self.rate = min(self.max_rate, self.rate + RATE_INCREASE)
+        self._cond.notify_all()
+        return pause
+
+
+class RateLimiter:
+    def __init__(self, max_rate: float = DEFAULT_RATE, max_concurrency: int = 8,
+                 max_retries: int = DEFAULT_MAX_RETRIES, timings=None):
+        """
+        timings, a request_timing.TimingCollector, records every request sent,
+        including the time it waited for its host's limits.
+        """
+        self.max_rate = max_rate
+        self.timings = timings
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.events: List[Dict] = []
+        self._hosts: Dict[str, HostLimiter] = {}
+        self._lock = threading.Lock()
+
+    def host(self, url: str) -> HostLimiter:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            limiter = self._hosts.get(host)
+            if limiter is None:
+                limiter = self._hosts[host] = HostLimiter(host, self.max_rate, self.max_concurrency)
+            return limiter
+
+    def request(self, method: str, url: str, **kwargs):
+        """
+        Send a request through http_client within the host's limits. Throttled
+        responses (429/503) shrink the host's window, pause it for Retry-After
+        and are retried up to max_retries times; the last response is returned.
+        With stream=True the host's slot is held until the response is closed,
+        so callers must close it.
+        """
+        host = self.host(url)
+        attempt = 0
+        while True:
+            queued = time.perf_counter()
+            host.acquire()
+            try:
+                if self.timings is not None:
+                    response = self.timings.request(method, url, wait=time.perf_counter() - queued, **kwargs)
+                else:
+                    response = http_client.request(method, url, **kwargs)
+            except Exception:
+                host.release()
+                self._record(url, None, None)
+                raise
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if kwargs.get('stream'):
+                # The body is yet to be read: adapt now, free the slot on close()
+                pause = host.observe(response.status_code, retry_after)
+                self._release_on_close(host, response)
+            else:
+                pause = host.release(response.status_code, retry_after)
+            self._record(url, response.status_code, retry_after)
+            if pause is None:
+                return response
+            self._add_event(host, url, response.status_code, retry_after, pause)
+            if attempt >= self.max_retries:
+                return response
+            attempt += 1
+            response.close()
+
+    @staticmethod
+    def _release_on_close(host: HostLimiter, response):
+        close = response.close
+        released = []
+
+        def close_and_release():
+            try:
+                close()
+            finally:
+                if not released:
+                    released.append(True)
+                    host.release()
+
+        response.close = close_and_release
+
+    def _record(self, url: str, status_code, retry_after: Optional[float]):
+        records = getattr(_recording, 'records', None)
+        if records is not None:
+            timing = self.timings.last() if self.timings is not None else None
+            records.append({'url': url, 'status': status_code, 'retry_after': retry_after, 'timing': timing})
+
+    def _add_event(self, host: HostLimiter, url: str, status_code, retry_after: Optional[float], pause: float,
+                   shared: bool = False):
+        with self._lock:
+            self.events.append({
+                'time': time.time(),
+                'host': host.host,
+                'url': url,
+                'status': status_code,
+                'retry_after': retry_after,
+                'pause': round(pause, 2),
+                'concurrency': round(host.concurrency, 2),
+                'rate': round(host.rate, 2),
+                'shared': shared,
+            })
+
+    def replay(self, records: List[Dict]):
+        """
+        Account for requests another limiter sent on our behalf (see
+        recording()): each host adapts to their responses, throttled ones
+        become events marked shared, and timings records a shared copy of
+        each request's timing.
+        """
+        for record in records:
+            host = self.host(record['url'])
+            pause = host.observe(record['status'], record['retry_after'])
+            if pause is not None:
+                self._add_event(host, record['url'], record['status'], record['retry_after'], pause, shared=True)
+            if self.timings is not None and record['timing'] is not None:
+                self.timings.record(record['timing'].shared_copy())
+
+    def host_summary(self) -> List[Dict]:
+        """
+        Current adaptive state of every host seen so far.
+        """
+        with self._lock:
+            hosts = list(self._hosts.values())
+        return [
+            {
+                'host': host.host,
+                'throttled': host.throttled,
+                'concurrency': round(host.concurrency, 2),
+                'rate': round(host.rate, 2),
+            }
+            for host in hosts
+        ]
@@ -0,0 +1,168 @@
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urljoin
+
+import requests
+
+import http_client
+import single_flight
+
+# Redirect-chain resolution for the status checker. Every hop is fetched at
+# most once per resolver: results are memoized by URL and concurrent requests
+# for the same hop wait for the first one, so inputs that share intermediate
+# targets (e.g. many URLs -> one locale landing page) cost one request per hop.
+# Across resolvers (other runs, other sessions) hops requested at the same
+# moment share one request through the 'status hop' single-flight group.
+
+REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+# Servers that reject HEAD with these statuses are retried with a 1-byte ranged GET.
+HEAD_REJECTED_STATUSES = frozenset({405, 501})
+DEFAULT_MAX_HOPS = 10
+DEFAULT_TIMEOUT = 5
+
+_hop_flight = single_flight.group('status hop')
+
+LOOP = "Loop"
+TOO_MANY_REDIRECTS = "Too many redirects"
+
+
+class Hop:
+    def __init__(self, url: str, status, location: Optional[str], latency: float, method: str,
+                 error: Optional[str] = None):
+        self.url = url
+        self.status = status
+        self.location = location
+        self.latency = latency
+        self.method = method
+        self.error = error
+
+    def to_dict(self) -> Dict:
+        return {
+            'url': self.url,
+            'status': self.status,
+            'location': self.location,
+            'latency_ms': round(self.latency * 1000, 1),
+            'method': self.method,
+            'error': self.error,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Hop':
+        return cls(data['url'], data['status'], data['location'], data['latency_ms'] / 1000, data['method'],
+                   data['error'])
+
+
+class Resolution:
+    def __init__(self, url: str, hops: List[Hop], outcome=None):
+        self.url = url
+        self.hops = hops
+        # None when the chain ended normally, else LOOP or TOO_MANY_REDIRECTS
+        self.outcome = outcome
+
+    @property
+    def final_url(self) -> Optional[str]:
+        """
+        Last URL reached, when at least one redirect was followed.
+        """
+        return self.hops[-1].url if len(self.hops) > 1 else None
+
+    @property
+    def status(self):
+        """
+        Status label: the plain code for a direct response, otherwise the chain
+        of codes, e.g. "301 -> 302 -> 200" or "301 -> Loop".
+        """
+        codes = [hop.status for hop in self.hops]
+        if self.outcome:
+            codes.append(self.outcome)
+        if len(codes) == 1:
+            return codes[0]
+        return " -> ".join(str(code) for code in codes)
+
+    @property
+    def chain_text(self) -> str:
+        return " -> ".join(hop.url for hop in self.hops)
+
+
+def fetch_hop(url: str, timeout: float = DEFAULT_TIMEOUT, limiter=None) -> Hop:
+    """
+    Request url once without following redirects, through limiter (a
+    rate_limit.RateLimiter) when given. A request for url already in flight
+    anywhere in the process is joined instead of repeated, and recorded in
+    limiter as a shared request.
+    """
+    return _hop_flight.request((url, timeout), limiter, _fetch_hop, url, timeout)
+
+
+def _fetch_hop(url: str, timeout: float, limiter) -> Hop:
+    send = limiter.request if limiter is not None else http_client.request
+    start = time.perf_counter()
+    method = 'HEAD'
+    try:
+        response = send('HEAD', url, allow_redirects=False, timeout=timeout)
+        if response.status_code in HEAD_REJECTED_STATUSES:
+            method = 'GET'
+            response = send('GET', url, allow_redirects=False, timeout=timeout, stream=True,
+                            headers={'Range': 'bytes=0-0'})
+            response.close()
+    except requests.exceptions.RequestException as e:
+        return Hop(url, "Error", None, time.perf_counter() - start, method, error=str(e))
+
+    location = None
+    if response.status_code in REDIRECT_STATUSES and response.headers.get('Location'):
+        location = urljoin(url, response.headers['Location'])
+    return Hop(url, response.status_code, location, time.perf_counter() - start, method)
+
+
+class RedirectResolver:
+    def __init__(self, max_hops: int = DEFAULT_MAX_HOPS, fetch: Callable[[str], Hop] = fetch_hop):
+        self.max_hops = max_hops
+        self._fetch = fetch
+        self._memo: Dict[str, Hop] = {}
+        self._in_flight: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.memo_hits = 0
+
+    def hop(self, url: str) -> Hop:
+        """
+        Memoized single hop; concurrent callers for the same URL share one request.
+        """
+        while True:
+            with self._lock:
+                if url in self._memo:
+                    self.memo_hits += 1
+                    return self._memo[url]
+                event = self._in_flight.get(url)
+                if event is None:
+                    event = self._in_flight[url] = threading.Event()
+                    self.requests += 1
+                    break
+            event.wait()
+
+        try:
+            result = self._fetch(url)
+            with self._lock:
+                self._memo[url] = result
+            return result
+        finally:
+            with self._lock:
+                del self._in_flight[url]
+            event.set()
+
+    def resolve(self, url: str) -> Resolution:
+        hops = []
+        seen = set()
+        current = url
+        while True:
+            hop = self.hop(current)
+            hops.append(hop)
+            seen.add(current)
+            if hop.location is None:
+                return Resolution(url, hops)
+            if hop.location in seen:
+                return Resolution(url, hops, LOOP)
+            if len(hops) > self.max_hops:
+                return Resolution(url, hops, TOO_MANY_REDIRECTS)
+            current = hop.location
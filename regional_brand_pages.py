@@ -0,0 +1,80 @@
+import streamlit as st
+
+import cn_brand_pages
+import locales
+import regional_sitemaps
+import status_code_Main
+
+# Brand explorer across every regional sitemap: browse any one region, or
+# compare a brand's page counts between regions.
+
+
+def load_regions(force_refresh=False):
+    """
+    Load all regional sitemaps concurrently with a progress bar.
+    """
+    locale_codes = locales.ALL_LOCALES
+    progress = st.progress(0.0, text=f"Loading {len(locale_codes)} regional sitemaps...")
+    loads = {}
+    errors = {}
+    for done, (locale, load, error) in enumerate(
+            regional_sitemaps.iter_region_loads(locale_codes, force_refresh=force_refresh), start=1):
+        if load is not None:
+            loads[locale] = load
+        else:
+            errors[locale] = error
+        progress.progress(done / len(locale_codes), text=f"{done}/{len(locale_codes)} sitemaps · {locale}")
+    progress.empty()
+    st.session_state.regional_index = regional_sitemaps.build_index(loads, errors)
+
+
+def main():
+    st.title("🌍 Regional Brand Pages")
+
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        load = st.button("Load regional sitemaps" if "regional_index" not in st.session_state else "Reload")
+    with col2:
+        force_refresh = st.checkbox("Revalidate cached sitemaps now", value=False)
+    if load:
+        load_regions(force_refresh)
+
+    index = st.session_state.get("regional_index")
+    if index is None:
+        st.info(f"Loads the sitemaps of all {len(locales.ALL_LOCALES)} locales in parallel (cached sitemaps are reused).")
+        return
+
+    st.caption(f"{len(index.locales)} regions loaded · "
+               f"{sum(len(index.index(locale)) for locale in index.locales)} URLs")
+    if index.errors:
+        st.warning("\n\n".join(f"{locale}: {error}" for locale, error in sorted(index.errors.items())))
+    if not index.locales:
+        return
+
+    explore, compare = st.tabs(["Explore a region", "Compare regions"])
+    with explore:
+        locale = st.selectbox("Region", index.locales, key="regional_locale")
+        path_index = index.index(locale)
+        brand_names = path_index.children(pages_only=True)
+        brand = st.selectbox("Select a Brand", brand_names, key="regional_brand",
+                             format_func=lambda name: f"{name} ({path_index.count([name])})")
+        if brand:
+            selected_path = cn_brand_pages.select_sub_path(path_index, brand, key_prefix=f"regional_{locale}")
+            urls = path_index.urls_under(selected_path)
+            st.subheader(f"URLs for {locale}/{'/'.join(selected_path)} ({len(urls)})")
+            st.text_area("Related URLs", value="\n".join(urls), height=300, key="regional_urls")
+            status_code_Main.show_export(lambda: ([url] for url in path_index.iter_urls_under(selected_path)),
+                                         ["url"], f"{locale}_{'_'.join(selected_path)}", key="regional_export",
+                                         source=(locale, tuple(selected_path)))
+
+    with compare:
+        brand = st.selectbox("Brand", index.brands(), key="regional_compare_brand")
+        if brand:
+            rows = index.compare([brand])
+            missing = [row["locale"] for row in rows if not row["count"]]
+            st.dataframe(rows, use_container_width=True, height=400)
+            st.bar_chart(rows, x="locale", y="count")
+            if missing:
+                st.write(f"No {brand} pages in: {', '.join(missing)}")
+            status_code_Main.show_export(lambda: rows, ["locale", "region", "count"], f"{brand}_by_region",
+                                         key="regional_compare_export", source=brand)
@@ -0,0 +1,141 @@
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import locales
+import sitemap_cache
+from path_index import PathIndex
+
+# Multi-region sitemap aggregation. Every locale's sitemap is loaded through
+# the shared sitemap cache concurrently (so 30+ sitemaps take about as long as
+# the slowest one), then all URLs are merged into one index keyed by
+# (locale, path): each URL is filed under the locale whose base URL it falls
+# in, whichever sitemap listed it, and duplicates are dropped.
+
+DEFAULT_MAX_WORKERS = 8
+
+_merged = {}
+_merged_lock = threading.Lock()
+
+
+def iter_region_loads(locale_codes: Sequence[str] = None, max_workers: int = DEFAULT_MAX_WORKERS,
+                      ttl: float = sitemap_cache.DEFAULT_TTL, force_refresh: bool = False
+                      ) -> Iterator[Tuple[str, Optional[sitemap_cache.SitemapLoad], Optional[str]]]:
+    """
+    Load the sitemaps of locale_codes (default: every locale) concurrently,
+    yielding (locale, load, error) as each finishes; load is None on failure.
+    """
+    locale_codes = list(locale_codes or locales.ALL_LOCALES)
+
+    def load(locale):
+        sitemap_url, _ = sitemap_cache.sitemap_for_locale(locale)
+        return sitemap_cache.load_sitemap(sitemap_url, ttl=ttl, force_refresh=force_refresh)
+
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    try:
+        futures = {executor.submit(load, locale): locale for locale in locale_codes}
+        for future in as_completed(futures):
+            locale = futures[future]
+            try:
+                yield locale, future.result(), None
+            except Exception as e:
+                yield locale, None, f"{type(e).__name__}: {e}"
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+class RegionalIndex:
+    def __init__(self, loads: Dict[str, sitemap_cache.SitemapLoad], errors: Optional[Dict[str, str]] = None):
+        self.loads = loads
+        self.errors = dict(errors or {})
+        self.base_urls = {locale: sitemap_cache.sitemap_for_locale(locale)[1] for locale in loads}
+        owners = {base_url: locale for locale, base_url in self.base_urls.items()}
+
+        urls_by_locale = defaultdict(list)
+        for load in loads.values():
+            for url in load.urls:
+                locale = _owner(url, owners)
+                if locale is not None:
+                    urls_by_locale[locale].append(url)
+        # PathIndex drops duplicates, so each (locale, path) appears once
+        self._indexes = {locale: PathIndex(urls_by_locale[locale], base_url)
+                         for locale, base_url in self.base_urls.items()}
+
+    @property
+    def locales(self) -> List[str]:
+        return [locale for locale in locales.ALL_LOCALES if locale in self._indexes] + sorted(
+            locale for locale in self._indexes if locale not in locales.ALL_LOCALES)
+
+    def index(self, locale: str) -> PathIndex:
+        return self._indexes[locale]
+
+    def count(self, locale: str, path=()) -> int:
+        index = self._indexes.get(locale)
+        return 0 if index is None else index.count(path)
+
+    def urls_under(self, locale: str, path=()) -> List[str]:
+        index = self._indexes.get(locale)
+        return [] if index is None else index.urls_under(path)
+
+    def brands(self) -> List[str]:
+        """
+        Top-level sections that are a page in at least one region.
+        """
+        return sorted({brand for index in self._indexes.values() for brand in index.children(pages_only=True)})
+
+    def compare(self, path=()) -> List[Dict]:
+        """
+        URL count under path in every loaded region.
+        """
+        classifier = locales.DEFAULT_CLASSIFIER
+        return [
+            {'locale': locale, 'region': classifier.region(self.base_urls[locale]), 'count': self.count(locale, path)}
+            for locale in self.locales
+        ]
+
+
+def _owner(url: str, owners: Dict[str, str]) -> Optional[str]:
+    # Try the site root (www.nvidia.cn/) and then the first path segment (www.nvidia.com/de-de/)
+    host_end = url.find('/', url.find('//') + 2)
+    if host_end < 0:
+        return None
+    locale = owners.get(url[:host_end + 1])
+    if locale is None:
+        segment_end = url.find('/', host_end + 1)
+        if segment_end > 0:
+            locale = owners.get(url[:segment_end + 1])
+    return locale
+
+
+def build_index(loads: Dict[str, sitemap_cache.SitemapLoad], errors: Optional[Dict[str, str]] = None) -> RegionalIndex:
+    """
+    Merge loaded sitemaps into a RegionalIndex. The last merge is kept and
+    reused while the same sitemap cache entries are current.
+    """
+    key = tuple(sorted((locale, id(load.entry)) for locale, load in loads.items()))
+    with _merged_lock:
+        index = _merged.get(key)
+        if index is None:
+            index = RegionalIndex(loads, errors)
+            _merged.clear()
+            _merged[key] = index
+        else:
+            index.errors = dict(errors or {})
+        return index
+
+
+def load_regions(locale_codes: Sequence[str] = None, max_workers: int = DEFAULT_MAX_WORKERS,
+                 ttl: float = sitemap_cache.DEFAULT_TTL, force_refresh: bool = False) -> RegionalIndex:
+    """
+    Load every regional sitemap concurrently and return the merged index.
+    Regions whose sitemap failed to load are listed in its errors.
+    """
+    loads = {}
+    errors = {}
+    for locale, load, error in iter_region_loads(locale_codes, max_workers, ttl, force_refresh):
+        if load is not None:
+            loads[locale] = load
+        else:
+            errors[locale] = error
+    return build_index(loads, errors)
@@ -0,0 +1,305 @@
+import heapq
+import itertools
+import json
+import random
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+import http_client
+
+# Per-request timing. A TimingCollector sends requests through http_client and
+# records, for each one: time queued behind our own rate limits, DNS lookup,
+# TCP connect and TLS handshake (zero on a reused keep-alive connection),
+# time to first byte, body transfer time and bytes read. The aggregates show
+# whether a slow audit is spent on our side, in DNS, or waiting on an origin.
+# Requests another run sent for us (single_flight) are recorded as shared
+# copies of that run's timings.
+#
+# A sitemap-wide audit sends hundreds of thousands of requests, so timings
+# are not all kept: counts, sums, the histogram, errors and the slowest
+# requests are running aggregates, and latency percentiles and the exported
+# per-request list come from bounded random samples (exact until they fill).
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open.
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+SLOWEST_COUNT = 20
+# Requests kept for the per-request export, and latencies kept per host for percentiles
+SAMPLE_SIZE = 10_000
+HOST_SAMPLE_SIZE = 5_000
+PHASES = ('wait', 'dns', 'connect', 'tls', 'ttfb', 'transfer')
+
+
+class RequestTiming:
+    """
+    Seconds spent in each phase of one request. ttfb is derived from
+    response.elapsed, which requests measures from before the connection is
+    set up; the measured dns, connect and tls times are subtracted, but any
+    setup they do not cover (waiting for a pooled connection, a proxy) stays
+    in ttfb.
+    """
+    __slots__ = ('url', 'method', 'status', 'error', 'wait', 'dns', 'connect', 'tls', 'ttfb', 'transfer',
+                 'total', 'bytes', 'new_connections', 'shared')
+
+    def __init__(self, url: str, method: str, wait: float = 0.0):
+        self.url = url
+        self.method = method
+        self.status: Optional[int] = None
+        self.error: Optional[str] = None
+        self.wait = wait
+        self.dns = self.connect = self.tls = self.ttfb = self.transfer = self.total = 0.0
+        self.bytes = 0
+        self.new_connections = 0
+        self.shared = False
+
+    def shared_copy(self) -> 'RequestTiming':
+        """
+        This timing, as recorded by a run whose request it answered.
+        """
+        timing = RequestTiming(self.url, self.method)
+        for slot in self.__slots__:
+            setattr(timing, slot, getattr(self, slot))
+        timing.shared = True
+        return timing
+
+    @property
+    def host(self) -> str:
+        return urlsplit(self.url).netloc.lower()
+
+    @property
+    def outcome(self) -> Optional[str]:
+        """
+        Error category: the exception type, 'HTTP <status>' for 4xx/5xx, or None.
+        """
+        if self.error:
+            return self.error
+        if self.status is not None and self.status >= 400:
+            return f"HTTP {self.status}"
+        return None
+
+    def to_dict(self) -> Dict:
+        row = {'url': self.url, 'host': self.host, 'method': self.method, 'status': self.status,
+               'error': self.error}
+        row.update({f"{phase}_ms": round(getattr(self, phase) * 1000, 2) for phase in PHASES})
+        row['total_ms'] = round(self.total * 1000, 2)
+        row['bytes'] = self.bytes
+        row['new_connections'] = self.new_connections
+        row['shared'] = self.shared
+        return row
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _bucket(total: float) -> int:
+    ms = total * 1000
+    return next((i for i, bound in enumerate(LATENCY_BUCKETS_MS) if ms <= bound), len(LATENCY_BUCKETS_MS))
+
+
+def _sample(sample: List, seen: int, item, size: int):
+    # Reservoir sampling: after seen items, each is in the sample with equal probability
+    if len(sample) < size:
+        sample.append(item)
+    else:
+        slot = random.randrange(seen)
+        if slot < size:
+            sample[slot] = item
+
+
+class _HostTimings:
+    __slots__ = ('requests', 'shared', 'errors', 'new_connections', 'opened', 'setup', 'bytes', 'buckets',
+                 'latencies')
+
+    def __init__(self):
+        self.requests = self.shared = self.errors = self.new_connections = self.opened = self.bytes = 0
+        # Summed over requests that opened a connection
+        self.setup = {'dns': 0.0, 'connect': 0.0, 'tls': 0.0}
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        # Sampled (total, ttfb) pairs
+        self.latencies: List = []
+
+
+class TimingCollector:
+    def __init__(self):
+        # Random sample of the requests, for the per-request export
+        self.sample: List[RequestTiming] = []
+        self.requests = 0
+        self._phase_totals = dict.fromkeys(PHASES, 0.0)
+        self._hosts: Dict[str, _HostTimings] = {}
+        self._errors = Counter()
+        # Min-heap of (total, seq, timing): the SLOWEST_COUNT slowest requests
+        self._slowest: List = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def record(self, timing: RequestTiming):
+        host_name = timing.host
+        outcome = timing.outcome
+        with self._lock:
+            self.requests += 1
+            for phase in PHASES:
+                self._phase_totals[phase] += getattr(timing, phase)
+            host = self._hosts.get(host_name)
+            if host is None:
+                host = self._hosts[host_name] = _HostTimings()
+            host.requests += 1
+            host.shared += timing.shared
+            host.new_connections += timing.new_connections
+            host.bytes += timing.bytes
+            if timing.new_connections:
+                host.opened += 1
+                for phase in host.setup:
+                    host.setup[phase] += getattr(timing, phase)
+            host.buckets[_bucket(timing.total)] += 1
+            _sample(host.latencies, host.requests, (timing.total, timing.ttfb), HOST_SAMPLE_SIZE)
+            if outcome:
+                host.errors += 1
+                self._errors[host_name, outcome] += 1
+            entry = (timing.total, next(self._seq), timing)
+            if len(self._slowest) < SLOWEST_COUNT:
+                heapq.heappush(self._slowest, entry)
+            elif entry > self._slowest[0]:
+                heapq.heapreplace(self._slowest, entry)
+            _sample(self.sample, self.requests, timing, SAMPLE_SIZE)
+
+    def last(self) -> Optional[RequestTiming]:
+        """
+        The timing of the last request this thread sent through request();
+        complete once its response is closed.
+        """
+        return getattr(self._local, 'timing', None)
+
+    def request(self, method: str, url: str, wait: float = 0.0, **kwargs):
+        """
+        http_client.request, timed. A streamed response is recorded when it is
+        closed, so its transfer time and bytes cover what the caller read.
+        """
+        timing = self._local.timing = RequestTiming(url, method, wait)
+        http_client.connection_phases()
+        start = time.perf_counter()
+        try:
+            response = http_client.request(method, url, **kwargs)
+        except requests.RequestException as e:
+            timing.error = type(e).__name__
+            self._set_phases(timing)
+            self._finish(timing, start, None)
+            raise
+        self._set_phases(timing)
+        timing.status = response.status_code
+        # response.elapsed runs from sending the request to parsing the headers
+        timing.ttfb = max(0.0, response.elapsed.total_seconds() - timing.dns - timing.connect - timing.tls)
+
+        if not kwargs.get('stream'):
+            self._finish(timing, start, response)
+            return response
+
+        close = response.close
+        closed = []
+
+        def close_and_record():
+            if not closed:
+                closed.append(True)
+                self._finish(timing, start, response)
+            close()
+
+        response.close = close_and_record
+        return response
+
+    @staticmethod
+    def _set_phases(timing):
+        phases = http_client.connection_phases()
+        timing.dns = phases['dns']
+        timing.connect = phases['connect']
+        timing.tls = phases['tls']
+        timing.new_connections = int(phases['new_connections'])
+
+    def _finish(self, timing, start, response):
+        timing.total = time.perf_counter() - start
+        if response is not None:
+            timing.transfer = max(0.0, timing.total - response.elapsed.total_seconds())
+            # Bytes read off the wire (compressed size when gzip-encoded)
+            timing.bytes = response.raw.tell() if hasattr(response.raw, 'tell') else 0
+        self.record(timing)
+
+    def phase_totals(self) -> Dict[str, float]:
+        """
+        Seconds spent in each phase, summed over all requests.
+        """
+        with self._lock:
+            return {phase: round(total, 3) for phase, total in self._phase_totals.items()}
+
+    def hosts(self) -> List[Dict]:
+        """
+        Per-host request counts, latency percentiles (ms) and mean connection setup times.
+        """
+        rows = []
+        with self._lock:
+            for name, host in self._hosts.items():
+                totals = sorted(total for total, _ in host.latencies)
+                ttfbs = sorted(ttfb for _, ttfb in host.latencies)
+                row = {
+                    'host': name,
+                    'requests': host.requests,
+                    'shared': host.shared,
+                    'errors': host.errors,
+                    'new_connections': host.new_connections,
+                    'p50_ms': round(_percentile(totals, 0.50) * 1000, 1),
+                    'p90_ms': round(_percentile(totals, 0.90) * 1000, 1),
+                    'p99_ms': round(_percentile(totals, 0.99) * 1000, 1),
+                    'ttfb_p50_ms': round(_percentile(ttfbs, 0.50) * 1000, 1),
+                }
+                for phase, total in host.setup.items():
+                    row[f"mean_{phase}_ms"] = round(total / host.opened * 1000, 1) if host.opened else 0.0
+                row['bytes'] = host.bytes
+                rows.append(row)
+        rows.sort(key=lambda row: row['p90_ms'], reverse=True)
+        return rows
+
+    def histogram(self) -> List[Dict]:
+        """
+        Per-host request counts by total latency bucket.
+        """
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        with self._lock:
+            return [dict(host=name, **dict(zip(labels, host.buckets))) for name, host in self._hosts.items()]
+
+    def errors(self) -> List[Dict]:
+        """
+        Failed requests grouped by host and error category.
+        """
+        with self._lock:
+            counts = self._errors.most_common()
+        return [{'host': host, 'error': outcome, 'count': count} for (host, outcome), count in counts]
+
+    def slowest(self, count: int = SLOWEST_COUNT) -> List[Dict]:
+        with self._lock:
+            timings = sorted(self._slowest, reverse=True)[:count]
+        return [timing.to_dict() for _, _, timing in timings]
+
+    def to_dict(self) -> Dict:
+        """
+        Every aggregate, plus 'timings': the sampled requests (all of them
+        up to SAMPLE_SIZE).
+        """
+        with self._lock:
+            sample = list(self.sample)
+        return {
+            'requests': self.requests,
+            'phase_totals_s': self.phase_totals(),
+            'hosts': self.hosts(),
+            'histogram': self.histogram(),
+            'errors': self.errors(),
+            'slowest': self.slowest(),
+            'timings': [timing.to_dict() for timing in sample],
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
@@ -0,0 +1,209 @@
+import csv
+import io
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Sequence
+
+# Streaming export of tabular results to CSV, XLSX and Parquet. Rows are
+# consumed from any iterable (dicts keyed by field, or sequences in field
+# order) and written out in chunks, so a million-row audit is never held in
+# memory as a whole a second time: CSV is written CHUNK_ROWS rows at a time,
+# XLSX through openpyxl's write-only mode, and Parquet one row group per
+# chunk through a pandas frame. The UI exports into an in-memory buffer held
+# in the session (st.download_button keeps the bytes in memory regardless),
+# so nothing is left on disk when a session or tab goes away.
+#
+# openpyxl (XLSX) and pyarrow (Parquet) are dependencies of the app, listed
+# in requirements.txt, so every format is always offered. Both are imported
+# only when their format is written, which keeps the CLI's startup fast.
+
+CHUNK_ROWS = 10_000
+# Rows per worksheet, the header row included; longer exports continue on a new sheet
+XLSX_MAX_ROWS = 1_048_576
+
+FORMATS = {
+    'CSV': ('.csv', 'text/csv'),
+    'XLSX': ('.xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    'Parquet': ('.parquet', 'application/vnd.apache.parquet'),
+}
+
+
+class ExportError(Exception):
+    pass
+
+
+def format_for_path(path: str) -> Optional[str]:
+    extension = os.path.splitext(path)[1].lower()
+    for fmt, (fmt_extension, _) in FORMATS.items():
+        if extension == fmt_extension:
+            return fmt
+    return None
+
+
+def _values(row, fields: Sequence[str]) -> List:
+    if isinstance(row, dict):
+        return [row.get(field) for field in fields]
+    return list(row)
+
+
+def _chunks(rows: Iterable, fields: Sequence[str]) -> Iterable[List[List]]:
+    chunk = []
+    for row in rows:
+        chunk.append(_values(row, fields))
+        if len(chunk) >= CHUNK_ROWS:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class RowWriter:
+    """
+    Incremental writer to a binary file object; write() rows, then close().
+    """
+
+    def __init__(self, fileobj, fields: Sequence[str]):
+        self.fileobj = fileobj
+        self.fields = list(fields)
+        self.rows = 0
+        self._pending: List[List] = []
+
+    def write(self, row):
+        self._pending.append(_values(row, self.fields))
+        self.rows += 1
+        if len(self._pending) >= CHUNK_ROWS:
+            self._flush()
+
+    def write_many(self, rows: Iterable):
+        for chunk in _chunks(rows, self.fields):
+            self._pending.extend(chunk)
+            self.rows += len(chunk)
+            self._flush()
+
+    def _flush(self):
+        if self._pending:
+            self._write_chunk(self._pending)
+            self._pending = []
+
+    def _write_chunk(self, chunk: List[List]):
+        raise NotImplementedError
+
+    def close(self):
+        self._flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CSVRowWriter(RowWriter):
+    def __init__(self, fileobj, fields: Sequence[str]):
+        super().__init__(fileobj, fields)
+        self._text = io.TextIOWrapper(fileobj, encoding='utf-8', newline='', write_through=True)
+        self._writer = csv.writer(self._text)
+        self._writer.writerow(self.fields)
+
+    def _write_chunk(self, chunk):
+        self._writer.writerows(['' if value is None else value for value in values] for values in chunk)
+
+    def close(self):
+        super().close()
+        self._text.flush()
+        self._text.detach()
+
+
+# Control characters openpyxl refuses to write into a cell
+_ILLEGAL_XLSX_CHARACTERS = re.compile(r'[\000-\010]|[\013-\014]|[\016-\037]')
+
+
+def _xlsx_value(value):
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if not isinstance(value, str):
+        value = str(value)
+    return _ILLEGAL_XLSX_CHARACTERS.sub('', value)
+
+
+class XLSXRowWriter(RowWriter):
+    def __init__(self, fileobj, fields: Sequence[str]):
+        super().__init__(fileobj, fields)
+        try:
+            from openpyxl import Workbook
+        except ImportError as e:
+            raise ExportError("XLSX export needs openpyxl") from e
+        self._workbook = Workbook(write_only=True)
+        self._sheet = None
+        self._sheet_rows = 0
+
+    def _new_sheet(self):
+        self._sheet = self._workbook.create_sheet(f"Results {len(self._workbook.worksheets) + 1}"
+                                                  if self._workbook.worksheets else "Results")
+        self._sheet.append(self.fields)
+        self._sheet_rows = 1
+
+    def _write_chunk(self, chunk):
+        for values in chunk:
+            if self._sheet is None or self._sheet_rows >= XLSX_MAX_ROWS:
+                self._new_sheet()
+            self._sheet.append([_xlsx_value(value) for value in values])
+            self._sheet_rows += 1
+
+    def close(self):
+        super().close()
+        if self._sheet is None:
+            self._new_sheet()
+        self._workbook.save(self.fileobj)
+
+
+class ParquetRowWriter(RowWriter):
+    def __init__(self, fileobj, fields: Sequence[str]):
+        super().__init__(fileobj, fields)
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ExportError("Parquet export needs pyarrow (pip install -r requirements.txt)") from e
+        self._pa = pa
+        # Every column is written as text: result columns mix codes and labels ("200", "Error")
+        self._schema = pa.schema([(field, pa.string()) for field in self.fields])
+        self._writer = pq.ParquetWriter(fileobj, self._schema, compression='snappy')
+
+    def _write_chunk(self, chunk):
+        import pandas as pd
+        frame = pd.DataFrame(chunk, columns=self.fields, dtype=object)
+        frame = frame.astype(str).where(frame.notna(), None)
+        self._writer.write_table(self._pa.Table.from_pandas(frame, schema=self._schema, preserve_index=False))
+
+    def close(self):
+        super().close()
+        self._writer.close()
+
+
+WRITERS = {'CSV': CSVRowWriter, 'XLSX': XLSXRowWriter, 'Parquet': ParquetRowWriter}
+
+
+def open_writer(fmt: str, fileobj, fields: Sequence[str]) -> RowWriter:
+    if fmt not in WRITERS:
+        raise ExportError(f"Unknown export format: {fmt}")
+    return WRITERS[fmt](fileobj, fields)
+
+
+def export_rows(rows: Iterable, fields: Sequence[str], fmt: str, fileobj) -> int:
+    """
+    Write rows to a binary file object in fmt; returns the number of rows.
+    """
+    with open_writer(fmt, fileobj, fields) as writer:
+        writer.write_many(rows)
+    return writer.rows
+
+
+def export_to_bytes(rows: Iterable, fields: Sequence[str], fmt: str) -> Dict:
+    """
+    Export rows into memory. Returns {'data', 'rows', 'bytes', 'format'}.
+    """
+    buffer = io.BytesIO()
+    count = export_rows(rows, fields, fmt, buffer)
+    data = buffer.getvalue()
+    return {'data': data, 'rows': count, 'bytes': len(data), 'format': fmt}
@@ -0,0 +1,131 @@
+import contextlib
+import threading
+from typing import Callable, Dict, Hashable, List
+
+import rate_limit
+
+# Process-wide request coalescing. On a shared deployment several sessions
+# often ask for the same URL at the same moment (overlapping audit lists, the
+# same brand page); a SingleFlight lets the first caller for a key do the
+# work while concurrent callers for that key wait and receive its result (or
+# its exception). Nothing is kept once the call returns: caching is left to
+# status_cache and sitemap_cache, this only merges calls that overlap.
+#
+# Each fetch function owns a named group from group(); stats() reports how
+# many calls every group saw and how many of them were coalesced.
+#
+# Fetches made through a rate_limit.RateLimiter use request(). A coalesced
+# caller's limiter (and its TimingCollector) then records the requests the
+# first caller sent, as rate_limit.RateLimiter.replay describes: its host
+# state adapts to their responses, throttled ones appear in its events and
+# their timings in its stats, all marked shared. A caller also waits as long
+# as the request it joined, Retry-After pauses and retries included; those
+# pauses show up among its own events. Requests sent without a limiter are
+# not recorded.
+
+_groups: Dict[str, 'SingleFlight'] = {}
+_groups_lock = threading.Lock()
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'waiters', 'limiter', 'records')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+        self.limiter = None
+        self.records: List[Dict] = []
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs):
+        """
+        Return fn(*args, **kwargs), sharing the result with every concurrent
+        caller of the same key; only the first of them runs fn.
+        """
+        return self._do(key, None, fn, args, kwargs)
+
+    def request(self, key: Hashable, limiter, fn: Callable, *args):
+        """
+        do() for a fetch sent through limiter, a rate_limit.RateLimiter or
+        None: returns fn(*args, limiter). A caller that joins another's call
+        replays that call's requests into its own limiter.
+        """
+        return self._do(key, limiter, fn, args + (limiter,), {})
+
+    def _do(self, key: Hashable, limiter, fn: Callable, args, kwargs):
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if limiter is not None and limiter is not call.limiter:
+                limiter.replay(call.records)
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        call.limiter = limiter
+        try:
+            with rate_limit.recording() if limiter is not None else contextlib.nullcontext([]) as call.records:
+                call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict:
+        return {'group': self.name, 'calls': self.calls, 'network calls': self.executions,
+                'coalesced': self.coalesced, 'in flight': self.in_flight}
+
+
+def group(name: str) -> SingleFlight:
+    """
+    The process-wide SingleFlight named name, created on first use.
+    """
+    with _groups_lock:
+        if name not in _groups:
+            _groups[name] = SingleFlight(name)
+        return _groups[name]
+
+
+def stats() -> List[Dict]:
+    """
+    Counters of every group, for display.
+    """
+    with _groups_lock:
+        groups = list(_groups.values())
+    return [flight.stats() for flight in groups]
+
+
+def total_coalesced() -> int:
+    with _groups_lock:
+        return sum(flight.coalesced for flight in _groups.values())
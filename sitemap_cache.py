@@ -0,0 +1,188 @@
+import gzip
+import hashlib
+import json
+import threading
+import time
+
+import http_client
+import single_flight
+import sitemap_parser
+from path_index import PathIndex
+from storage import data_path, atomic_write
+from url_store import URLStore
+
+# Process-wide sitemap cache shared by every Streamlit session. Entries live
+# in memory and on disk; once older than the TTL they are revalidated with a
+# conditional GET (ETag / Last-Modified), so an unchanged sitemap costs a 304
+# instead of a full download and parse. URLs are held in a compact URLStore,
+# so every session reads the same front-coded copy instead of its own list.
+
+DEFAULT_TTL = 60 * 60
+
+# Sitemaps the toolkit knows by name: locale -> (sitemap URL, base URL of its pages).
+KNOWN_SITEMAPS = {
+    'en-us': ('https://www.nvidia.com/en-us/en-us.sitemap.xml', 'https://www.nvidia.com/en-us/'),
+    'zh-cn': ('https://www.nvidia.cn/zh-cn.sitemap.xml', 'https://www.nvidia.cn/'),
+}
+
+# Every other locale publishes its sitemap the same way as en-us.
+REGIONAL_SITEMAP_URL = 'https://www.nvidia.com/{locale}/{locale}.sitemap.xml'
+REGIONAL_BASE_URL = 'https://www.nvidia.com/{locale}/'
+
+_entries = {}
+_entries_lock = threading.Lock()
+_url_locks = {}
+_load_flight = single_flight.group('sitemap load')
+
+
+class CachedSitemap:
+    def __init__(self, sitemap_url, urls, fetched_at, etag=None, last_modified=None):
+        self.sitemap_url = sitemap_url
+        self.urls = urls if isinstance(urls, URLStore) else URLStore(urls)
+        self.fetched_at = fetched_at
+        self.etag = etag
+        self.last_modified = last_modified
+        self._indexes = {}
+        self._index_lock = threading.Lock()
+
+    def path_index(self, base_url):
+        """
+        Path index over these URLs, built once per sitemap load and shared.
+        """
+        with self._index_lock:
+            index = self._indexes.get(base_url)
+            if index is None:
+                index = self._indexes[base_url] = PathIndex(self.urls, base_url)
+            return index
+
+
+class SitemapLoad:
+    """
+    Result of load_sitemap: the URLs plus how they were obtained.
+    status is one of 'hit', 'revalidated', 'miss' or 'stale'.
+    """
+
+    def __init__(self, entry, status):
+        self.entry = entry
+        self.status = status
+
+    @property
+    def urls(self):
+        return self.entry.urls
+
+    @property
+    def age_seconds(self):
+        return max(0.0, time.time() - self.entry.fetched_at)
+
+    def summary(self):
+        age = self.age_seconds
+        if age < 60:
+            age_text = f"{age:.0f}s"
+        elif age < 3600:
+            age_text = f"{age / 60:.0f} min"
+        else:
+            age_text = f"{age / 3600:.1f} h"
+        return f"Sitemap cache {self.status} · {len(self.urls)} URLs · {age_text} old"
+
+
+def sitemap_for_locale(locale):
+    """
+    (sitemap URL, base URL of its pages) for a locale code such as 'de-de'.
+    """
+    if locale in KNOWN_SITEMAPS:
+        return KNOWN_SITEMAPS[locale]
+    return REGIONAL_SITEMAP_URL.format(locale=locale), REGIONAL_BASE_URL.format(locale=locale)
+
+
+def _key(sitemap_url):
+    return hashlib.sha1(sitemap_url.encode('utf-8')).hexdigest()
+
+
+def _meta_path(sitemap_url):
+    return data_path('sitemaps', f"{_key(sitemap_url)}.json")
+
+
+def _urls_path(sitemap_url):
+    return data_path('sitemaps', f"{_key(sitemap_url)}.txt.gz")
+
+
+def _write_meta(entry):
+    meta = {
+        'sitemap_url': entry.sitemap_url,
+        'fetched_at': entry.fetched_at,
+        'etag': entry.etag,
+        'last_modified': entry.last_modified,
+        'count': len(entry.urls),
+    }
+    atomic_write(_meta_path(entry.sitemap_url), json.dumps(meta).encode('utf-8'))
+
+
+def _write_disk(entry):
+    atomic_write(_urls_path(entry.sitemap_url), gzip.compress('\n'.join(entry.urls).encode('utf-8'), compresslevel=5))
+    _write_meta(entry)
+
+
+def _read_disk(sitemap_url):
+    try:
+        with open(_meta_path(sitemap_url), 'rb') as f:
+            meta = json.load(f)
+        with gzip.open(_urls_path(sitemap_url), 'rt', encoding='utf-8') as f:
+            urls = URLStore(line.rstrip('\n') for line in f)
+    except (OSError, ValueError):
+        return None
+    return CachedSitemap(sitemap_url, urls, meta['fetched_at'], meta.get('etag'), meta.get('last_modified'))
+
+
+def _url_lock(sitemap_url):
+    with _entries_lock:
+        return _url_locks.setdefault(sitemap_url, threading.Lock())
+
+
+def load_sitemap(sitemap_url, ttl=DEFAULT_TTL, force_refresh=False):
+    """
+    Return a SitemapLoad for sitemap_url, using the memory/disk cache when fresh
+    and a conditional GET when stale. Raises if nothing is cached and the fetch fails.
+    Concurrent identical loads (e.g. several sessions opening the same brand
+    page) share one load.
+    """
+    return _load_flight.do((sitemap_url, ttl, force_refresh), _load_sitemap, sitemap_url, ttl, force_refresh)
+
+
+def _load_sitemap(sitemap_url, ttl, force_refresh):
+    with _url_lock(sitemap_url):
+        entry = _entries.get(sitemap_url)
+        if entry is None:
+            entry = _read_disk(sitemap_url)
+            if entry is not None:
+                _entries[sitemap_url] = entry
+
+        if entry is not None and not force_refresh and time.time() - entry.fetched_at < ttl:
+            return SitemapLoad(entry, 'hit')
+
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+
+        try:
+            response = http_client.get(sitemap_url, stream=True, headers=headers)
+            if response.status_code == 304 and entry is not None:
+                response.close()
+                entry.fetched_at = time.time()
+                _write_meta(entry)
+                return SitemapLoad(entry, 'revalidated')
+            response.raise_for_status()
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            urls = URLStore(sitemap_parser.iter_response_urls(response))
+        except Exception:
+            if entry is None:
+                raise
+            return SitemapLoad(entry, 'stale')
+
+        entry = CachedSitemap(sitemap_url, urls, time.time(), etag, last_modified)
+        _entries[sitemap_url] = entry
+        _write_disk(entry)
+        return SitemapLoad(entry, 'miss')
@@ -0,0 +1,85 @@
+from typing import List, Optional, Tuple
+
+import streamlit as st
+
+import sitemap_snapshot
+import status_code_Main
+
+# Incremental audits: pick two snapshots of a sitemap and audit only the URLs
+# that were added or whose <lastmod> changed between them.
+
+ENTERED_URLS = "Entered URLs"
+CHANGED_URLS = "Changed URLs from sitemap snapshots"
+
+
+def select_diff(key_prefix: str) -> Tuple[Optional[sitemap_snapshot.SitemapDiff], str]:
+    """
+    Choose a sitemap and two of its snapshots (a new one can be taken here).
+    Returns (diff or None, sitemap name).
+    """
+    names = list(sitemap_snapshot.SNAPSHOT_SITEMAPS)
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        name = st.selectbox("Sitemap", names, key=f"{key_prefix}_sitemap")
+    with col2:
+        st.write("")
+        if st.button("Take snapshot now", key=f"{key_prefix}_take"):
+            with st.spinner(f"Fetching the {name} sitemap..."):
+                try:
+                    sitemap_snapshot.take_snapshot(name)
+                except Exception as e:
+                    st.error(f"Error fetching sitemap: {e}")
+
+    snapshots = sitemap_snapshot.list_snapshots(name)
+    if len(snapshots) < 2:
+        st.info(f"{len(snapshots)} snapshot(s) of the {name} sitemap. Take one now and another "
+                "after the next release to see what changed.")
+        return None, name
+
+    newest_first = snapshots[::-1]
+    col1, col2 = st.columns(2)
+    with col1:
+        newer = st.selectbox("Newer snapshot", newest_first, format_func=lambda s: s.label,
+                             key=f"{key_prefix}_newer")
+    with col2:
+        older_options = [snapshot for snapshot in newest_first if snapshot.taken_at < newer.taken_at]
+        if not older_options:
+            st.info("No older snapshot to compare with.")
+            return None, name
+        older = st.selectbox("Older snapshot", older_options, format_func=lambda s: s.label,
+                             key=f"{key_prefix}_older")
+    return sitemap_snapshot.diff_snapshots(older, newer), name
+
+
+def changed_urls_input(key_prefix: str) -> Optional[List[str]]:
+    """
+    Let a tool audit either entered URLs or only the changed URLs of a sitemap.
+    Returns None when the user chose to enter URLs, else the changed URLs.
+    """
+    source = st.radio("URLs to audit", [ENTERED_URLS, CHANGED_URLS], horizontal=True, key=f"{key_prefix}_source")
+    if source == ENTERED_URLS:
+        return None
+    diff, _ = select_diff(key_prefix)
+    if diff is None:
+        return []
+    urls = diff.audit_urls
+    st.write(f"{diff.summary()} · {len(urls)} URLs to audit")
+    return urls
+
+
+def main():
+    st.title("🗂 Sitemap Changes")
+    st.caption("Compare snapshots of a sitemap. The added and lastmod-changed URLs can be audited on their own "
+               "from the Status Code Checker and Local Page Scraper.")
+
+    diff, name = select_diff("sitemap_changes")
+    if diff is None:
+        return
+
+    st.write(diff.summary())
+    rows = diff.rows()
+    changes = st.multiselect("Show changes", ["added", "removed", "lastmod"], default=["added", "removed", "lastmod"])
+    st.dataframe([row for row in rows if row["change"] in changes], use_container_width=True, height=400)
+
+    status_code_Main.show_export(diff.rows, ["change", "url", "old_lastmod", "new_lastmod"], f"{name}_sitemap_changes",
+                                 key="sitemap_changes_export", source=id(diff))
@@ -0,0 +1,199 @@
+import queue
+import threading
+import xml.etree.ElementTree as ET
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import http_client
+
+# Incremental sitemap parsing. Responses are read in chunks and fed to an
+# XMLPullParser; each <url>/<sitemap> element is dropped from the tree as
+# soon as its <loc> and <lastmod> have been read, so memory does not grow
+# with the size of the document. <sitemapindex> files are followed and their
+# child sitemaps (plain or gzip-compressed) are fetched in parallel; nested
+# indexes (an index of regional indexes) are fanned out to the same workers.
+
+CHUNK_SIZE = 64 * 1024
+DEFAULT_MAX_WORKERS = 8
+# Locs are handed from child-sitemap workers to the consumer in batches; the
+# queue bound caps how far the workers can run ahead of the consumer.
+BATCH_SIZE = 1000
+QUEUE_BATCHES = 16
+# Index levels followed below the top-level sitemap
+MAX_INDEX_DEPTH = 4
+
+_GZIP_MAGIC = b'\x1f\x8b'
+_DONE = object()
+
+
+def _local_name(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def _iter_chunks(response):
+    """
+    Yield decoded body chunks, gunzipping .xml.gz payloads on the fly.
+    Content-Encoding: gzip is already undone by requests.
+    """
+    decompressor = None
+    for chunk in response.iter_content(CHUNK_SIZE):
+        if not chunk:
+            continue
+        if decompressor is None:
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS) if chunk[:2] == _GZIP_MAGIC else False
+        if decompressor:
+            chunk = decompressor.decompress(chunk)
+        if chunk:
+            yield chunk
+    if decompressor:
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+
+
+def iter_sitemap_entries(response):
+    """
+    Yield (kind, loc, lastmod) triples from a single sitemap response as it
+    streams in. kind is 'url' for a <urlset> entry and 'sitemap' for a
+    <sitemapindex> entry; lastmod is None when the entry has no <lastmod>.
+    """
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    root = None
+    kind = 'url'
+    loc = lastmod = None
+    try:
+        for chunk in _iter_chunks(response):
+            parser.feed(chunk)
+            for event, elem in parser.read_events():
+                if event == 'start':
+                    if root is None:
+                        root = elem
+                        kind = 'sitemap' if _local_name(elem.tag) == 'sitemapindex' else 'url'
+                    continue
+                name = _local_name(elem.tag)
+                if name == 'loc':
+                    loc = elem.text.strip() if elem.text else None
+                elif name == 'lastmod':
+                    lastmod = elem.text.strip() if elem.text else None
+                elif name in ('url', 'sitemap'):
+                    if loc:
+                        yield kind, loc, lastmod or None
+                    loc = lastmod = None
+                    # Finished entry: release it and everything read so far.
+                    root.clear()
+        parser.close()
+    finally:
+        response.close()
+
+
+def _open(sitemap_url):
+    response = http_client.get(sitemap_url, stream=True)
+    response.raise_for_status()
+    return response
+
+
+def _iter_children_parallel(child_urls, max_workers):
+    """
+    Yield (loc, lastmod) for the pages of every child sitemap. Each child is
+    parsed by a worker; the children of a nested index are submitted to the
+    same pool, so every level of an index of indexes is fetched in parallel.
+    """
+    out = queue.Queue(maxsize=QUEUE_BATCHES)
+    stop = threading.Event()
+    lock = threading.Lock()
+    seen = set(child_urls)
+    # Sitemaps submitted and not finished yet; nested ones are counted before
+    # their parent finishes, so this only reaches 0 when everything is done.
+    remaining = [len(seen)]
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                out.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def submit(child_url, depth):
+        with lock:
+            if child_url in seen and depth > 1:
+                return  # an index listing itself or an ancestor
+            seen.add(child_url)
+            remaining[0] += depth > 1
+        executor.submit(pump, child_url, depth)
+
+    def pump(child_url, depth):
+        try:
+            batch = []
+            for kind, loc, lastmod in iter_sitemap_entries(_open(child_url)):
+                if stop.is_set():
+                    return
+                if kind == 'sitemap':
+                    if depth >= MAX_INDEX_DEPTH:
+                        raise ValueError(f"Sitemap indexes nested more than {MAX_INDEX_DEPTH} levels deep at {loc}")
+                    submit(loc, depth + 1)
+                    continue
+                batch.append((loc, lastmod))
+                if len(batch) >= BATCH_SIZE:
+                    put(batch)
+                    batch = []
+            if batch:
+                put(batch)
+        except Exception as e:
+            put(e)
+        finally:
+            put(_DONE)
+
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    try:
+        for child_url in dict.fromkeys(child_urls):
+            submit(child_url, 1)
+        while remaining[0]:
+            item = out.get()
+            if item is _DONE:
+                with lock:
+                    remaining[0] -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield from item
+    finally:
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_response_entries(response, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Yield (loc, lastmod) for every page of an already-opened sitemap response.
+    If it is a sitemap index, its children are fetched and parsed in parallel.
+    """
+    child_urls = []
+    for kind, loc, lastmod in iter_sitemap_entries(response):
+        if kind == 'sitemap':
+            child_urls.append(loc)
+        else:
+            yield loc, lastmod
+    if child_urls:
+        yield from _iter_children_parallel(child_urls, max_workers)
+
+
+def iter_response_urls(response, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Yield page URLs from an already-opened sitemap response, following sitemap indexes.
+    """
+    for loc, _ in iter_response_entries(response, max_workers=max_workers):
+        yield loc
+
+
+def iter_sitemap_entries_from_url(sitemap_url, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Stream (loc, lastmod) for every page listed by sitemap_url, following sitemap indexes.
+    """
+    yield from iter_response_entries(_open(sitemap_url), max_workers=max_workers)
+
+
+def iter_sitemap_urls(sitemap_url, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Stream every page URL listed by sitemap_url, following sitemap indexes.
+    """
+    yield from iter_response_urls(_open(sitemap_url), max_workers=max_workers)
@@ -0,0 +1,167 @@
+import gzip
+import heapq
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import sitemap_cache
+import sitemap_parser
+from storage import DATA_DIR, atomic_write, data_path
+
+# Local sitemap snapshots for incremental audits. A snapshot holds the
+# sitemap's (URL, lastmod) pairs sorted by URL, one "url<TAB>lastmod" line
+# each, gzip-compressed; sorted URLs share long prefixes, so it stays small.
+# Because snapshots are sorted, two of them are diffed in one streaming merge
+# pass, and only the added or lastmod-changed URLs need to be re-audited.
+
+# Snapshot name -> sitemap URL (URLToolkit.sitemap_url and NvidiaCNURLExtractor's sitemap).
+SNAPSHOT_SITEMAPS = {name: sitemap_url for name, (sitemap_url, _) in sitemap_cache.KNOWN_SITEMAPS.items()}
+# Older snapshots of a sitemap beyond this many are deleted.
+MAX_SNAPSHOTS = 20
+# Memoized diffs are bounded by the URLs they hold in total, not by count:
+# one diff of a full sitemap rewrite can hold every URL of the sitemap.
+DIFF_CACHE_MAX_URLS = 200_000
+
+_SUFFIX = '.tsv.gz'
+
+_diff_cache: 'OrderedDict[Tuple[str, str], SitemapDiff]' = OrderedDict()
+_diff_cache_lock = threading.Lock()
+
+
+class Snapshot:
+    def __init__(self, name: str, path: str):
+        self.name = name
+        self.path = path
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            header = f.readline().rstrip('\n').lstrip('#').split('\t')
+        self.taken_at = float(header[0])
+        self.sitemap_url = header[1]
+        self.count = int(header[2])
+
+    @property
+    def label(self) -> str:
+        return f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.taken_at))} ({self.count} URLs)"
+
+    def __iter__(self) -> Iterator[Tuple[str, Optional[str]]]:
+        """
+        Stream (url, lastmod) pairs in URL order.
+        """
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            next(f, None)
+            for line in f:
+                url, _, lastmod = line.rstrip('\n').partition('\t')
+                yield url, lastmod or None
+
+
+class SitemapDiff:
+    def __init__(self):
+        self.added: List[str] = []
+        self.removed: List[str] = []
+        # (url, old lastmod, new lastmod)
+        self.changed: List[Tuple[str, Optional[str], Optional[str]]] = []
+
+    @property
+    def audit_urls(self) -> List[str]:
+        """
+        URLs worth re-auditing: added pages and pages whose lastmod changed, in URL order.
+        """
+        return list(heapq.merge(self.added, (url for url, _, _ in self.changed)))
+
+    def summary(self) -> str:
+        return f"{len(self.added)} added · {len(self.removed)} removed · {len(self.changed)} lastmod changed"
+
+    @property
+    def size(self) -> int:
+        return len(self.added) + len(self.removed) + len(self.changed)
+
+    def rows(self) -> List[Dict]:
+        rows = [{'change': 'added', 'url': url, 'old_lastmod': None, 'new_lastmod': None} for url in self.added]
+        rows += [{'change': 'removed', 'url': url, 'old_lastmod': None, 'new_lastmod': None} for url in self.removed]
+        rows += [{'change': 'lastmod', 'url': url, 'old_lastmod': old, 'new_lastmod': new}
+                 for url, old, new in self.changed]
+        return rows
+
+
+def diff_entries(old: Iterable[Tuple[str, Optional[str]]], new: Iterable[Tuple[str, Optional[str]]]) -> SitemapDiff:
+    """
+    Diff two URL-sorted streams of (url, lastmod) pairs in a single merge pass.
+    """
+    diff = SitemapDiff()
+    old_entries = iter(old)
+    new_entries = iter(new)
+    before = next(old_entries, None)
+    after = next(new_entries, None)
+    while before is not None or after is not None:
+        if after is None or (before is not None and before[0] < after[0]):
+            diff.removed.append(before[0])
+            before = next(old_entries, None)
+        elif before is None or after[0] < before[0]:
+            diff.added.append(after[0])
+            after = next(new_entries, None)
+        else:
+            if before[1] != after[1]:
+                diff.changed.append((after[0], before[1], after[1]))
+            before = next(old_entries, None)
+            after = next(new_entries, None)
+    return diff
+
+
+def diff_snapshots(old: Snapshot, new: Snapshot) -> SitemapDiff:
+    """
+    Diff two snapshots. Snapshots never change once written, so recent diffs
+    are memoized, up to DIFF_CACHE_MAX_URLS URLs in total.
+    """
+    key = (old.path, new.path)
+    with _diff_cache_lock:
+        if key in _diff_cache:
+            _diff_cache.move_to_end(key)
+            return _diff_cache[key]
+    diff = diff_entries(old, new)
+    if diff.size <= DIFF_CACHE_MAX_URLS:
+        with _diff_cache_lock:
+            _diff_cache[key] = diff
+            total = sum(cached.size for cached in _diff_cache.values())
+            while total > DIFF_CACHE_MAX_URLS:
+                _, evicted = _diff_cache.popitem(last=False)
+                total -= evicted.size
+    return diff
+
+
+def _snapshot_dir(name: str) -> str:
+    return os.path.join(DATA_DIR, 'snapshots', name)
+
+
+def list_snapshots(name: str) -> List[Snapshot]:
+    """
+    Snapshots of a sitemap, oldest first.
+    """
+    try:
+        files = [f for f in os.listdir(_snapshot_dir(name)) if f.endswith(_SUFFIX)]
+    except OSError:
+        return []
+    # By the time in each header: files named in local time sort wrongly across a DST change
+    return sorted((Snapshot(name, os.path.join(_snapshot_dir(name), f)) for f in files),
+                  key=lambda snapshot: snapshot.taken_at)
+
+
+def take_snapshot(name: str, sitemap_url: Optional[str] = None,
+                  max_workers: int = sitemap_parser.DEFAULT_MAX_WORKERS) -> Snapshot:
+    """
+    Fetch the sitemap now and store it as a new snapshot under name (a key of
+    SNAPSHOT_SITEMAPS unless sitemap_url is given).
+    """
+    sitemap_url = sitemap_url or SNAPSHOT_SITEMAPS[name]
+    entries = dict(sitemap_parser.iter_sitemap_entries_from_url(sitemap_url, max_workers=max_workers))
+    taken_at = time.time()
+    lines = [f"#{taken_at}\t{sitemap_url}\t{len(entries)}"]
+    lines += [f"{url}\t{entries[url] or ''}" for url in sorted(entries)]
+    # UTC, so names sort in the order snapshots were taken; labels show local time
+    file_name = time.strftime('%Y%m%dT%H%M%S', time.gmtime(taken_at)) + f"{int(taken_at * 1000) % 1000:03d}Z"
+    path = data_path('snapshots', name, file_name + _SUFFIX)
+    atomic_write(path, gzip.compress('\n'.join(lines).encode('utf-8'), compresslevel=6))
+
+    for stale in list_snapshots(name)[:-MAX_SNAPSHOTS]:
+        os.remove(stale.path)
+    return Snapshot(name, path)
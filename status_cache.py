@@ -0,0 +1,127 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from storage import data_path
+
+# Persistent cache of status-check results, keyed by normalized URL. Lookups
+# and writes are batched so a repeated audit of thousands of URLs is served
+# from local storage with a handful of queries. Each result keeps its
+# redirect chain (redirects.Hop.to_dict() of every hop), so cached rows show
+# the same chain as live ones; rows stored before chains were kept have none.
+
+DEFAULT_TTL = 6 * 60 * 60
+# SQLite's default limit on bound parameters is 999.
+_QUERY_BATCH = 500
+
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical cache key: lower-case scheme and host, no default port, no
+    fragment, '/' for an empty path. Path and query are kept as-is.
+    """
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url.strip()
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    netloc = host if port is None or port == _DEFAULT_PORTS.get(scheme) else f"{host}:{port}"
+    return urlunsplit((scheme, netloc, parts.path or '/', parts.query, ''))
+
+
+def _decode_status(status: str):
+    return int(status) if status.isdigit() else status
+
+
+class StatusCache:
+    def __init__(self, path: Optional[str] = None, ttl: float = DEFAULT_TTL):
+        self.path = path or data_path('status_cache.sqlite3')
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS status_results ("
+                " url TEXT PRIMARY KEY,"
+                " status TEXT NOT NULL,"
+                " redirect_url TEXT,"
+                " checked_at REAL NOT NULL,"
+                " chain TEXT)"
+            )
+            if 'chain' not in {row[1] for row in self._conn.execute("PRAGMA table_info(status_results)")}:
+                self._conn.execute("ALTER TABLE status_results ADD COLUMN chain TEXT")
+
+    def get_many(self, urls: Iterable[str], ttl: Optional[float] = None
+                 ) -> Dict[str, Tuple[object, Optional[str], float, List[Dict]]]:
+        """
+        Return {input url: (status, redirect_url, checked_at, hops)} for every URL
+        with a result newer than ttl seconds. hops are the stored hop dicts, empty
+        for results stored without their chain.
+        """
+        keys = {}
+        for url in urls:
+            keys.setdefault(normalize_url(url), []).append(url)
+        oldest = time.time() - (self.ttl if ttl is None else ttl)
+
+        found = {}
+        key_list = list(keys)
+        with self._lock:
+            for i in range(0, len(key_list), _QUERY_BATCH):
+                batch = key_list[i:i + _QUERY_BATCH]
+                rows = self._conn.execute(
+                    f"SELECT url, status, redirect_url, checked_at, chain FROM status_results"
+                    f" WHERE checked_at >= ? AND url IN ({','.join('?' * len(batch))})",
+                    [oldest] + batch,
+                ).fetchall()
+                for key, status, redirect_url, checked_at, chain in rows:
+                    hops = json.loads(chain) if chain else []
+                    for url in keys[key]:
+                        found[url] = (_decode_status(status), redirect_url, checked_at, hops)
+        return found
+
+    def put_many(self, results: Iterable[Tuple[str, object, Optional[str], List[Dict]]]):
+        """
+        Store (url, status, redirect_url, hops) results checked now, hops being
+        hop dicts. Errors are not cached since they are usually transient.
+        """
+        now = time.time()
+        rows = [
+            (normalize_url(url), str(status), redirect_url, now, json.dumps(hops))
+            for url, status, redirect_url, hops in results
+            if "Error" not in str(status)
+        ]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO status_results (url, status, redirect_url, checked_at, chain)"
+                " VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM status_results")
+
+
+def get_status_cache() -> StatusCache:
+    """
+    Process-wide cache instance shared by all sessions.
+    """
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = StatusCache()
+    return _default_cache
@@ -1,78 +1,285 @@
 import streamlit as st
-import requests
-from collections import defaultdict
-import csv
-from io import StringIO
+from url_status import check_url_status, iter_url_status, group_by_status, DEFAULT_MAX_WORKERS, DEFAULT_PER_HOST_LIMIT
+import rate_limit
+import redirects
+import request_timing
+import sitemap_changes
+import status_cache
+import jobs_page
+import result_export
+from collections import Counter, deque
 import time
 
-def check_url_status(urls):
-    status_groups = defaultdict(list)
-    for url in urls:
-        try:
-            response = requests.head(url, allow_redirects=False, timeout=5)
-            if response.status_code == 301:
-                redirect_url = response.headers.get('Location')
-                if redirect_url:
-                    redirected_response = requests.head(redirect_url, timeout=5)
-                    status_code = f"301 -> {redirected_response.status_code}"
-                    url = f"{url} -> {redirect_url}"
-                else:
-                    status_code = 301
-            else:
-                status_code = response.status_code
-        except requests.exceptions.RequestException:
-            status_code = "Error"
-        status_groups[status_code].append(url)
-    return status_groups
+STATUS_EXPORT_FIELDS = ["Status Code", "URL", "Final URL", "Redirect chain", "Cached", "Latency (ms)"]
+
+def status_export_rows(status_results):
+    for result in status_results:
+        yield [str(result.status), result.url, result.redirect_url, result.display_url if len(result.hops) > 1 else None,
+               result.from_cache, round(sum(hop.latency for hop in result.hops) * 1000, 1) if result.hops else None]
 
 def create_download_csv(results):
-    output = StringIO()
-    writer = csv.writer(output)
-    writer.writerow(["Status Code", "URL"])
-    for status, urls in results.items():
-        for url in urls:
-            writer.writerow([status, url])
-    return output.getvalue()
-
-def format_results(results):
-    output = ""
-    for status, url_list in results.items():
-        output += f"Status {status}:\n"
-        for url in url_list:
-            output += f"- {url}\n"
-        output += "\n"
-    return output
+    """
+    CSV text of a status_groups mapping (status -> URLs), one row per URL.
+    """
+    return result_export.export_to_bytes(
+        ([status, url] for status, urls in results.items() for url in urls), ["Status Code", "URL"], "CSV"
+    )["data"].decode("utf-8")
+
+def show_export(rows, fields, file_stem, key, source=None):
+    """
+    Offer rows as a CSV, XLSX or Parquet download. rows is a callable returning
+    an iterable of rows, only called when an export is prepared. The export is
+    kept in session state, so it goes away with the session. source is a
+    token for the data (e.g. id(run) or the selected path): an export made
+    from other data is discarded instead of offered.
+    """
+    formats = list(result_export.FORMATS)
+    exports = st.session_state.setdefault("exports", {})
+    export = exports.get(key)
+    if export and export["source"] != source:
+        del exports[key]
+        export = None
+
+    col1, col2, col3 = st.columns([1, 1, 3])
+    with col1:
+        fmt = st.selectbox("Export format", formats, key=f"{key}_format", label_visibility="collapsed")
+    with col2:
+        prepare = st.button(f"Export as {fmt}", key=f"{key}_prepare")
+    if prepare:
+        exports.pop(key, None)
+        try:
+            with st.spinner(f"Writing {fmt}..."):
+                export = result_export.export_to_bytes(rows(), fields, fmt)
+        except result_export.ExportError as e:
+            st.error(str(e))
+            export = None
+        else:
+            export["source"] = source
+            exports[key] = export
+    if export and export["format"] == fmt:
+        extension, mime = result_export.FORMATS[fmt]
+        with col3:
+            st.download_button(f"Download {export['rows']:,} rows ({export['bytes'] / 2 ** 20:.1f} MB)",
+                               export["data"], file_name=f"{file_stem}{extension}", mime=mime,
+                               key=f"{key}_download")
+
+def redirect_chain_rows(status_results):
+    rows = []
+    for result in status_results:
+        if len(result.hops) > 1:
+            rows.append({
+                "URL": result.url,
+                "Status": str(result.status),
+                "Hops": len(result.hops) - 1,
+                "Chain": result.display_url,
+                "Hop latency (ms)": " / ".join(f"{hop.latency * 1000:.0f}" for hop in result.hops),
+            })
+    return rows
+
+class ProgressPanel:
+    """
+    Live progress bar, running counters and a table of the latest results for
+    long-running checks. Redraws are throttled so large runs stay cheap.
+    """
+    RENDER_INTERVAL = 0.3
+    LATEST_ROWS = 200
+
+    def __init__(self, total, unit="URLs"):
+        self.total = total
+        self.unit = unit
+        self.done = 0
+        self.counts = Counter()
+        self.latest = deque(maxlen=self.LATEST_ROWS)
+        self.start_time = time.time()
+        self._last_render = 0.0
+        self._progress = st.progress(0.0, text=f"0/{total} {unit}")
+        self._counters = st.empty()
+        self._table = st.empty()
+
+    @property
+    def elapsed(self):
+        return time.time() - self.start_time
+
+    def add(self, key, row):
+        self.done += 1
+        self.counts[key] += 1
+        self.latest.append(row)
+        if self.done == self.total or time.time() - self._last_render >= self.RENDER_INTERVAL:
+            self.render()
+
+    def render(self):
+        self._last_render = time.time()
+        elapsed = self.elapsed
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        self._progress.progress(
+            self.done / self.total if self.total else 1.0,
+            text=f"{self.done}/{self.total} {self.unit} · {elapsed:.1f}s · {rate:.1f} {self.unit}/second"
+        )
+        self._counters.markdown(" · ".join(f"**{key}**: {count}" for key, count in self.counts.most_common()))
+        self._table.dataframe(list(reversed(self.latest)), use_container_width=True, height=250)
+
+    def finish(self):
+        self._progress.empty()
+        self._counters.empty()
+        self._table.empty()
+
+def run_status_check(urls, **check_options):
+    """
+    Check URLs while streaming results into a ProgressPanel. The run is kept in
+    session state as it progresses, so pressing Cancel (which reruns the
+    script and stops this loop) leaves the partial results in place.
+    """
+    timings = request_timing.TimingCollector()
+    limiter = rate_limit.RateLimiter(max_concurrency=check_options.get("per_host_limit", DEFAULT_PER_HOST_LIMIT),
+                                     timings=timings)
+    run = {"results": [], "total": len(urls), "done": False, "elapsed": 0.0, "stats": {}, "limiter": limiter,
+           "timings": timings}
+    st.session_state.status_run = run
+
+    st.button("Cancel", key="cancel_status_check")
+    panel = ProgressPanel(len(urls))
+    for result in iter_url_status(urls, stats=run["stats"], ordered=False, limiter=limiter, **check_options):
+        run["results"].append(result)
+        run["elapsed"] = panel.elapsed
+        panel.add(str(result.status), {"Status": str(result.status), "URL": result.display_url})
+    run["elapsed"] = panel.elapsed
+    run["done"] = True
+    panel.finish()
+
+def show_throttling(limiter):
+    """
+    Report 429/503 responses seen by a rate_limit.RateLimiter and how each
+    host's request rate adapted.
+    """
+    if not limiter.events:
+        return
+    st.warning(f"Throttled responses: {len(limiter.events)} (request rates were reduced for the hosts involved)")
+    with st.expander("Throttling details"):
+        st.dataframe(limiter.host_summary(), use_container_width=True)
+        st.dataframe(limiter.events, use_container_width=True)
+
+def show_timing(timings, key):
+    """
+    Break the run's request time down by phase and host, with the errors and
+    slowest requests, and offer the raw timings as JSON.
+    """
+    if not timings.requests:
+        return
+    with st.expander(f"Request timing ({timings.requests:,} requests)"):
+        totals = timings.phase_totals()
+        st.write(" · ".join(f"{phase.upper() if phase in ('dns', 'tls', 'ttfb') else phase.capitalize()}: "
+                            f"{seconds:.2f}s" for phase, seconds in totals.items()))
+        st.caption("Summed over all requests. Wait is time queued behind our own per-host limits; "
+                   "DNS, connect and TLS apply to new connections only.")
+        st.write("Per host")
+        st.dataframe(timings.hosts(), use_container_width=True)
+        st.write("Latency histogram (requests per total-time bucket)")
+        st.dataframe(timings.histogram(), use_container_width=True)
+        errors = timings.errors()
+        if errors:
+            st.write("Errors")
+            st.dataframe(errors, use_container_width=True)
+        st.write("Slowest requests")
+        st.dataframe(timings.slowest(), use_container_width=True)
+        if timings.requests > request_timing.HOST_SAMPLE_SIZE:
+            st.caption(f"Latency percentiles come from up to {request_timing.HOST_SAMPLE_SIZE:,} sampled requests per "
+                       f"host, and the download lists {min(timings.requests, request_timing.SAMPLE_SIZE):,} sampled "
+                       "requests; counts, totals and the slowest requests cover every request.")
+        st.download_button("Download timings (JSON)", timings.to_json(), file_name="request_timings.json",
+                           mime="application/json", key=key)
+
+def show_status_run(run):
+    status_results = run["results"]
+    checked = len(status_results)
+    time_taken = run["elapsed"]
+    urls_per_second = checked / time_taken if time_taken > 0 else float(checked)
+    if run["done"]:
+        st.write(f"Time taken to check {checked} URLs: {time_taken:.2f} seconds "
+                 f"({urls_per_second:.1f} URLs/second)")
+    else:
+        st.warning(f"Cancelled after checking {checked} of {run['total']} URLs "
+                   f"in {time_taken:.2f} seconds ({urls_per_second:.1f} URLs/second)")
+    st.write(f"Served from cache: {run['stats'].get('cached', 0)} · Checked live: {run['stats'].get('live', 0)}")
+    show_throttling(run["limiter"])
+    show_timing(run["timings"], key="status_timings")
+
+    results = group_by_status(status_results)
+
+    st.subheader("Results grouped by Status Code:")
+    statuses = [str(status) for status in results]
+    selected_statuses = st.multiselect("Show statuses", statuses, default=statuses)
+    rows = [
+        {"Status": str(result.status), "URL": result.display_url, "Cached": result.from_cache}
+        for result in status_results
+        if str(result.status) in selected_statuses
+    ]
+    rows.sort(key=lambda row: statuses.index(row["Status"]))
+    st.dataframe(rows, use_container_width=True, height=400)
+
+    redirect_chains = redirect_chain_rows(status_results)
+    if redirect_chains:
+        with st.expander(f"Redirect chains ({len(redirect_chains)})"):
+            st.dataframe(redirect_chains, use_container_width=True)
 
 def main():
     st.title("🦅URL Status Checker")
 
-    url_input = st.text_area("Enter URLs (one per line):", height=200)
-    urls = [url.strip() for url in url_input.splitlines() if url.strip()]
+    urls = sitemap_changes.changed_urls_input("status_changes")
+    if urls is None:
+        url_input = st.text_area("Enter URLs (one per line):", height=200)
+        urls = [url.strip() for url in url_input.splitlines() if url.strip()]
 
-    if st.button("Check URL Status"):
-        if urls:
-            start_time = time.time()
-            results = check_url_status(urls)
-            end_time = time.time()
+    col1, col2 = st.columns(2)
+    with col1:
+        max_workers = st.number_input("Max concurrent requests", min_value=1, max_value=256,
+                                      value=DEFAULT_MAX_WORKERS)
+    with col2:
+        per_host_limit = st.number_input("Max concurrent requests per host", min_value=1, max_value=64,
+                                         value=DEFAULT_PER_HOST_LIMIT)
 
-            time_taken = end_time - start_time
-            st.write(f"Time taken to check {len(urls)} URLs: {time_taken:.2f} seconds")
+    col3, col4 = st.columns(2)
+    with col3:
+        use_cache = st.checkbox("Reuse recent results from the cache", value=True)
+        force_refresh = st.checkbox("Force refresh (check every URL live)", value=False, disabled=not use_cache)
+    with col4:
+        max_hops = st.number_input("Max redirects to follow", min_value=1, max_value=50,
+                                   value=redirects.DEFAULT_MAX_HOPS)
+        cache_ttl_hours = st.number_input("Cache TTL (hours)", min_value=0.0, max_value=24.0 * 30,
+                                          value=status_cache.DEFAULT_TTL / 3600, disabled=not use_cache)
 
-            st.session_state.results = results
-            st.session_state.formatted_results = format_results(results)
+    col5, col6 = st.columns([1, 4])
+    with col5:
+        check = st.button("Check URL Status")
+    with col6:
+        background = st.button("Run in background", key="status_background")
+    if check and urls:
+        run_status_check(
+            urls,
+            max_workers=int(max_workers),
+            per_host_limit=int(per_host_limit),
+            cache=status_cache.get_status_cache() if use_cache else None,
+            cache_ttl=cache_ttl_hours * 3600,
+            force_refresh=force_refresh,
+            max_hops=int(max_hops),
+        )
+    elif background and urls:
+        jobs_page.queue_job("status", {
+            "urls": urls,
+            "max_workers": int(max_workers),
+            "per_host_limit": int(per_host_limit),
+            "use_cache": use_cache,
+            "cache_ttl": cache_ttl_hours * 3600,
+            "force_refresh": force_refresh,
+            "max_hops": int(max_hops),
+        }, f"Status check of {len(urls)} URLs")
 
-    if 'formatted_results' in st.session_state:
-        st.subheader("Results grouped by Status Code:")
-        st.text_area("Results:", value=st.session_state.formatted_results, height=300)
+    if 'status_run' in st.session_state:
+        show_status_run(st.session_state.status_run)
 
-    if 'results' in st.session_state:
-        csv_data = create_download_csv(st.session_state.results)
-        st.download_button(
-            label="Download Results as CSV",
-            data=csv_data,
-            file_name="url_status.csv",
-            mime="text/csv",
-        )
+    if 'status_run' in st.session_state:
+        run = st.session_state.status_run
+        show_export(lambda: status_export_rows(run["results"]), STATUS_EXPORT_FIELDS, "url_status",
+                    key="status_export", source=id(run))
 
     if not urls:
         st.info("Enter URLs and click 'Check URL Status' to begin.")
@@ -0,0 +1,27 @@
+import os
+
+# Root directory for everything the toolkit persists locally (sitemap copies,
+# result caches, ...). Override with URL_TOOLKIT_DATA_DIR.
+DATA_DIR = os.environ.get(
+    'URL_TOOLKIT_DATA_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.url_toolkit'),
+)
+
+
+def data_path(*parts):
+    """
+    Return a path under DATA_DIR, creating the parent directory if needed.
+    """
+    path = os.path.join(DATA_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def atomic_write(path, data):
+    """
+    Write bytes to path via a temporary file so readers never see a partial file.
+    """
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
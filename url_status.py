@@ -0,0 +1,159 @@
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+
+import rate_limit
+import redirects
+
+# Concurrent URL status checking, independent of the Streamlit UI so it can be
+# driven from the CLI and batch jobs as well as status_code_Main.
+
+DEFAULT_MAX_WORKERS = 32
+DEFAULT_PER_HOST_LIMIT = 8
+
+
+class StatusResult:
+    def __init__(self, url, status, redirect_url=None, hops=None, from_cache=False):
+        self.url = url
+        self.status = status
+        # Final URL of the redirect chain, if any redirect was followed
+        self.redirect_url = redirect_url
+        # redirects.Hop list; as measured when checked for results served from the
+        # cache, empty for cached results stored without their chain
+        self.hops = hops or []
+        self.from_cache = from_cache
+
+    @property
+    def display_url(self):
+        if len(self.hops) > 1:
+            return " -> ".join(hop.url for hop in self.hops)
+        if self.redirect_url:
+            return f"{self.url} -> {self.redirect_url}"
+        return self.url
+
+    def to_dict(self):
+        return {
+            'url': self.url,
+            'status': self.status,
+            'redirect_url': self.redirect_url,
+            'from_cache': self.from_cache,
+            'chain': [hop.to_dict() for hop in self.hops],
+        }
+
+
+def _batches(urls, size):
+    batch = []
+    for url in urls:
+        batch.append(url)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_url_status(urls, max_workers=DEFAULT_MAX_WORKERS, per_host_limit=DEFAULT_PER_HOST_LIMIT,
+                    cache=None, cache_ttl=None, force_refresh=False, stats=None,
+                    max_hops=redirects.DEFAULT_MAX_HOPS, ordered=True, limiter=None):
+    """
+    Yield a StatusResult for each input URL, in input order (or, with
+    ordered=False, as soon as each one completes). Redirect chains are
+    followed up to max_hops, and each hop is requested once per call even
+    when many inputs share it. urls may be any iterable (e.g. a stream); only
+    a bounded window of it is in flight at once, and closing the generator
+    cancels whatever has not started yet.
+
+    With a StatusCache, results younger than cache_ttl are served from it
+    (unless force_refresh) and live results are written back. If a stats dict
+    is given, its 'cached', 'live', 'requests', 'memo_hits' and 'throttled'
+    counters are set.
+
+    Requests go through limiter (a rate_limit.RateLimiter; by default a new one
+    capped at per_host_limit concurrent requests per host), which adapts to
+    429/503 responses and honours Retry-After.
+    """
+    if stats is None:
+        stats = {}
+    stats.setdefault('cached', 0)
+    stats.setdefault('live', 0)
+    if limiter is None:
+        limiter = rate_limit.RateLimiter(max_concurrency=per_host_limit)
+    # Per-host limits apply to every hop, whichever host a chain leads to
+    resolver = redirects.RedirectResolver(max_hops=max_hops,
+                                          fetch=lambda url: redirects.fetch_hop(url, limiter=limiter))
+    window = max(1, max_workers) * 4
+    pending = deque()
+    in_flight = {}
+    to_store = []
+
+    def finish(item):
+        url, future, cached = item
+        if future is None:
+            stats['cached'] += 1
+            return StatusResult(url, cached[0], cached[1], [redirects.Hop.from_dict(hop) for hop in cached[3]],
+                                from_cache=True)
+        resolution = future.result()
+        stats['live'] += 1
+        stats['requests'] = resolver.requests
+        stats['memo_hits'] = resolver.memo_hits
+        stats['throttled'] = len(limiter.events)
+        result = StatusResult(url, resolution.status, resolution.final_url, resolution.hops)
+        if cache is not None:
+            to_store.append((url, result.status, result.redirect_url, [hop.to_dict() for hop in result.hops]))
+            if len(to_store) >= window:
+                cache.put_many(to_store)
+                to_store.clear()
+        return result
+
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    try:
+        for batch in _batches(urls, window):
+            cached = cache.get_many(batch, ttl=cache_ttl) if cache is not None and not force_refresh else {}
+            for url in batch:
+                if url in cached:
+                    item = (url, None, cached[url])
+                else:
+                    item = (url, executor.submit(resolver.resolve, url), None)
+                if ordered:
+                    pending.append(item)
+                    if len(pending) > window:
+                        yield finish(pending.popleft())
+                elif item[1] is None:
+                    yield finish(item)
+                else:
+                    in_flight[item[1]] = item
+                    if len(in_flight) >= window:
+                        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield finish(in_flight.pop(future))
+        while pending:
+            yield finish(pending.popleft())
+        for future in as_completed(list(in_flight)):
+            yield finish(in_flight.pop(future))
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        if cache is not None and to_store:
+            cache.put_many(to_store)
+
+
+def check_url_status(urls, max_workers=DEFAULT_MAX_WORKERS, per_host_limit=DEFAULT_PER_HOST_LIMIT,
+                     cache=None, cache_ttl=None, force_refresh=False, stats=None,
+                     max_hops=redirects.DEFAULT_MAX_HOPS, limiter=None):
+    """
+    Check URLs concurrently, with at most max_workers requests in flight overall
+    and at most per_host_limit against any single host. Results are grouped by
+    status code in input order, redirected URLs shown with their full chain;
+    max_workers=1 gives sequential checking. See iter_url_status for the rest.
+    """
+    results = iter_url_status(urls, max_workers, per_host_limit, cache=cache, cache_ttl=cache_ttl,
+                              force_refresh=force_refresh, stats=stats, max_hops=max_hops, limiter=limiter)
+    return group_by_status(results)
+
+
+def group_by_status(results):
+    """
+    Build the status_groups mapping (status -> display URLs) from StatusResults.
+    """
+    status_groups = defaultdict(list)
+    for result in results:
+        status_groups[result.status].append(result.display_url)
+    return status_groups
@@ -0,0 +1,169 @@
+from array import array
+from collections.abc import Sequence
+from typing import Iterable, Iterator, List, Tuple
+
+# Compact, read-only URL list. Sitemap URLs share long prefixes
+# ('https://www.nvidia.com/en-us/...'), so they are stored sorted and
+# front-coded: each entry keeps only the length of the prefix it shares with
+# the previous entry plus its remaining bytes, in one bytes blob with
+# array-backed offsets. Every BLOCK-th entry is stored in full, so any entry
+# is decoded from at most BLOCK suffixes and lookups bisect over block heads.
+#
+# URLs are kept in path order, in which '/' sorts before every other
+# character (the two bytes are swapped in the stored keys). Every string
+# prefix is then one contiguous slice, and so is every path subtree: 'a/b'
+# is directly followed by 'a/b/...', and 'a/b-c' only comes after them.
+
+BLOCK = 16
+MAX_SHARED = 0xFFFF
+
+_SWAP = bytes.maketrans(b'/\x00', b'\x00/')
+_PREFIX_END = b'\xff'  # never occurs in UTF-8, so it sorts after every key with a given prefix
+
+
+def _encode(url: str) -> bytes:
+    return url.encode('utf-8').translate(_SWAP)
+
+
+def _decode(key: bytes) -> str:
+    return key.translate(_SWAP).decode('utf-8')
+
+
+def _shared_length(a: bytes, b: bytes) -> int:
+    # Binary search on slice equality: a few C-level compares instead of a byte loop
+    lo, hi = 0, min(len(a), len(b), MAX_SHARED)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+class URLStore(Sequence):
+    def __init__(self, urls: Iterable[str] = ()):
+        """
+        Store the distinct non-empty URLs of urls in path order.
+        """
+        keys = sorted({_encode(url) for url in urls if url})
+        data = bytearray()
+        self._offsets = array('I', [0])
+        self._shared = array('H')
+        previous = b''
+        for i, key in enumerate(keys):
+            shared = 0 if i % BLOCK == 0 else _shared_length(previous, key)
+            self._shared.append(shared)
+            data += key[shared:]
+            self._offsets.append(len(data))
+            previous = key
+        self._data = bytes(data)
+        self._len = len(keys)
+
+    def __len__(self) -> int:
+        return self._len
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Bytes held by the encoded URLs and their offsets.
+        """
+        return (len(self._data) + self._offsets.itemsize * len(self._offsets)
+                + self._shared.itemsize * len(self._shared))
+
+    def _suffix(self, i: int) -> bytes:
+        return self._data[self._offsets[i]:self._offsets[i + 1]]
+
+    def _key(self, i: int) -> bytes:
+        head = i - i % BLOCK
+        key = self._suffix(head)
+        for j in range(head + 1, i + 1):
+            key = key[:self._shared[j]] + self._suffix(j)
+        return key
+
+    def _iter_keys(self, start: int, stop: int) -> Iterator[bytes]:
+        if start >= stop:
+            return
+        key = self._key(start)
+        yield key
+        for i in range(start + 1, stop):
+            key = key[:self._shared[i]] + self._suffix(i)
+            yield key
+
+    def iter_range(self, start: int, stop: int) -> Iterator[str]:
+        """
+        URLs start..stop-1, decoded sequentially.
+        """
+        for key in self._iter_keys(max(0, start), min(stop, self._len)):
+            yield _decode(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return self.iter_range(0, self._len)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            start, stop, step = i.indices(self._len)
+            if step != 1:
+                return [self[j] for j in range(start, stop, step)]
+            return list(self.iter_range(start, stop))
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError('URLStore index out of range')
+        return _decode(self._key(i))
+
+    def _bisect_key(self, key: bytes) -> int:
+        # Last block whose head is <= key, then a linear pass inside it
+        lo, hi = 0, (self._len + BLOCK - 1) // BLOCK
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._suffix(mid * BLOCK) <= key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == 0:
+            return 0
+        start = (lo - 1) * BLOCK
+        for i, stored in enumerate(self._iter_keys(start, min(start + BLOCK, self._len)), start=start):
+            if stored >= key:
+                return i
+        return min(start + BLOCK, self._len)
+
+    def bisect_left(self, url: str) -> int:
+        """
+        Position of the first stored URL that is not before url in path order.
+        """
+        return self._bisect_key(_encode(url))
+
+    def prefix_range(self, prefix: str) -> Tuple[int, int]:
+        """
+        (start, stop) of the URLs that start with prefix.
+        """
+        key = _encode(prefix)
+        return self._bisect_key(key), self._bisect_key(key + _PREFIX_END)
+
+    def with_prefix(self, prefix: str) -> List[str]:
+        return list(self.iter_range(*self.prefix_range(prefix)))
+
+    def count_prefix(self, prefix: str) -> int:
+        start, stop = self.prefix_range(prefix)
+        return stop - start
+
+    def __contains__(self, url) -> bool:
+        if not isinstance(url, str):
+            return False
+        key = _encode(url)
+        i = self._bisect_key(key)
+        return i < self._len and self._key(i) == key
+
+    def index(self, url, start=0, stop=None) -> int:
+        i = self.bisect_left(url) if isinstance(url, str) else self._len
+        if i < self._len and self[i] == url and start <= i < (self._len if stop is None else stop):
+            return i
+        raise ValueError(f"{url!r} is not in the store")
+
+    def count(self, url) -> int:
+        return 1 if url in self else 0
+
+    def __repr__(self) -> str:
+        return f"<URLStore {self._len} URLs, {self.nbytes} bytes>"